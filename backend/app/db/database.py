@@ -13,6 +13,9 @@ if DATABASE_URL.startswith("sqlite"):
     # SQLite setup
     engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # Workers forked from a preloaded app start with an empty pool (the parent's connections stay the parent's)
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=lambda: engine.dispose(close=False))
     
     def get_db():
         db = SessionLocal()
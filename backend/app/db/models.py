@@ -1,6 +1,7 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, func, JSON
 from sqlalchemy.orm import relationship
 from .database import Base
+from .types import VectorBlob
 
 class Document(Base):
     __tablename__ = "documents"
@@ -9,5 +10,5 @@ class Document(Base):
     filename = Column(String, nullable=False)
     content = Column(Text)
     doc_metadata = Column(JSON, default={})  # Renamed to avoid conflict
-    embedding = Column(Text)  # Store as JSON string for SQLite compatibility
+    embedding = Column(VectorBlob())  # Packed float32/float16, see app/db/types.py
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,72 @@
+"""
+Column types shared by the models.
+
+`VectorBlob` stores an embedding as packed little-endian floats behind a
+4-byte header (b"EMB" + b"4" for float32 or b"2" for float16), about 3 KB per
+768-dim float32 vector instead of ~15 KB of JSON text. Reads return a
+read-only numpy view over the fetched bytes (`numpy.frombuffer`, no copy or
+parse). Rows still holding the old JSON text (SQLite databases that have not
+run scripts/migrate_embeddings_to_blob.py) are decoded from JSON.
+
+numpy is imported on first use so importing the models stays cheap.
+"""
+
+import json
+import os
+from typing import Any, Optional
+
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+_HEADER = b"EMB"
+_CODES = {"float32": b"4", "float16": b"2"}
+_DTYPES = {code: name for name, code in _CODES.items()}
+HEADER_SIZE = len(_HEADER) + 1
+
+EMBEDDING_STORAGE_DTYPE = os.getenv("EMBEDDING_STORAGE_DTYPE", "float32")
+
+
+def pack_vector(vector: Any, dtype: str = "float32") -> bytes:
+    """Encode a vector (list or array) as header + packed floats."""
+    import numpy as np
+
+    if dtype not in _CODES:
+        raise ValueError(f"Unsupported embedding dtype {dtype!r}; use one of {sorted(_CODES)}")
+    return _HEADER + _CODES[dtype] + np.asarray(vector, dtype=np.dtype(dtype).newbyteorder("<")).tobytes()
+
+
+def unpack_vector(value: Any):
+    """Decode a stored vector: packed bytes, or legacy JSON text."""
+    import numpy as np
+
+    if isinstance(value, str):
+        return np.asarray(json.loads(value), dtype=np.float32)
+    value = bytes(value) if isinstance(value, memoryview) else value
+    if value[:len(_HEADER)] != _HEADER or value[len(_HEADER):HEADER_SIZE] not in _DTYPES:
+        raise ValueError("Not a packed embedding")
+    dtype = np.dtype(_DTYPES[value[len(_HEADER):HEADER_SIZE]]).newbyteorder("<")
+    return np.frombuffer(value, dtype=dtype, offset=HEADER_SIZE)
+
+
+class VectorBlob(TypeDecorator):
+    """Embedding column stored as a compact binary blob (see module docstring)."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, dtype: str = EMBEDDING_STORAGE_DTYPE, *args: Any, **kwargs: Any):
+        if dtype not in _CODES:
+            raise ValueError(f"Unsupported embedding dtype {dtype!r}; use one of {sorted(_CODES)}")
+        self.dtype = dtype
+        super().__init__(*args, **kwargs)
+
+    def process_bind_param(self, value: Any, dialect: Any) -> Optional[bytes]:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = json.loads(value)
+        return pack_vector(value, self.dtype)
+
+    def process_result_value(self, value: Any, dialect: Any):
+        if value is None:
+            return None
+        return unpack_vector(value)
@@ -1,6 +1,11 @@
 import os
+import time
 from pathlib import Path
 
+# Import start, for the cold-start figure on /health (inherited by preloaded workers)
+_IMPORT_STARTED = time.monotonic()
+startup_seconds = None
+
 try:
     from dotenv import load_dotenv
     # Load .env file from backend directory
@@ -11,8 +16,18 @@ except ImportError:
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import predict, analyze, research
+from app.routes import predict, analyze, research, admin, similar
 from app.db.database import init_db
+from app.utils.circuit_breaker import gemini_breaker
+from app.utils.json_repair import decode_stats
+from app.utils.rate_limiter import gemini_limiter
+from app.utils.response_cache import response_cache
+from app.utils.model_loader import (
+    deadline_counters, gemini_flight, local_batcher, local_model_stats, model_router, start_model_watch,
+)
+from app.utils.embedding_cache import embedding_cache
+from app.utils.embedding_utils import embedding_batcher, embedding_flight
+from app.utils.warmup import start_background_warm_up, warmup_state
 
 app = FastAPI(title="LawGic AI Backend")
 
@@ -29,6 +44,8 @@ app.add_middleware(
 app.include_router(predict.router)
 app.include_router(analyze.router)
 app.include_router(research.router)
+app.include_router(admin.router)
+app.include_router(similar.router)
 
 @app.get("/")
 def root():
@@ -36,13 +53,39 @@ def root():
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "startup_seconds": round(startup_seconds, 3) if startup_seconds is not None else None,
+        "model": local_model_stats(),
+        "warmup": warmup_state,
+        "circuit_breaker": gemini_breaker.stats(),
+        "rate_limiter": gemini_limiter.stats(),
+        "response_cache": response_cache.stats() if response_cache is not None else None,
+        "embedding_cache": embedding_cache.stats() if embedding_cache is not None else None,
+        "deadlines": deadline_counters,
+        "json_decode": decode_stats(),
+        "routing": model_router.stats(),
+        "batching": {"local_model": local_batcher.stats(), "embeddings": embedding_batcher.stats()},
+        "coalescing": {
+            "gemini": gemini_flight.stats(),
+            "embeddings": embedding_flight.stats(),
+        },
+    }
 
 @app.on_event("startup")
 def on_startup():
+    global startup_seconds
     # Create database tables on startup (idempotent)
     try:
         init_db()
     except Exception as e:
         print(f"WARNING: Database initialization failed: {e}")
         print("INFO: App will run in demo mode")
+
+    # Heavy dependencies load in the background; requests that arrive first load them on demand
+    start_background_warm_up()
+    # Hot-swaps model.pkl in this worker whenever the file is replaced
+    start_model_watch()
+
+    startup_seconds = time.monotonic() - _IMPORT_STARTED
+    print(f"INFO: Worker {os.getpid()} ready {startup_seconds:.2f}s after app import started")
@@ -3,6 +3,37 @@ import os
 from datetime import datetime
 from typing import Any, List, Dict
 
+from app.ml.risk_rules import risk_rules
+from app.utils.keyword_classifier import KeywordClassifier
+
+# Query categories; on a score tie the earlier category wins
+QUERY_CATEGORIES = KeywordClassifier({
+    "tenant_rights": ["rent", "landlord", "tenant", "eviction", "lease", "housing"],
+    "employment": ["job", "work", "employer", "salary", "wage", "termination", "harassment"],
+    "contract": ["contract", "agreement", "terms", "breach", "obligation"],
+    "criminal": ["arrest", "police", "court", "criminal", "charges", "bail"],
+    "family": ["divorce", "custody", "child support", "marriage", "domestic"],
+})
+
+# Findings returned per contract: one per flagged clause, riskiest first
+MAX_CONTRACT_FINDINGS = int(os.getenv("CONTRACT_MAX_FINDINGS", "5"))
+# Longer clauses are quoted as a window around the indicator; clause_start/clause_end keep the full span
+MAX_CLAUSE_CHARS = 400
+_RISK_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+# Inputs mentioning any of these are reviewed as contracts, everything else as a legal query
+CONTRACT_MARKERS = KeywordClassifier({"contract": ["contract", "agreement", "terms", "clause"]})
+
+def _quote_clause(text: str, hit: Any) -> str:
+    """The clause around a hit, or a MAX_CLAUSE_CHARS window centred on the indicator if it is longer."""
+    if hit.clause_end - hit.clause_start <= MAX_CLAUSE_CHARS:
+        return text[hit.clause_start:hit.clause_end]
+    margin = max(0, (MAX_CLAUSE_CHARS - (hit.end - hit.start)) // 2)
+    start = max(hit.clause_start, hit.start - margin)
+    end = min(hit.clause_end, start + MAX_CLAUSE_CHARS)
+    start = max(hit.clause_start, end - MAX_CLAUSE_CHARS)
+    return ("…" if start > hit.clause_start else "") + text[start:end] + ("…" if end < hit.clause_end else "")
+
 class AiLegalAssistantModel:
     """
     AI Legal Assistant Model with demo fallback capabilities.
@@ -14,40 +45,47 @@ class AiLegalAssistantModel:
         
     def _analyze_contract(self, text: str) -> Dict[str, Any]:
         """Analyze contract text and return structured analysis."""
-        text_lower = text.lower()
-        
-        # Identify potential issues in contracts
-        risk_indicators = {
-            "high": ["terminate without notice", "no refund", "unlimited liability", "exclusive jurisdiction"],
-            "medium": ["late fees", "automatic renewal", "binding arbitration", "limitation of liability"],
-            "low": ["30 days notice", "reasonable efforts", "mutual agreement", "standard terms"]
-        }
-        
+        # Identify potential issues in contracts (one pass over the compiled rule pack)
         findings = []
         overall_risk = "Low"
         
-        for risk_level, indicators in risk_indicators.items():
-            for indicator in indicators:
-                if indicator in text_lower:
-                    clause_text = f"Found clause containing: '{indicator}'"
-                    risk = risk_level.title()
-                    if risk_level == "high":
-                        overall_risk = "High"
-                        rewrite = f"Consider revising clause about '{indicator}' to include more balanced terms."
-                    elif risk_level == "medium" and overall_risk != "High":
-                        overall_risk = "Medium"
-                        rewrite = f"Review clause about '{indicator}' for potential modifications."
-                    else:
-                        rewrite = f"Clause about '{indicator}' appears standard."
-                    
-                    explanation = f"This clause may impact your rights and obligations. {rewrite}"
-                    
-                    findings.append({
-                        "clause": clause_text,
-                        "risk": risk,
-                        "rewrite": rewrite,
-                        "explanation": explanation
-                    })
+        # A clause with several indicators is reported once, for its riskiest (then first) hit
+        clauses = {}
+        for hit in risk_rules.get().find(text):
+            span = (hit.clause_start, hit.clause_end)
+            if span not in clauses or _RISK_ORDER[hit.rule.level] < _RISK_ORDER[clauses[span].rule.level]:
+                clauses[span] = hit
+        ranked = sorted(clauses.values(), key=lambda hit: (_RISK_ORDER[hit.rule.level], hit.start))
+        
+        # Ranked riskiest first, so the first clause sets the overall risk even when the cap drops the rest
+        if ranked:
+            overall_risk = ranked[0].rule.level.title()
+        
+        for hit in ranked[:MAX_CONTRACT_FINDINGS]:
+            rule = hit.rule
+            indicator = text[hit.start:hit.end]
+            risk = rule.level.title()
+            if rule.level == "high":
+                rewrite = rule.rewrite or f"Consider revising clause about '{rule.phrase}' to include more balanced terms."
+            elif rule.level == "medium":
+                rewrite = rule.rewrite or f"Review clause about '{rule.phrase}' for potential modifications."
+            else:
+                rewrite = rule.rewrite or f"Clause about '{rule.phrase}' appears standard."
+            
+            explanation = f"This clause may impact your rights and obligations. {rewrite}"
+            
+            findings.append({
+                "clause": _quote_clause(text, hit),
+                "risk": risk,
+                "rewrite": rewrite,
+                "explanation": explanation,
+                "rule_id": rule.rule_id,
+                "indicator": indicator,
+                "start": hit.start,
+                "end": hit.end,
+                "clause_start": hit.clause_start,
+                "clause_end": hit.clause_end,
+            })
         
         # Default findings if no specific indicators found
         if not findings:
@@ -61,7 +99,8 @@ class AiLegalAssistantModel:
         return {
             "analysis_type": "contract_review",
             "overall_risk": overall_risk,
-            "findings": findings[:5],  # Limit to top 5 findings
+            "findings": findings,
+            "flagged_clauses": len(ranked),
             "recommendations": [
                 "Have the contract reviewed by a qualified attorney",
                 "Negotiate any unfavorable terms before signing",
@@ -72,22 +111,8 @@ class AiLegalAssistantModel:
     
     def _analyze_legal_query(self, text: str) -> Dict[str, Any]:
         """Analyze general legal query and provide guidance."""
-        text_lower = text.lower()
-        
         # Categorize query
-        categories = {
-            "tenant_rights": ["rent", "landlord", "tenant", "eviction", "lease", "housing"],
-            "employment": ["job", "work", "employer", "salary", "wage", "termination", "harassment"],
-            "contract": ["contract", "agreement", "terms", "breach", "obligation"],
-            "criminal": ["arrest", "police", "court", "criminal", "charges", "bail"],
-            "family": ["divorce", "custody", "child support", "marriage", "domestic"]
-        }
-        
-        category = "general"
-        for cat, keywords in categories.items():
-            if any(keyword in text_lower for keyword in keywords):
-                category = cat
-                break
+        category = QUERY_CATEGORIES.classify(text, default="general")
         
         # Generate category-specific advice
         advice_templates = {
@@ -164,22 +189,15 @@ class AiLegalAssistantModel:
             "disclaimer": "This is general information only and not legal advice. Consult with a qualified attorney for advice specific to your situation."
         }
     
-    def predict(self, X: Any) -> List[str]:
+    def predict_structured(self, texts: List[str]) -> List[Dict[str, Any]]:
         """
-        Main prediction method that returns JSON string responses.
+        Batch prediction returning one analysis dict per input text.
         """
-        if isinstance(X, str):
-            inputs = [X]
-        elif isinstance(X, list):
-            inputs = X
-        else:
-            inputs = [str(X)]
-        
         results = []
-        for text in inputs:
+        for text in texts:
             try:
                 # Determine analysis type based on content
-                if any(keyword in text.lower() for keyword in ["contract", "agreement", "terms", "clause"]):
+                if CONTRACT_MARKERS.total_hits(text):
                     analysis = self._analyze_contract(text)
                 else:
                     analysis = self._analyze_legal_query(text)
@@ -190,13 +208,28 @@ class AiLegalAssistantModel:
                     "timestamp": datetime.utcnow().isoformat() + "Z"
                 })
                 
-                results.append(json.dumps(analysis, indent=2))
+                results.append(analysis)
                 
             except Exception as e:
-                error_response = {
+                results.append({
                     "error": f"Analysis failed: {str(e)}",
                     "demo_note": "This is a demo response due to an error in analysis."
-                }
-                results.append(json.dumps(error_response))
+                })
+        
+        return results
+    
+    def predict(self, X: Any) -> List[str]:
+        """
+        Main prediction method that returns JSON string responses.
+        
+        Kept for joblib/sklearn-style callers; in-process callers should use
+        `predict_structured` and skip the JSON round trip.
+        """
+        if isinstance(X, str):
+            inputs = [X]
+        elif isinstance(X, list):
+            inputs = X
+        else:
+            inputs = [str(X)]
         
-        return results
\ No newline at end of file
+        return [json.dumps(analysis, indent=2) for analysis in self.predict_structured(inputs)]
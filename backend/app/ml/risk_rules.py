@@ -0,0 +1,148 @@
+"""
+Compiled contract risk rules for the offline contract analysis.
+
+Rules live in a JSON data file (`risk_rules.json` next to this module, or
+RISK_RULES_PATH) and compiled into one trie-factored regex, so a contract is
+scanned once and the cost barely grows with the number of rules. Each hit
+carries its character offsets and the span of the sentence or clause that
+contains it. The file is re-read when its modification time changes.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from app.utils.keyword_classifier import trie_regex
+
+DEFAULT_RULES_PATH = Path(__file__).parent / "risk_rules.json"
+RISK_LEVELS = ("low", "medium", "high")
+
+# Sentence ends, semicolons and blank lines delimit clauses
+_CLAUSE_BOUNDARY = re.compile(r"[.!?;](?=\s|$)|\n[ \t]*\n")
+# Seconds between modification-time checks of the rules file
+_RELOAD_CHECK_SECONDS = 1.0
+
+
+class RiskRule(NamedTuple):
+    rule_id: str
+    phrase: str
+    level: str
+    rewrite: Optional[str]
+
+
+class RiskHit(NamedTuple):
+    rule: RiskRule
+    start: int
+    end: int
+    clause_start: int
+    clause_end: int
+
+
+class RiskRulePack:
+    """A set of risk rules compiled into a single regex."""
+
+    def __init__(self, rules: List[RiskRule], version: Any = None):
+        self.rules = rules
+        self.version = version
+        self._by_phrase: Dict[str, RiskRule] = {}
+        for rule in rules:
+            self._by_phrase.setdefault(_normalize(rule.phrase), rule)
+        source = r"\b(?:" + trie_regex(self._by_phrase) + r")\b"
+        self._pattern = re.compile(source) if rules else None
+        # Only for text whose lower-cased form changes length, where offsets would drift
+        self._pattern_ignorecase = re.compile(source, re.IGNORECASE) if rules else None
+
+    @classmethod
+    def from_file(cls, path: Path) -> "RiskRulePack":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        rules = []
+        for entry in data.get("rules", []):
+            level = str(entry.get("level", "medium")).lower()
+            if level not in RISK_LEVELS:
+                raise ValueError(f"Risk rule {entry.get('id')!r} has unknown level {level!r}")
+            rules.append(RiskRule(
+                rule_id=str(entry.get("id") or entry["phrase"]),
+                phrase=entry["phrase"],
+                level=level,
+                rewrite=entry.get("rewrite"),
+            ))
+        return cls(rules, version=data.get("version"))
+
+    def find(self, text: str) -> List[RiskHit]:
+        """Return every rule hit in `text`, in document order."""
+        if self._pattern is None:
+            return []
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            matches = self._pattern.finditer(lowered)
+        else:
+            matches = self._pattern_ignorecase.finditer(text)
+
+        hits = []
+        boundaries: Optional[List[int]] = None
+        for match in matches:
+            if boundaries is None:
+                boundaries = [m.end() for m in _CLAUSE_BOUNDARY.finditer(text)]
+            rule = self._by_phrase[_normalize(match.group(0))]
+            clause_start, clause_end = _clause_span(text, boundaries, match.start(), match.end())
+            hits.append(RiskHit(rule, match.start(), match.end(), clause_start, clause_end))
+        return hits
+
+
+def _normalize(phrase: str) -> str:
+    return " ".join(phrase.lower().split())
+
+
+def _clause_span(text: str, boundaries: List[int], start: int, end: int) -> Tuple[int, int]:
+    """Span of the clause around [start, end), trimmed of surrounding whitespace."""
+    index = bisect_right(boundaries, start)
+    clause_start = boundaries[index - 1] if index else 0
+    index = bisect_left(boundaries, end)
+    clause_end = boundaries[index] if index < len(boundaries) else len(text)
+    while clause_start < start and text[clause_start].isspace():
+        clause_start += 1
+    while clause_end > end and text[clause_end - 1].isspace():
+        clause_end -= 1
+    return clause_start, clause_end
+
+
+class RiskRuleStore:
+    """Holds the current rule pack and reloads it when the file changes."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._mtime = self.path.stat().st_mtime
+        self._checked = time.monotonic()
+        self.pack = RiskRulePack.from_file(self.path)
+
+    def get(self) -> RiskRulePack:
+        """Return the current pack, reloading it if the rules file was modified."""
+        now = time.monotonic()
+        if now - self._checked < _RELOAD_CHECK_SECONDS:
+            return self.pack
+        with self._lock:
+            self._checked = now
+            try:
+                mtime = self.path.stat().st_mtime
+            except OSError as exc:
+                print(f"WARNING: Risk rules file unavailable, keeping previous rules: {exc}")
+                return self.pack
+            if mtime == self._mtime:
+                return self.pack
+            # Recorded even on failure so a broken file is not re-parsed until it changes again
+            self._mtime = mtime
+            try:
+                self.pack = RiskRulePack.from_file(self.path)
+                print(f"INFO: Reloaded {len(self.pack.rules)} risk rules from {self.path}")
+            except (OSError, ValueError, KeyError) as exc:
+                print(f"WARNING: Risk rules reload failed, keeping previous rules: {exc}")
+        return self.pack
+
+
+risk_rules = RiskRuleStore(Path(os.getenv("RISK_RULES_PATH") or DEFAULT_RULES_PATH))
@@ -0,0 +1,38 @@
+import asyncio
+import hmac
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+
+from app.utils.model_loader import ModelReloadInProgress, reload_local_model
+
+router = APIRouter(prefix="/api/admin", tags=["Admin"])
+
+# Admin endpoints are disabled unless a token is configured
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "").strip()
+
+
+def _require_admin(token: Optional[str]) -> None:
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set ADMIN_TOKEN to enable them")
+    if not hmac.compare_digest(token or "", ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@router.post("/model/reload")
+async def reload_model(x_admin_token: Optional[str] = Header(None)):
+    """Load models/model.pkl again and swap it in without dropping requests.
+
+    Only reloads the worker that serves this request; run with
+    MODEL_WATCH_SECONDS to have every worker pick up a new file.
+    """
+    _require_admin(x_admin_token)
+    try:
+        result = await asyncio.to_thread(reload_local_model)
+    except ModelReloadInProgress as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    except Exception as exc:
+        # The previous model keeps serving
+        raise HTTPException(status_code=422, detail=f"Model reload failed: {exc}")
+    return {"status": "reloaded", "pid": os.getpid(), **result}
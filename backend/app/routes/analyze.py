@@ -1,13 +1,15 @@
-from fastapi import APIRouter, UploadFile, File, Form, Depends
+import asyncio
+from fastapi import APIRouter, UploadFile, File, Form, Depends, Header
 from typing import Optional
 from sqlalchemy.orm import Session
-from app.utils.model_loader import predict_analyze
+from app.utils.model_loader import predict_analyze_async
 from app.utils.file_handler import extract_text_from_file
 from app.utils.voice_handler import convert_voice_to_text
-from app.utils.embedding_utils import get_embedding
+from app.utils.embedding_utils import get_document_embedding
+from app.utils.response_cache import bypass_requested
+from app.utils.text_normalizer import normalize_document_text
 from app.db.database import get_db
 from app.db.models import Document
-import json
 
 router = APIRouter(prefix="/api/analyze", tags=["Analyze"])
 
@@ -18,6 +20,8 @@ async def analyze(
     voice: Optional[UploadFile] = File(None),
     language: str = Form("en"),  # Language parameter
     db: Session = Depends(get_db),
+    x_cache_bypass: Optional[str] = Header(None),
+    cache_control: Optional[str] = Header(None),
     user_id: Optional[int] = None  # optional for future user management
 ):
     input_text = ""
@@ -42,13 +46,18 @@ async def analyze(
         except Exception as e:
             input_text += f"[Voice input: {voice.filename}] "
 
-    combined_text = input_text.strip()
+    # Drop extraction boilerplate (headers, footers, page numbers) before it reaches the LLM
+    normalized = normalize_document_text(input_text)
+    combined_text = normalized.text
 
     # 4️⃣ Call the model
-    prediction_result = predict_analyze(combined_text, language)
+    prediction_result = await predict_analyze_async(
+        combined_text, language, use_cache=not bypass_requested(x_cache_bypass, cache_control)
+    )
 
     # 5️⃣ Generate embedding
-    embedding_vector = await get_embedding(combined_text)
+    # None if only a fallback vector was available; it would not be comparable with the stored ones
+    embedding_vector, embedding_model = await get_document_embedding(combined_text)
 
     # 6️⃣ Save document and embedding to database
     try:
@@ -56,8 +65,8 @@ async def analyze(
             user_id=user_id,
             filename=file.filename if file else "input_text_or_voice",
             content=combined_text,
-            doc_metadata={},  # Use the renamed column
-            embedding=json.dumps(embedding_vector)  # Store as JSON string
+            doc_metadata={"embedding_model": embedding_model} if embedding_model else {},  # Use the renamed column
+            embedding=embedding_vector,
         )
         db.add(new_doc)
         db.commit()
@@ -67,6 +76,12 @@ async def analyze(
         print(f"⚠️ Database save failed: {e}")
         document_id = "demo_mode"
 
+    # 7️⃣ Make the document findable via /api/similar (numpy is loaded on first use)
+    if isinstance(document_id, int) and embedding_vector:
+        from app.utils.similarity_search import index_document
+        # Appending takes a file lock shared with the other workers; keep it off the event loop
+        await asyncio.to_thread(index_document, document_id, embedding_vector, embedding_model)
+
     # Create a summary of the input instead of returning the full text
     input_summary = combined_text[:200] + "..." if len(combined_text) > 200 else combined_text
     
@@ -79,5 +94,6 @@ async def analyze(
     return {
         "input_text": combined_text,
         "prediction": prediction_result,
-        "document_id": document_id
+        "document_id": document_id,
+        "normalization": normalized.stats(),
     }
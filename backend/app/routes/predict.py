@@ -1,6 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Header
+from typing import Optional
 from pydantic import BaseModel
-from app.utils.model_loader import predict
+from app.utils.model_loader import predict_async
+from app.utils.response_cache import bypass_requested
 
 router = APIRouter(prefix="/api/predict", tags=["Prediction"])
 
@@ -9,5 +11,10 @@ class PredictRequest(BaseModel):
     language: str = "en"  # Default to English
 
 @router.post("/")
-def get_prediction(req: PredictRequest):
-    return {"input": req.text, "prediction": predict(req.text, req.language)}
+async def get_prediction(
+    req: PredictRequest,
+    x_cache_bypass: Optional[str] = Header(None),
+    cache_control: Optional[str] = Header(None),
+):
+    use_cache = not bypass_requested(x_cache_bypass, cache_control)
+    return {"input": req.text, "prediction": await predict_async(req.text, req.language, use_cache=use_cache)}
@@ -1,13 +1,15 @@
-from fastapi import APIRouter, UploadFile, File, Form, Depends
+import asyncio
+from fastapi import APIRouter, UploadFile, File, Form, Depends, Header
 from typing import Optional
 from sqlalchemy.orm import Session
-from app.utils.model_loader import predict_research
+from app.utils.model_loader import predict_research_async
 from app.utils.file_handler import extract_text_from_file
 from app.utils.voice_handler import convert_voice_to_text
-from app.utils.embedding_utils import get_embedding
+from app.utils.embedding_utils import get_document_embedding
+from app.utils.response_cache import bypass_requested
+from app.utils.text_normalizer import normalize_document_text
 from app.db.database import get_db
 from app.db.models import Document
-import json
 
 router = APIRouter(prefix="/api/research", tags=["Research"])
 
@@ -18,6 +20,8 @@ async def research(
     voice: Optional[UploadFile] = File(None),
     language: str = Form("en"),  # Language parameter
     db: Session = Depends(get_db),
+    x_cache_bypass: Optional[str] = Header(None),
+    cache_control: Optional[str] = Header(None),
     user_id: Optional[int] = None
 ):
     """
@@ -46,13 +50,18 @@ async def research(
         except Exception as e:
             input_text += f"[Voice input: {voice.filename}] "
 
-    combined_text = input_text.strip()
+    # Drop extraction boilerplate (headers, footers, page numbers) before it reaches the LLM
+    normalized = normalize_document_text(input_text)
+    combined_text = normalized.text
 
     # 4️⃣ Call the specialized research model
-    prediction_result = predict_research(combined_text, language)
+    prediction_result = await predict_research_async(
+        combined_text, language, use_cache=not bypass_requested(x_cache_bypass, cache_control)
+    )
 
     # 5️⃣ Generate embedding
-    embedding_vector = await get_embedding(combined_text)
+    # None if only a fallback vector was available; it would not be comparable with the stored ones
+    embedding_vector, embedding_model = await get_document_embedding(combined_text)
 
     # 6️⃣ Save to database (best effort)
     document_id = "demo_mode"
@@ -61,8 +70,8 @@ async def research(
             user_id=user_id,
             filename=file.filename if file else "research_input",
             content=combined_text,
-            doc_metadata={},  # Use the renamed column
-            embedding=json.dumps(embedding_vector)
+            doc_metadata={"embedding_model": embedding_model} if embedding_model else {},  # Use the renamed column
+            embedding=embedding_vector,
         )
         db.add(new_doc)
         db.commit()
@@ -71,8 +80,15 @@ async def research(
     except Exception as e:
         print(f"⚠️ Database save failed: {e}")
 
+    # 7️⃣ Make the document findable via /api/similar (numpy is loaded on first use)
+    if isinstance(document_id, int) and embedding_vector:
+        from app.utils.similarity_search import index_document
+        # Appending takes a file lock shared with the other workers; keep it off the event loop
+        await asyncio.to_thread(index_document, document_id, embedding_vector, embedding_model)
+
     return {
         "input_text": combined_text,
         "prediction": prediction_result,
-        "document_id": document_id
+        "document_id": document_id,
+        "normalization": normalized.stats(),
     }
\ No newline at end of file
@@ -0,0 +1,46 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db
+from app.db.models import Document
+
+router = APIRouter(prefix="/api/similar", tags=["Similar Documents"])
+
+
+@router.get("/{document_id}")
+async def similar_documents(document_id: int, k: int = Query(10, ge=1, le=100), db: Session = Depends(get_db)):
+    """Stored documents whose embeddings are closest (cosine) to this document's."""
+    # numpy and the memory-mapped index load on first use
+    from app.utils.similarity_search import (
+        DimensionMismatch, ModelMismatch, embedding_model, search_similar, similarity_index,
+    )
+
+    document = db.get(Document, document_id)
+    if document is None:
+        raise HTTPException(status_code=404, detail=f"Document {document_id} not found")
+    if document.embedding is None:
+        raise HTTPException(status_code=422, detail=f"Document {document_id} has no stored embedding")
+
+    try:
+        method, matches = await asyncio.to_thread(
+            search_similar, document.embedding, k, (document_id,), embedding_model(document.doc_metadata),
+        )
+    except (DimensionMismatch, ModelMismatch) as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    found = {doc.id: doc for doc in db.query(Document).filter(Document.id.in_([doc_id for doc_id, _ in matches]))}
+    results = [
+        {
+            "document_id": doc_id,
+            "score": round(score, 4),
+            "filename": found[doc_id].filename,
+            "snippet": (found[doc_id].content or "")[:200],
+        }
+        for doc_id, score in matches
+        if doc_id in found
+    ]
+    return {
+        "document_id": document_id, "k": k, "method": method, "results": results, "indexed": len(similarity_index),
+    }
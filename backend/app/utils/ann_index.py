@@ -0,0 +1,257 @@
+"""
+Inverted-file (IVF) approximate nearest-neighbour index over the similarity index.
+
+The exact index in similarity_search.py scans every stored vector. This one
+clusters the vectors offline (spherical k-means, `nlist` centroids) and stores
+them grouped by cluster, so a query scores the centroids and then only the
+`nprobe` closest clusters. Each build is a directory under ANN_INDEX_DIR:
+
+- centroids.npy  (nlist, dim) float32, unit length
+- vectors.npy    (rows, dim) float32, rows grouped by cluster
+- ids.npy        (rows,) int64 document ids, same order
+- offsets.npy    (nlist + 1,) int64, cluster c is rows offsets[c]:offsets[c+1]
+- meta.json      dim, nlist, rows, and how many exact-index rows it covers
+
+`current` names the live build and is replaced atomically, so workers switch
+to a new build on their next query. Arrays are loaded with mmap, so only the
+probed clusters are paged in and the pages are shared between workers.
+
+Documents saved after a build are already in the exact index; they are scanned
+exactly as a "tail" until scripts/build_ann_index.py runs again (`--update`
+files them into the existing clusters without retraining).
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.utils.similarity_search import DimensionMismatch, SimilarityIndex, normalize_rows, top_k
+
+DEFAULT_ANN_DIR = Path(__file__).parent.parent.parent / "cache" / "ann"
+ANN_INDEX_DIR = Path(os.getenv("ANN_INDEX_DIR") or DEFAULT_ANN_DIR)
+ANN_NPROBE = int(os.getenv("ANN_NPROBE", "16"))
+
+_CHUNK = 8192
+
+
+def default_nlist(rows: int) -> int:
+    """About 4 * sqrt(rows) clusters, the usual IVF starting point."""
+    return max(1, min(rows, int(4 * np.sqrt(rows))))
+
+
+def assign_lists(matrix: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the closest centroid for each (unit-length) row."""
+    labels = np.empty(len(matrix), dtype=np.int64)
+    for start in range(0, len(matrix), _CHUNK):
+        labels[start:start + _CHUNK] = np.argmax(matrix[start:start + _CHUNK] @ centroids.T, axis=1)
+    return labels
+
+
+def train_centroids(sample: np.ndarray, nlist: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Spherical k-means: centroids are the normalised means of their members."""
+    rng = np.random.default_rng(seed)
+    centroids = np.array(sample[rng.choice(len(sample), nlist, replace=False)], dtype=np.float32)
+    for _ in range(iterations):
+        labels = assign_lists(sample, centroids)
+        counts = np.bincount(labels, minlength=nlist)
+        order = np.argsort(labels, kind="stable")
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        filled = counts > 0
+        centroids[filled] = normalize_rows(np.add.reduceat(sample[order], starts[filled], axis=0))
+        # Re-seed empty clusters from random members so no list stays unused
+        empty = np.flatnonzero(~filled)
+        if len(empty):
+            centroids[empty] = sample[rng.choice(len(sample), len(empty), replace=False)]
+    return centroids
+
+
+def new_build_dir(root: Path, prefix: str) -> Path:
+    build = root / f"{prefix}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    build.mkdir(parents=True)
+    return build
+
+
+def publish_build(build: Path) -> None:
+    """Point `current` at a finished build and prune all but the previous one."""
+    root = build.parent
+    pointer = root / "current.tmp"
+    pointer.write_text(build.name)
+    os.replace(pointer, root / "current")
+    # Keep the previous build for rollback; older ones can go (open mmaps survive unlinking)
+    builds = [path for path in root.iterdir() if path.is_dir()]
+    for old in sorted(builds, key=lambda path: path.stat().st_mtime)[:-2]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def _write_build(
+    root: Path, centroids: np.ndarray, parts: Sequence[Tuple[Any, np.ndarray, np.ndarray]], covered_rows: int,
+    last_id: int,
+) -> Path:
+    """Write a build from (vectors, ids, labels) parts and make it current."""
+    nlist, dim = centroids.shape
+    labels = np.concatenate([part[2] for part in parts])
+    bases = np.cumsum([0] + [len(part[2]) for part in parts])
+    order = np.argsort(labels, kind="stable")
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(labels, minlength=nlist)))).astype(np.int64)
+
+    build = new_build_dir(root, "ivf")
+    vectors = np.lib.format.open_memmap(build / "vectors.npy", mode="w+", dtype=np.float32, shape=(len(order), dim))
+    ids = np.lib.format.open_memmap(build / "ids.npy", mode="w+", dtype=np.int64, shape=(len(order),))
+    # order indexes the parts as if concatenated; copy a chunk of output rows at a time
+    for start in range(0, len(order), _CHUNK):
+        rows = order[start:start + _CHUNK]
+        for (part_vectors, part_ids, _), base, end in zip(parts, bases, bases[1:]):
+            mine = np.flatnonzero((rows >= base) & (rows < end))
+            if len(mine):
+                vectors[start + mine] = part_vectors[rows[mine] - base]
+                ids[start + mine] = part_ids[rows[mine] - base]
+    vectors.flush()
+    ids.flush()
+    np.save(build / "centroids.npy", centroids.astype(np.float32))
+    np.save(build / "offsets.npy", offsets)
+    (build / "meta.json").write_text(json.dumps({
+        "dim": dim, "nlist": nlist, "rows": len(order), "covered_rows": covered_rows, "last_id": last_id,
+    }))
+
+    publish_build(build)
+    return build
+
+
+def build_ivf(
+    flat: SimilarityIndex, root: Path = ANN_INDEX_DIR, nlist: Optional[int] = None, iterations: int = 10,
+    sample: Optional[int] = None, seed: int = 0,
+) -> Path:
+    """Cluster every vector in the exact index into a new IVF build."""
+    matrix, ids = flat.arrays()
+    if not len(ids):
+        raise ValueError("The similarity index is empty; nothing to build from")
+    nlist = nlist or default_nlist(len(ids))
+    sample_size = min(len(ids), sample or max(nlist * 32, 10_000))
+    picks = np.sort(np.random.default_rng(seed).choice(len(ids), sample_size, replace=False))
+    started = time.perf_counter()
+    centroids = train_centroids(np.asarray(matrix[picks]), nlist, iterations, seed)
+    print(f"INFO: Trained {nlist} centroids on {sample_size} vectors in {time.perf_counter() - started:.1f}s")
+    labels = assign_lists(matrix, centroids)
+    return _write_build(root, centroids, [(matrix, ids, labels)], len(ids), int(ids[-1]))
+
+
+def update_ivf(flat: SimilarityIndex, root: Path = ANN_INDEX_DIR) -> Optional[Path]:
+    """Write a new build with the tail filed into the current clusters (no retraining)."""
+    index = IVFIndex.load(root, flat)
+    if index is None:
+        raise ValueError(f"No IVF build in {root}; run a full build first")
+    tail_matrix, tail_ids = index.tail()
+    if not len(tail_ids):
+        return None
+    old_labels = np.repeat(np.arange(index.nlist), np.diff(index.offsets))
+    covered = index.covered_rows + len(tail_ids)
+    return _write_build(
+        root, index.centroids,
+        [(index.vectors, index.ids, old_labels), (tail_matrix, tail_ids, assign_lists(tail_matrix, index.centroids))],
+        covered, int(tail_ids[-1]),
+    )
+
+
+class IVFIndex:
+    """One loaded IVF build plus the exact-index rows added after it."""
+
+    def __init__(self, build: Path, flat: SimilarityIndex):
+        meta = json.loads((build / "meta.json").read_text())
+        self.build = build
+        self.flat = flat
+        self.dim = meta["dim"]
+        self.nlist = meta["nlist"]
+        self.covered_rows = meta["covered_rows"]
+        self.last_id = meta["last_id"]
+        self.centroids = np.load(build / "centroids.npy")
+        self.offsets = np.load(build / "offsets.npy")
+        self.vectors = np.load(build / "vectors.npy", mmap_mode="r")
+        self.ids = np.load(build / "ids.npy", mmap_mode="r")
+
+    @classmethod
+    def load(cls, root: Path, flat: SimilarityIndex) -> Optional["IVFIndex"]:
+        """Load the current build, or None if there is none or it no longer matches the exact index."""
+        pointer = root / "current"
+        if not pointer.exists():
+            return None
+        index = cls(root / pointer.read_text().strip(), flat)
+        _, flat_ids = flat.arrays()
+        # The tail is "exact-index rows after covered_rows"; that only holds for the index it was built from
+        if len(flat_ids) < index.covered_rows or int(flat_ids[index.covered_rows - 1]) != index.last_id:
+            print(f"WARNING: IVF build {index.build.name} does not match the similarity index; using exact search")
+            return None
+        return index
+
+    def tail(self) -> Tuple[np.ndarray, np.ndarray]:
+        matrix, ids = self.flat.arrays()
+        return matrix[self.covered_rows:], ids[self.covered_rows:]
+
+    def search(
+        self, query: Any, k: int = 10, exclude_ids: Sequence[int] = (), nprobe: Optional[int] = None,
+    ) -> List[Tuple[int, float]]:
+        """Approximate top-k: the nprobe closest clusters plus the unclustered tail."""
+        q = normalize_rows(query)[0]
+        if q.shape[0] != self.dim:
+            raise DimensionMismatch(f"query has {q.shape[0]} dimensions, index has {self.dim}")
+        probes = np.sort(top_k(self.centroids @ q, min(nprobe or ANN_NPROBE, self.nlist)))
+        tail_matrix, tail_ids = self.tail()
+        score_parts, id_parts = [tail_matrix @ q], [tail_ids]
+        for cluster in probes:
+            start, end = self.offsets[cluster], self.offsets[cluster + 1]
+            if end > start:
+                score_parts.append(self.vectors[start:end] @ q)
+                id_parts.append(self.ids[start:end])
+        scores, ids = np.concatenate(score_parts), np.concatenate(id_parts)
+        if exclude_ids:
+            scores[np.isin(ids, np.asarray(exclude_ids, dtype=np.int64))] = -np.inf
+        best = top_k(scores, k)
+        return [(int(ids[i]), float(scores[i])) for i in best if np.isfinite(scores[i])]
+
+    def stats(self) -> dict:
+        return {
+            "build": self.build.name, "nlist": self.nlist, "rows": len(self.ids), "tail": len(self.tail()[1]),
+            "bytes": int(self.vectors.nbytes + self.ids.nbytes + self.centroids.nbytes),
+        }
+
+
+class CurrentBuild:
+    """The build `root/current` names, loaded on first use and again whenever `current` is replaced."""
+
+    def __init__(self, root: Path, load: Callable[[Path, SimilarityIndex], Any], label: str):
+        self.root = root
+        self.load = load
+        self.label = label
+        self._loaded = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    def get(self, flat: SimilarityIndex):
+        try:
+            stat = (self.root / "current").stat()
+            signature = (stat.st_ino, stat.st_mtime_ns)
+        except OSError:
+            signature = None
+        with self._lock:
+            if signature != self._signature:
+                try:
+                    self._loaded = self.load(self.root, flat) if signature is not None else None
+                except (OSError, ValueError, KeyError) as exc:
+                    print(f"WARNING: Could not load the {self.label} index: {exc}")
+                    self._loaded = None
+                self._signature = signature
+            return self._loaded
+
+
+_current_ivf = CurrentBuild(ANN_INDEX_DIR, IVFIndex.load, "IVF")
+
+
+def current_ann_index(flat: SimilarityIndex) -> Optional[IVFIndex]:
+    """The live IVF build, or None when none has been built."""
+    return _current_ivf.get(flat)
@@ -0,0 +1,126 @@
+"""
+Circuit breaker shared by every outbound Gemini call.
+
+CLOSED: calls flow normally while outcomes are recorded in a rolling window.
+OPEN: the failure rate (errors plus calls slower than the latency threshold)
+crossed its limit, so calls are refused and callers fall back immediately.
+HALF_OPEN: after the probe interval a single call is let through; its outcome
+closes or re-opens the circuit.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Failure-rate and latency based circuit breaker."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 5,
+        slow_call_seconds: float = 15.0,
+        probe_interval_seconds: float = 30.0,
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min_calls
+        self.slow_call_seconds = slow_call_seconds
+        self.probe_interval_seconds = probe_interval_seconds
+        self.state = CLOSED
+        self.rejected = 0
+        self.opened_count = 0
+        self._outcomes: Deque[bool] = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        """True when a call would be let through (does not claim the half-open probe)."""
+        with self._lock:
+            if self.state == OPEN:
+                return time.monotonic() - self._opened_at >= self.probe_interval_seconds
+            if self.state == HALF_OPEN:
+                return not self._probe_in_flight
+            return True
+
+    def allow_request(self) -> bool:
+        """Claim permission for one upstream call."""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.probe_interval_seconds:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self, latency: float) -> None:
+        if latency > self.slow_call_seconds:
+            self.record_failure()
+            return
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.state = CLOSED
+                self._probe_in_flight = False
+                self._outcomes.clear()
+            self._outcomes.append(False)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._trip()
+                return
+            self._outcomes.append(True)
+            if self.state == CLOSED and len(self._outcomes) >= self.min_calls:
+                if self._failure_rate() >= self.failure_rate_threshold:
+                    self._trip()
+
+    def _trip(self) -> None:
+        self.state = OPEN
+        self.opened_count += 1
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self._outcomes.clear()
+        print(f"WARNING: Circuit '{self.name}' opened; skipping upstream calls for {self.probe_interval_seconds:g}s")
+
+    def _failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in: Optional[float] = None
+            if self.state == OPEN:
+                retry_in = max(0.0, self.probe_interval_seconds - (time.monotonic() - self._opened_at))
+            return {
+                "state": self.state,
+                "failure_rate": round(self._failure_rate(), 4),
+                "window_calls": len(self._outcomes),
+                "rejected": self.rejected,
+                "opened_count": self.opened_count,
+                "retry_in_seconds": round(retry_in, 1) if retry_in is not None else None,
+            }
+
+
+gemini_breaker = CircuitBreaker(
+    "gemini",
+    failure_rate_threshold=float(os.getenv("GEMINI_BREAKER_FAILURE_RATE", "0.5")),
+    window_size=int(os.getenv("GEMINI_BREAKER_WINDOW", "20")),
+    min_calls=int(os.getenv("GEMINI_BREAKER_MIN_CALLS", "5")),
+    slow_call_seconds=float(os.getenv("GEMINI_BREAKER_SLOW_CALL_SECONDS", "15")),
+    probe_interval_seconds=float(os.getenv("GEMINI_BREAKER_PROBE_SECONDS", "30")),
+)
@@ -0,0 +1,83 @@
+"""
+Content-addressed cache for embedding vectors.
+
+Keys are sha256(model name + text), so the same document embedded by
+`/api/analyze/` and `/api/research/`, or again minutes later, costs one
+upstream call. Vectors are kept as packed float32 (4 bytes per dimension):
+`array('f')` in a bounded in-process LRU, and raw blobs in a SQLite file that
+survives restarts and is shared by every worker on the host. The disk tier
+keeps at most `disk_entries` vectors (least recently used go first; about
+150 MB at the default 50000 x 768 dims) and drops entries older than
+`ttl_seconds`, so vectors from a retired embedding model do not linger.
+The tiers, async access and access-time batching come from `SQLiteLRUCache`.
+"""
+
+import hashlib
+import os
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.utils.sqlite_cache import SQLiteLRUCache
+
+DEFAULT_EMBEDDING_CACHE_PATH = Path(__file__).parent.parent.parent / "cache" / "embeddings.db"
+
+
+def pack_vector(vector: Sequence[float]) -> array:
+    """Pack a vector as float32."""
+    return array("f", vector)
+
+
+class EmbeddingCache(SQLiteLRUCache):
+    """Float32 vectors, kept as raw blobs on disk with the model that produced them."""
+
+    table = "embedding_cache"
+    label = "Embedding cache"
+    value_columns = "model TEXT NOT NULL, dim INTEGER NOT NULL, vector BLOB NOT NULL"
+    value_column = "vector"
+
+    def __init__(
+        self,
+        db_path: Path = DEFAULT_EMBEDDING_CACHE_PATH,
+        memory_entries: int = 2048,
+        disk_entries: int = 50000,
+        ttl_seconds: float = 30 * 24 * 3600,
+    ):
+        super().__init__(db_path, memory_entries, disk_entries, ttl_seconds)
+
+    @staticmethod
+    def make_key(text: str, model_name: str) -> str:
+        return hashlib.sha256(f"{model_name}\x1f{text}".encode("utf-8")).hexdigest()
+
+    def set(self, key: str, vector: Sequence[float], model_name: str) -> None:
+        super().set(key, vector, model_name)
+
+    async def aset(self, key: str, vector: Sequence[float], model_name: str) -> None:
+        await super().aset(key, vector, model_name)
+
+    def _to_memory(self, vector: Sequence[float]) -> array:
+        return pack_vector(vector)
+
+    def _from_memory(self, stored: array) -> List[float]:
+        return stored.tolist()
+
+    def _encode(self, stored: array, model_name: str) -> Dict[str, Any]:
+        return {"model": model_name, "dim": len(stored), "vector": stored.tobytes()}
+
+    def _decode(self, raw: bytes) -> array:
+        vector = array("f")
+        vector.frombytes(raw)
+        return vector
+
+
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "1").strip() != "0"
+embedding_cache: Optional[EmbeddingCache] = None
+if EMBEDDING_CACHE_ENABLED:
+    embedding_cache = EmbeddingCache(
+        db_path=Path(os.getenv("EMBEDDING_CACHE_PATH") or DEFAULT_EMBEDDING_CACHE_PATH),
+        memory_entries=int(os.getenv("EMBEDDING_CACHE_MEMORY_ENTRIES", "2048")),
+        disk_entries=int(os.getenv("EMBEDDING_CACHE_DISK_ENTRIES", "50000")),
+        ttl_seconds=float(os.getenv("EMBEDDING_CACHE_TTL_SECONDS", str(30 * 24 * 3600))),
+    )
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=embedding_cache.reopen_after_fork)
@@ -1,47 +1,151 @@
+import asyncio
 import os
-import numpy as np
+import threading
+import time
+from typing import List, Optional, Tuple
 
-try:
-    import google.generativeai as genai
-except ImportError:
-    genai = None  # type: ignore
+from app.utils.circuit_breaker import gemini_breaker
+from app.utils.embedding_cache import EmbeddingCache, embedding_cache
+from app.utils.lazy_import import lazy_module
+from app.utils.micro_batcher import MicroBatcher
+from app.utils.rate_limiter import estimate_tokens, gemini_limiter
+from app.utils.singleflight import SingleFlight
 
 
 GEMINI_API_KEY = (os.getenv("GEMINI_API_KEY") or os.getenv("AI_API_KEY") or "").strip()
 GEMINI_EMBED_MODEL = os.getenv("GEMINI_EMBEDDING_MODEL") or "models/text-embedding-004"
 
-if genai is not None and GEMINI_API_KEY:
-    try:
-        genai.configure(api_key=GEMINI_API_KEY)
-    except Exception as exc:
-        print(f"⚠️ Gemini embedding client failed to initialize: {exc}")
-elif genai is None:
-    print("⚠️ google-generativeai not installed. Using dummy embeddings.")
-else:
-    print("ℹ️ Set GEMINI_API_KEY or AI_API_KEY to enable live embeddings")
+# google-generativeai is imported and configured on the first embedding request
+genai = None
+_genai_initialized = False
+_genai_lock = threading.Lock()
+
+
+def init_embedding_client():
+    """Import and configure google-generativeai once; None means local embeddings."""
+    global genai, _genai_initialized
+    if _genai_initialized:
+        return genai
+    with _genai_lock:
+        if _genai_initialized:
+            return genai
+        module = lazy_module("google.generativeai") if GEMINI_API_KEY else None
+        if module is not None:
+            try:
+                module.configure(api_key=GEMINI_API_KEY)
+                genai = module
+            except Exception as exc:
+                print(f"⚠️ Gemini embedding client failed to initialize: {exc}")
+        elif GEMINI_API_KEY:
+            print("⚠️ google-generativeai not installed. Using local embeddings.")
+        else:
+            print("ℹ️ Set GEMINI_API_KEY or AI_API_KEY to enable live embeddings")
+        _genai_initialized = True
+    return genai
+
+# Collapses identical concurrent embedding requests into one upstream call
+embedding_flight = SingleFlight("embeddings")
 
 async def get_embedding(text: str) -> list:
     """
     Returns vector embedding for a given text.
-    Falls back to dummy embeddings if OpenAI is not available.
+    Falls back to local hashed n-gram embeddings if Gemini is not available.
+    """
+    vector, _ = await get_embedding_with_model(text)
+    return vector
+
+
+async def get_embedding_with_model(text: str) -> Tuple[list, str]:
+    """`get_embedding`, plus the name of the model that actually produced the vector."""
+    client = genai if _genai_initialized else await asyncio.to_thread(init_embedding_client)
+    if client is None:
+        return await asyncio.to_thread(_local_embedding_with_model, text)
+
+    key = EmbeddingCache.make_key(text, GEMINI_EMBED_MODEL)
+    if embedding_cache is not None:
+        cached = await embedding_cache.aget(key)
+        if cached is not None:
+            return cached, GEMINI_EMBED_MODEL
+    return await embedding_flight.do(key, lambda: _embed_with_gemini(text, key))
+
+
+def active_embedding_model() -> str:
+    """The model stored document vectors are expected to come from."""
+    return GEMINI_EMBED_MODEL if init_embedding_client() is not None else init_local_embedder().model_name
+
+
+async def get_document_embedding(text: str) -> Tuple[Optional[list], Optional[str]]:
+    """Embedding to store with a document, and its model; (None, None) if only a fallback was available.
+
+    A local vector produced while Gemini is configured lives in a different
+    space from the stored Gemini vectors, so it is neither stored nor indexed.
+    """
+    vector, model_name = await get_embedding_with_model(text)
+    if model_name != active_embedding_model():
+        print(f"WARNING: Not storing a {model_name} fallback embedding alongside {active_embedding_model()} vectors")
+        return None, None
+    return vector, model_name
+
+
+async def _embed_with_gemini(text: str, key: str) -> Tuple[list, str]:
+    # Skip the upstream call entirely while the Gemini circuit is open
+    if not gemini_breaker.available():
+        return await asyncio.to_thread(_local_embedding_with_model, text)
+
+    data = await embedding_batcher.submit(text)
+    if data is None:
+        return await asyncio.to_thread(_local_embedding_with_model, text)
+    # Only Gemini embeddings are cached; local fallbacks are retried next time
+    if embedding_cache is not None:
+        await embedding_cache.aset(key, data, GEMINI_EMBED_MODEL)
+    return data, GEMINI_EMBED_MODEL
+
+
+def _embed_batch_with_gemini(texts: List[str]) -> List[Optional[list]]:
+    """Embed a batch of texts in one upstream call (runs in a worker thread).
+
+    Returns None in every position if the call fails, so each caller falls
+    back to a local embedding on its own.
     """
-    if genai is None or not GEMINI_API_KEY:
-        # Return a dummy embedding vector for demo purposes
-        # In a real scenario, you might use a different embedding model
-        np.random.seed(hash(text) % (2**32))  # Consistent random seed based on text
-        return np.random.random(1536).tolist()  # OpenAI embedding size
-    
+    if not gemini_breaker.allow_request():
+        return [None] * len(texts)
+
+    started = time.monotonic()
     try:
-        embedding = genai.embed_content(
-            model=GEMINI_EMBED_MODEL,
-            content=text,
-        )
-        data = embedding.get("embedding")
-        if data:
-            return data
-        raise ValueError("Embedding payload missing 'embedding' field")
+        with gemini_limiter.limit_sync(sum(estimate_tokens(text) for text in texts)):
+            embedding = genai.embed_content(
+                model=GEMINI_EMBED_MODEL,
+                content=texts,
+            )
     except Exception as exc:
+        gemini_breaker.record_failure()
         print(f"⚠️ Embedding generation failed: {exc}")
-        # Fallback to dummy embedding
-        np.random.seed(hash(text) % (2**32))
-        return np.random.random(1536).tolist()
+        return [None] * len(texts)
+    gemini_breaker.record_success(time.monotonic() - started)
+
+    vectors = embedding.get("embedding")
+    if not vectors or len(vectors) != len(texts):
+        print("⚠️ Embedding payload missing 'embedding' field")
+        return [None] * len(texts)
+    return list(vectors)
+
+
+# Concurrent embedding requests are flushed as one batchEmbedContents call
+embedding_batcher = MicroBatcher(
+    "embeddings",
+    _embed_batch_with_gemini,
+    max_batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", "32")),
+    max_wait_ms=float(os.getenv("EMBEDDING_BATCH_WAIT_MS", "10")),
+)
+
+
+def init_local_embedder():
+    """Import numpy and build the offline embedder (see app.utils.local_embeddings)."""
+    from app.utils.local_embeddings import local_embedder
+
+    return local_embedder
+
+
+def _local_embedding_with_model(text: str) -> Tuple[list, str]:
+    embedder = init_local_embedder()
+    return embedder.embed(text).tolist(), embedder.model_name
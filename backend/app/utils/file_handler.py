@@ -2,12 +2,12 @@ import aiofiles
 from pathlib import Path
 from fastapi import UploadFile
 
-try:
-    import docx
-    import PyPDF2
-    DOCUMENT_PROCESSING_AVAILABLE = True
-except ImportError:
-    DOCUMENT_PROCESSING_AVAILABLE = False
+from app.utils.lazy_import import is_installed, lazy_module
+from app.utils.text_normalizer import PAGE_BREAK
+
+# docx and PyPDF2 are only imported when a .docx/.pdf upload arrives
+DOCUMENT_PROCESSING_AVAILABLE = is_installed("docx") and is_installed("PyPDF2")
+if not DOCUMENT_PROCESSING_AVAILABLE:
     print("⚠️ Document processing libraries not available. Some formats will not be fully processed.")
 
 TMP_DIR = Path("tmp")
@@ -38,10 +38,11 @@ async def extract_text_from_file(file: UploadFile) -> str:
     try:
         if file.filename.endswith(".pdf"):
             with open(file_path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                text = "\n".join([page.extract_text() or "" for page in reader.pages]).strip()
+                reader = lazy_module("PyPDF2").PdfReader(f)
+                # Keep page boundaries so the normalizer can spot running headers/footers
+                text = PAGE_BREAK.join([page.extract_text() or "" for page in reader.pages]).strip()
         elif file.filename.endswith(".docx"):
-            doc = docx.Document(file_path)
+            doc = lazy_module("docx").Document(file_path)
             text = "\n".join([p.text for p in doc.paragraphs]).strip()
         elif file.filename.endswith(".txt"):
             with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
@@ -0,0 +1,160 @@
+"""
+Gemini prompt variants and prebuilt model handles.
+
+Every (task, language) combination gets its system instruction and its
+`GenerativeModel` handle built once, so request handlers only do a dict lookup.
+All handles share the SDK's default client (set up by `genai.configure`), so
+they reuse one underlying transport. Each task also carries a response
+schema so Gemini's constrained decoding emits the exact JSON shape we parse.
+"""
+
+from typing import Any, Dict, NamedTuple, Tuple
+
+# Bump whenever a system instruction or generation setting changes so that
+# anything keyed on prompt output (e.g. response caches) is invalidated.
+PROMPT_VERSION = "2"
+
+TASKS = ("analysis", "research")
+LANGUAGES = ("en", "hi")
+
+_HINDI_PREFIX = "Respond in Hindi language. "
+
+SYSTEM_INSTRUCTIONS: Dict[Tuple[str, str], str] = {
+    ("research", "hi"): (
+        _HINDI_PREFIX +
+        "आप LawGic AI हैं, कानूनी अनुसंधान सहायक। दिए गए कानूनी विषय के लिए भारतीय 3 प्रासंगिक मामलों के साथ JSON में व्यापक अनुसंधान: {"
+        "\"topic\": \"विषय हिंदी में\", "
+        "\"relevant_cases\": [हिंदी में case_name, year, court, summary के साथ 3 भारतीय मामले], "
+        "\"relevant_statutes\": [हिंदी में act_name, year, section, summary के साथ भारतीय कानून], "
+        "\"legal_principles\": [हिंदी में मुख्य कानूनी सिद्धांत], "
+        "\"jurisdiction\": \"हिंदी में भारतीय क्षेत्राधिकार जानकारी\", "
+        "\"analysis\": \"हिंदी में विस्तृत कानूनी विश्लेषण\", "
+        "\"remedies\": [हिंदी में उपलब्ध कानूनी उपाय], "
+        "\"recent_developments\": \"हिंदी में कानून में हाल के बदलाव\", "
+        "\"references\": [हिंदी में अतिरिक्त कानूनी स्रोत]\"} "
+        "भारतीय कानूनी प्रणाली पर ध्यान दें - केवल सुप्रीम कोर्ट, हाई कोर्ट और भारतीय कानून।"
+    ),
+    ("research", "en"): (
+        "You are LawGic AI, a specialized Indian legal research assistant. For the given legal topic, "
+        "provide a comprehensive legal research summary with EXACTLY 3 relevant Indian court cases (post-1950) as JSON: {"
+        "\"topic\": \"string\", "
+        "\"relevant_cases\": [3 objects with case_name, year, court, summary - ALL INDIAN CASES], "
+        "\"relevant_statutes\": [array of Indian laws/acts with act_name, year, section, summary], "
+        "\"legal_principles\": [array of key legal principles], "
+        "\"jurisdiction\": \"Indian jurisdiction info\", "
+        "\"analysis\": \"detailed legal analysis\", "
+        "\"remedies\": [array of available legal remedies], "
+        "\"recent_developments\": \"recent changes in law\", "
+        "\"references\": [array of additional legal sources]\"} "
+        "Focus on Indian legal system - Supreme Court, High Courts, and Indian statutes only."
+    ),
+    ("analysis", "hi"): (
+        _HINDI_PREFIX +
+        "आप LawGic AI हैं, कानूनी दस्तावेज़ विश्लेषण सहायक। दस्तावेज़ का विश्लेषण करके हिंदी में JSON में दें: {"
+        "\"category\": \"हिंदी में श्रेणी\", "
+        "\"document_summary\": \"हिंदी में संक्षिप्त पेशेवर सारांश\", "
+        "\"key_findings\": [हिंदी में महत्वपूर्ण कानूनी बिंदु], "
+        "\"risk_assessment\": {\"level\": \"उच्च/मध्यम/कम\", \"factors\": [हिंदी में जोखिम कारक]}, "
+        "\"recommendations\": [हिंदी में कार्ययोग्य कानूनी सलाह], "
+        "\"compliance_issues\": [हिंदी में संभावित अनुपालन समस्याएं], "
+        "\"next_steps\": [हिंदी में सुझाए गए कार्य], "
+        "\"disclaimer\": \"हिंदी में पेशेवर कानूनी अस्वीकरण\"}"
+    ),
+    ("analysis", "en"): (
+        "You are LawGic AI, a legal document analysis assistant. Analyze the document and return formatted JSON: {"
+        "\"category\": \"string\", "
+        "\"document_summary\": \"brief professional summary (not copy of original)\", "
+        "\"key_findings\": [array of important legal points], "
+        "\"risk_assessment\": {\"level\": \"High/Medium/Low\", \"factors\": [array of risk factors]}, "
+        "\"recommendations\": [array of actionable legal advice], "
+        "\"compliance_issues\": [array of potential compliance problems], "
+        "\"next_steps\": [array of suggested actions], "
+        "\"disclaimer\": \"professional legal disclaimer\"}"
+    ),
+}
+
+
+_STRING = {"type": "string"}
+_STRING_LIST = {"type": "array", "items": _STRING}
+
+
+def _object(properties: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": "object", "properties": properties, "required": list(properties)}
+
+
+RESPONSE_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "analysis": _object({
+        "category": _STRING,
+        "document_summary": _STRING,
+        "key_findings": _STRING_LIST,
+        "risk_assessment": _object({"level": _STRING, "factors": _STRING_LIST}),
+        "recommendations": _STRING_LIST,
+        "compliance_issues": _STRING_LIST,
+        "next_steps": _STRING_LIST,
+        "disclaimer": _STRING,
+    }),
+    "research": _object({
+        "topic": _STRING,
+        "relevant_cases": {"type": "array", "items": _object({
+            "case_name": _STRING, "year": _STRING, "court": _STRING, "summary": _STRING,
+        })},
+        "relevant_statutes": {"type": "array", "items": _object({
+            "act_name": _STRING, "year": _STRING, "section": _STRING, "summary": _STRING,
+        })},
+        "legal_principles": _STRING_LIST,
+        "jurisdiction": _STRING,
+        "analysis": _STRING,
+        "remedies": _STRING_LIST,
+        "recent_developments": _STRING,
+        "references": _STRING_LIST,
+    }),
+}
+
+
+def normalize_prompt_key(task: str, language: str) -> Tuple[str, str]:
+    """Map arbitrary task/language values onto a known prompt variant."""
+    task_key = "research" if task == "research" else "analysis"
+    language_key = "hi" if language == "hi" else "en"
+    return task_key, language_key
+
+
+def get_system_instruction(task: str, language: str) -> str:
+    """Return the system instruction for a task/language pair."""
+    return SYSTEM_INSTRUCTIONS[normalize_prompt_key(task, language)]
+
+
+class GeminiHandle(NamedTuple):
+    """A ready-to-use Gemini model plus the generation config it is called with."""
+
+    model: Any
+    generation_config: Any
+
+
+class GeminiModelRegistry:
+    """Builds one `GenerativeModel` per prompt variant and hands them out."""
+
+    def __init__(self, genai_module: Any, model_name: str):
+        self.model_name = model_name
+        self.generation_configs = {
+            task: genai_module.types.GenerationConfig(
+                temperature=0.1,  # Lower temperature for more consistent JSON
+                max_output_tokens=2048,  # More tokens for complex contracts
+                response_mime_type="application/json",
+                response_schema=RESPONSE_SCHEMAS[task],
+            )
+            for task in TASKS
+        }
+        self._handles: Dict[Tuple[str, str], GeminiHandle] = {}
+        for task in TASKS:
+            for language in LANGUAGES:
+                self._handles[(task, language)] = GeminiHandle(
+                    model=genai_module.GenerativeModel(
+                        model_name=model_name,
+                        system_instruction=SYSTEM_INSTRUCTIONS[(task, language)],
+                    ),
+                    generation_config=self.generation_configs[task],
+                )
+
+    def get(self, task: str, language: str) -> GeminiHandle:
+        """Return the prebuilt handle for a task/language pair."""
+        return self._handles[normalize_prompt_key(task, language)]
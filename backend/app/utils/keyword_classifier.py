@@ -0,0 +1,79 @@
+"""
+Single-pass keyword classifier for the heuristic fallbacks.
+
+All keywords of all categories are compiled at construction into one regex,
+factored as a prefix trie so the engine does not retry every alternative at
+each position. Classifying a document is one linear scan of the lower-cased
+text instead of one substring search per keyword, and every category is
+scored rather than the first matching one winning. (The text is lower-cased
+up front because `re.IGNORECASE` makes the scan several times slower.)
+
+Keywords match at the start of a word ("rent" matches "rental", not
+"current"), and every hit counts towards each category listing that keyword.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+
+def trie_regex(terms: Iterable[str]) -> str:
+    """Regex source matching any of `terms`, longest match first.
+
+    Spaces inside a term match any run of whitespace, so phrases still match
+    across the line wraps of extracted PDF text.
+    """
+    trie: Dict[str, Any] = {}
+    for term in terms:
+        node = trie
+        for char in " ".join(term.split()):
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def _emit(node: Dict[str, Any]) -> str:
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + _emit(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return _emit(trie)
+
+
+class KeywordClassifier:
+    """Scores text against keyword categories in one regex pass."""
+
+    def __init__(self, categories: Mapping[str, Sequence[str]]):
+        # Insertion order doubles as the tie-break priority between categories
+        self.categories = list(categories)
+        self._keyword_categories: Dict[str, list] = {}
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                self._keyword_categories.setdefault(" ".join(keyword.lower().split()), []).append(category)
+        self._pattern = re.compile(r"\b" + trie_regex(self._keyword_categories))
+
+    def _hits(self, text: str) -> List[str]:
+        """Keywords found at word starts, in order of appearance."""
+        return self._pattern.findall(text.lower())
+
+    def scores(self, text: str) -> Dict[str, int]:
+        """Count keyword hits per category."""
+        scores = dict.fromkeys(self.categories, 0)
+        for keyword in self._hits(text):
+            for category in self._keyword_categories[" ".join(keyword.split())]:
+                scores[category] += 1
+        return scores
+
+    def total_hits(self, text: str) -> int:
+        """Number of keyword occurrences, regardless of category."""
+        return len(self._hits(text))
+
+    def classify(self, text: str, default: Optional[str] = None) -> Optional[str]:
+        """Return the best-scoring category, or `default` when nothing matches."""
+        scores = self.scores(text)
+        best = max(self.categories, key=lambda category: scores[category], default=None)
+        if best is None or scores[best] == 0:
+            return default
+        return best
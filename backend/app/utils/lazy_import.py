@@ -0,0 +1,39 @@
+"""
+Deferred imports for heavy or optional dependencies.
+
+Importing the app should not pay for google-generativeai, PyPDF2, docx or
+speech_recognition until a request (or the startup warm-up) needs them.
+`is_installed` answers "could we use it?" without importing anything, and
+`lazy_module` imports on first call and caches the module, or None when it
+is not installed.
+"""
+
+import importlib
+import importlib.util
+import threading
+from types import ModuleType
+from typing import Dict, Optional
+
+_modules: Dict[str, Optional[ModuleType]] = {}
+_lock = threading.Lock()
+
+
+def is_installed(name: str) -> bool:
+    """True if `name` can be imported, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def lazy_module(name: str) -> Optional[ModuleType]:
+    """Import `name` once and return it, or None if it is not installed."""
+    if name in _modules:
+        return _modules[name]
+    with _lock:
+        if name not in _modules:
+            try:
+                _modules[name] = importlib.import_module(name)
+            except ImportError:
+                _modules[name] = None
+    return _modules[name]
@@ -0,0 +1,159 @@
+"""
+Offline text embeddings from hashed n-gram features.
+
+Used when no Gemini key is configured (or Gemini fails), so dev and offline
+deployments still get vectors whose cosine similarity reflects shared wording.
+Each text becomes byte 3/4/5-grams plus word unigrams and bigrams of its
+normalised form. Each feature is hashed with fixed arithmetic (no `hash()`,
+so results are identical in every process), weighted by sublinear TF and an
+optional IDF table, and signed-hashed into `dim` output columns. Rows are
+L2-normalised float32.
+
+A batch is handled with a few numpy passes over all of its texts at once;
+only normalisation and the per-word CRC are Python-level loops.
+"""
+
+import os
+import re
+import zlib
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_DIM = 768
+NGRAM_SIZES = (3, 4, 5)
+# Hashed feature ids are folded into this many IDF buckets (a power of two)
+IDF_BUCKETS = 1 << 20
+
+_NON_WORD = re.compile(r"[^\w]+")
+_MASK32 = np.uint64(0xFFFFFFFF)
+_PRIME = np.uint64(0x01000193)
+_WORD_SALT = 0x5BD1E995
+_BIGRAM_SALT = np.uint64(0x27D4EB2F)
+
+
+def _fmix32(h: np.ndarray) -> np.ndarray:
+    """MurmurHash3 finaliser on uint64 arrays holding 32-bit values."""
+    h = h ^ (h >> np.uint64(16))
+    h = (h * np.uint64(0x85EBCA6B)) & _MASK32
+    h = h ^ (h >> np.uint64(13))
+    h = (h * np.uint64(0xC2B2AE35)) & _MASK32
+    return h ^ (h >> np.uint64(16))
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse everything that is not a word character to single spaces."""
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def _ngram_ids(data: np.ndarray, n: int) -> np.ndarray:
+    """Hash every byte n-gram of `data` (uint64 array of byte values)."""
+    count = len(data) - n + 1
+    if count <= 0:
+        return np.empty(0, dtype=np.uint64)
+    h = np.full(count, np.uint64(n) * np.uint64(0x9E3779B1) & _MASK32, dtype=np.uint64)
+    for offset in range(n):
+        h = ((h * _PRIME) & _MASK32) ^ data[offset:offset + count]
+    return _fmix32(h)
+
+
+def batch_features(texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Hashed feature ids (with repeats) of a batch, and the row each belongs to.
+
+    All texts are concatenated into one byte buffer so every n-gram size is
+    hashed in a single vectorised pass; n-grams spanning two texts are dropped.
+    """
+    normalized = [normalize(text) for text in texts]
+    encoded = [f" {text} ".encode("utf-8") if text else b"" for text in normalized]
+    byte_rows = np.repeat(np.arange(len(texts), dtype=np.uint64), [len(chunk) for chunk in encoded])
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+
+    rows, ids = [], []
+    for n in NGRAM_SIZES:
+        grams = _ngram_ids(data, n)
+        inside = byte_rows[:len(grams)] == byte_rows[n - 1:]
+        rows.append(byte_rows[:len(grams)][inside])
+        ids.append(grams[inside])
+
+    words = [word for text in normalized if text for word in text.split(" ")]
+    word_rows = np.repeat(
+        np.arange(len(texts), dtype=np.uint64), [len(text.split(" ")) if text else 0 for text in normalized]
+    )
+    unigrams = _fmix32(np.fromiter(
+        (zlib.crc32(word.encode("utf-8"), _WORD_SALT) for word in words), dtype=np.uint64, count=len(words)
+    ))
+    bigrams = _fmix32(((unigrams[:-1] * _PRIME) & _MASK32) ^ unigrams[1:] ^ _BIGRAM_SALT)
+    inside = word_rows[:-1] == word_rows[1:]
+    rows += [word_rows, word_rows[:-1][inside]]
+    ids += [unigrams, bigrams[inside]]
+    return np.concatenate(rows), np.concatenate(ids)
+
+
+class HashedNgramEmbedder:
+    """Feature-hashing TF-IDF vectoriser projected to `dim` float32 columns."""
+
+    def __init__(self, dim: int = DEFAULT_DIM, idf: Optional[np.ndarray] = None):
+        if dim <= 0:
+            raise ValueError("dim must be positive")
+        if idf is not None and idf.shape != (IDF_BUCKETS,):
+            raise ValueError(f"idf table must have shape ({IDF_BUCKETS},)")
+        self.dim = dim
+        self.idf = idf.astype(np.float32) if idf is not None else None
+
+    @property
+    def model_name(self) -> str:
+        return f"local/hashed-ngrams-{self.dim}" + ("-idf" if self.idf is not None else "")
+
+    def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """Return an (len(texts), dim) float32 matrix of unit-length rows (zero rows for empty texts)."""
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        rows, ids = batch_features(texts)
+        if not len(ids):
+            return out
+
+        # Count each (row, feature) pair once for sublinear TF
+        keys, counts = np.unique((rows << np.uint64(32)) | ids, return_counts=True)
+        key_rows = (keys >> np.uint64(32)).astype(np.int64)
+        ids = keys & _MASK32
+
+        weights = 1.0 + np.log(counts, dtype=np.float32)
+        if self.idf is not None:
+            weights *= self.idf[(ids & np.uint64(IDF_BUCKETS - 1)).astype(np.int64)]
+        # Column from the low bits, sign from the top bit of the (already mixed) id
+        columns = (ids % np.uint64(self.dim)).astype(np.int64)
+        weights = np.where(ids >> np.uint64(31), -weights, weights)
+
+        flat = np.bincount(key_rows * self.dim + columns, weights=weights, minlength=len(texts) * self.dim)
+        out[:] = flat.reshape(len(texts), self.dim)
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_batch([text])[0]
+
+
+def fit_idf(texts: Sequence[str]) -> np.ndarray:
+    """Smoothed IDF over IDF_BUCKETS hashed features, as in sklearn's TfidfTransformer."""
+    document_frequency = np.zeros(IDF_BUCKETS, dtype=np.float64)
+    for start in range(0, len(texts), 256):
+        rows, ids = batch_features(texts[start:start + 256])
+        # One count per (document, bucket)
+        pairs = np.unique((rows << np.uint64(32)) | (ids & np.uint64(IDF_BUCKETS - 1)))
+        np.add.at(document_frequency, (pairs & _MASK32).astype(np.int64), 1)
+    return (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+
+def embedder_from_env() -> HashedNgramEmbedder:
+    dim = int(os.getenv("LOCAL_EMBEDDING_DIM", str(DEFAULT_DIM)))
+    idf_path = os.getenv("LOCAL_EMBEDDING_IDF_PATH")
+    if idf_path:
+        try:
+            return HashedNgramEmbedder(dim=dim, idf=np.load(Path(idf_path)))
+        except (OSError, ValueError) as exc:
+            print(f"WARNING: Could not load IDF table from {idf_path}, using TF only: {exc}")
+    return HashedNgramEmbedder(dim=dim)
+
+
+local_embedder = embedder_from_env()
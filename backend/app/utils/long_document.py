@@ -0,0 +1,110 @@
+"""
+Map-reduce helpers for documents that exceed a single prompt budget.
+
+`split_into_sections` packs paragraphs (falling back to sentences, then hard
+cuts) into token-budgeted sections; `merge_analyses` folds the per-section
+Gemini analyses back into the regular analysis schema.
+"""
+
+import re
+from collections import Counter
+from typing import Any, Dict, List
+
+from app.utils.rate_limiter import estimate_tokens
+
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?।])\s+")
+
+# Highest risk wins when sections disagree; Hindi prompt variants use उच्च/मध्यम/कम
+_RISK_RANK = {"low": 1, "कम": 1, "medium": 2, "मध्यम": 2, "high": 3, "उच्च": 3}
+_LIST_FIELDS = ("key_findings", "recommendations", "compliance_issues", "next_steps")
+
+
+def _pieces(text: str, max_tokens: int) -> List[str]:
+    """Break text into pieces that each fit the budget, preferring natural boundaries."""
+    pieces: List[str] = []
+    for paragraph in _PARAGRAPH_SPLIT.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if estimate_tokens(paragraph) <= max_tokens:
+            pieces.append(paragraph)
+            continue
+        for sentence in _SENTENCE_SPLIT.split(paragraph):
+            if estimate_tokens(sentence) <= max_tokens:
+                pieces.append(sentence)
+                continue
+            step = max_tokens * 4
+            pieces.extend(sentence[i:i + step] for i in range(0, len(sentence), step))
+    return pieces
+
+
+def split_into_sections(text: str, max_tokens: int) -> List[str]:
+    """Greedily pack the text into sections of at most `max_tokens` estimated tokens."""
+    sections: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for piece in _pieces(text, max_tokens):
+        piece_tokens = estimate_tokens(piece)
+        if current and current_tokens + piece_tokens > max_tokens:
+            sections.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += piece_tokens
+    if current:
+        sections.append("\n\n".join(current))
+    return sections
+
+
+def _dedupe(items: List[Any]) -> List[Any]:
+    seen = set()
+    unique = []
+    for item in items:
+        marker = str(item).strip().lower()
+        if marker and marker not in seen:
+            seen.add(marker)
+            unique.append(item)
+    return unique
+
+
+def merge_analyses(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine per-section analyses into one response with the analysis schema."""
+    merged: Dict[str, Any] = {}
+
+    categories = [r.get("category") for r in results if r.get("category")]
+    if categories:
+        merged["category"] = Counter(categories).most_common(1)[0][0]
+
+    summaries = [str(r["document_summary"]).strip() for r in results if r.get("document_summary")]
+    if summaries:
+        merged["document_summary"] = " ".join(_dedupe(summaries))
+
+    for field in _LIST_FIELDS:
+        values: List[Any] = []
+        for r in results:
+            value = r.get(field)
+            if isinstance(value, list):
+                values.extend(value)
+            elif value:
+                values.append(value)
+        merged[field] = _dedupe(values)
+
+    level = None
+    factors: List[Any] = []
+    for r in results:
+        risk = r.get("risk_assessment")
+        if not isinstance(risk, dict):
+            continue
+        candidate = risk.get("level")
+        if candidate and (level is None or
+                          _RISK_RANK.get(str(candidate).lower(), 0) > _RISK_RANK.get(str(level).lower(), 0)):
+            level = candidate
+        factors.extend(risk.get("factors") or [])
+    merged["risk_assessment"] = {"level": level or "Low", "factors": _dedupe(factors)}
+
+    disclaimers = [r["disclaimer"] for r in results if r.get("disclaimer")]
+    if disclaimers:
+        merged["disclaimer"] = disclaimers[0]
+
+    merged["sections_analyzed"] = len(results)
+    return merged
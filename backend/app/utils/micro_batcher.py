@@ -0,0 +1,87 @@
+"""
+Micro-batching for batch-oriented model calls made from async handlers.
+
+Concurrent `submit` calls are gathered until `max_batch_size` items are
+waiting or `max_wait_ms` has passed since the first one arrived. The batch
+function then runs once, in a worker thread, and each caller gets the result
+at its own position in the batch.
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class MicroBatcher:
+    """Groups concurrent single-item calls into batched calls of `fn`."""
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        self.name = name
+        self.fn = fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.counters = {"items": 0, "batches": 0, "largest_batch": 0, "busy_seconds": 0.0}
+        self._pending: List[Tuple[Any, "asyncio.Future[Any]"]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its result from the next batch."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending[:self.max_batch_size], self._pending[self.max_batch_size:]
+        if self._pending:
+            # Leftovers from an oversized burst start the next window straight away
+            self._timer = asyncio.get_running_loop().call_soon(self._flush)
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[Any, "asyncio.Future[Any]"]]) -> None:
+        items = [item for item, _ in batch]
+        started = time.monotonic()
+        try:
+            results = await asyncio.to_thread(self.fn, items)
+            if len(results) != len(items):
+                raise RuntimeError(f"{self.name} batch returned {len(results)} results for {len(items)} items")
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        finally:
+            self.counters["items"] += len(items)
+            self.counters["batches"] += 1
+            self.counters["largest_batch"] = max(self.counters["largest_batch"], len(items))
+            self.counters["busy_seconds"] += time.monotonic() - started
+
+        for (_, future), result in zip(batch, results):
+            # A caller that was cancelled (e.g. by a deadline) simply drops its result
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        batches = self.counters["batches"]
+        return {
+            **self.counters,
+            "busy_seconds": round(self.counters["busy_seconds"], 3),
+            "mean_batch_size": round(self.counters["items"] / batches, 2) if batches else 0.0,
+            "pending": len(self._pending),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
@@ -1,23 +1,174 @@
+import asyncio
+import hashlib
 import os
 import json
-import re
+import math
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.utils.circuit_breaker import gemini_breaker
+from app.utils.gemini_prompts import GeminiModelRegistry
+from app.utils.json_repair import parse_json_lenient
+from app.utils.keyword_classifier import KeywordClassifier
+from app.utils.lazy_import import lazy_module
+from app.utils.long_document import merge_analyses, split_into_sections
+from app.utils.micro_batcher import MicroBatcher
+from app.utils.model_router import HEAVY, TIERS, router_from_env
+from app.utils.process_stats import memory_usage_mb
+from app.utils.rate_limiter import estimate_tokens, gemini_limiter
+from app.utils.response_cache import ResponseCache, response_cache
+from app.utils.singleflight import SingleFlight
 
 
 MODEL_PATH = Path(__file__).parent.parent.parent / "models" / "model.pkl"
+# "r" memory-maps the numpy arrays of an uncompressed joblib dump instead of
+# copying them onto the heap; pages are then shared by every worker mapping the
+# file, and with gunicorn --preload the rest of the model is shared copy-on-write.
+MODEL_MMAP_MODE = os.getenv("MODEL_MMAP_MODE") or None
+# Loaded on first use (or by the startup warm-up), not at import. `model` and
+# `model_version` are only ever replaced together, under _model_lock.
 model = None
-if MODEL_PATH.exists():
+model_version: Optional[str] = None
+model_load_seconds: Optional[float] = None
+model_loaded_at: Optional[float] = None
+_model_checked = False
+_model_lock = threading.Lock()
+
+# Input every candidate model must answer with a dict before it is swapped in
+MODEL_SMOKE_TEXT = os.getenv("MODEL_SMOKE_TEXT", "The tenant shall pay rent on the first day of each month.")
+# Poll model.pkl every N seconds and hot-swap it when it changes; 0 disables
+MODEL_WATCH_SECONDS = float(os.getenv("MODEL_WATCH_SECONDS", "0"))
+reload_counters: Dict[str, Any] = {"succeeded": 0, "failed": 0, "last_error": None}
+_reload_lock = threading.Lock()
+_watch_thread: Optional[threading.Thread] = None
+
+
+class ModelReloadInProgress(RuntimeError):
+    """Raised when a reload is requested while another one is still running."""
+
+
+def _model_file_version(path: Path) -> str:
+    """Short content hash of a model file, used as its version."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def _load_model_file(path: Path) -> Tuple[Any, str, float]:
+    """Load a joblib model and smoke-test it; raises if it is unusable."""
+    import joblib
+
+    started = time.perf_counter()
+    version = _model_file_version(path)
+    candidate = joblib.load(path, mmap_mode=MODEL_MMAP_MODE)
+    smoke = _run_local_model(candidate, [MODEL_SMOKE_TEXT])
+    if len(smoke) != 1 or not isinstance(smoke[0], dict):
+        raise ValueError(f"smoke prediction returned {smoke!r:.200}")
+    return candidate, version, time.perf_counter() - started
+
+
+def _swap_model(candidate: Any, version: Optional[str], load_seconds: Optional[float]) -> None:
+    global model, model_version, model_load_seconds, model_loaded_at, _model_checked
+    with _model_lock:
+        model, model_version = candidate, version
+        model_load_seconds = load_seconds
+        model_loaded_at = time.time() if candidate is not None else None
+        _model_checked = True
+
+
+def load_local_model() -> Any:
+    """Load model.pkl on first call and return it (None if absent or broken)."""
+    global _model_checked
+    if _model_checked:
+        return model
+    with _reload_lock:
+        if _model_checked:
+            return model
+        if not MODEL_PATH.exists():
+            print(f"INFO: No local model found at {MODEL_PATH}")
+            _model_checked = True
+            return model
+        try:
+            candidate, version, seconds = _load_model_file(MODEL_PATH)
+        except Exception as exc:
+            print(f"WARNING: Real model load failed: {exc}")
+            _swap_model(None, None, None)
+            return None
+        _swap_model(candidate, version, seconds)
+        print(f"Loaded real model {version} from {MODEL_PATH} in {seconds:.2f}s (mmap_mode={MODEL_MMAP_MODE})")
+    return model
+
+
+def reload_local_model(path: Optional[Path] = None) -> Dict[str, Any]:
+    """Load a new model file in the calling thread, validate it, then swap it in.
+
+    Requests already running keep the model object they started with, so they
+    finish on the old version; new requests see the new one. On failure the
+    current model keeps serving and the error is raised.
+    """
+    if not _reload_lock.acquire(blocking=False):
+        raise ModelReloadInProgress("A model reload is already in progress")
+    try:
+        source = Path(path) if path is not None else MODEL_PATH
+        try:
+            candidate, version, seconds = _load_model_file(source)
+        except Exception as exc:
+            reload_counters["failed"] += 1
+            reload_counters["last_error"] = f"{type(exc).__name__}: {exc}"
+            print(f"WARNING: Model reload from {source} failed, keeping version {model_version}: {exc}")
+            raise
+        previous = model_version
+        _swap_model(candidate, version, seconds)
+        reload_counters["succeeded"] += 1
+        reload_counters["last_error"] = None
+        print(f"INFO: Swapped local model {previous} -> {version} ({seconds:.2f}s)")
+        return {"previous_version": previous, "version": version, "load_seconds": round(seconds, 3)}
+    finally:
+        _reload_lock.release()
+
+
+def _model_file_signature() -> Optional[Tuple[int, int]]:
     try:
-        import joblib
+        stat = MODEL_PATH.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _watch_model_file(interval: float) -> None:
+    last_seen = _model_file_signature()
+    pending = None
+    while True:
+        time.sleep(interval)
+        signature = _model_file_signature()
+        if signature is None or signature == last_seen:
+            pending = None
+            continue
+        if signature != pending:
+            # Wait for one unchanged poll so a file still being written is not loaded
+            pending = signature
+            continue
+        last_seen, pending = signature, None
+        try:
+            reload_local_model()
+        except Exception:
+            pass  # logged and counted by reload_local_model
 
-        model = joblib.load(MODEL_PATH)
-        print(f"Loaded real model from {MODEL_PATH}")
-    except Exception as exc:
-        model = None
-        print(f"WARNING: Real model load failed: {exc}")
-else:
-    print(f"INFO: No local model found at {MODEL_PATH}")
+
+def start_model_watch() -> bool:
+    """Start polling model.pkl for changes if MODEL_WATCH_SECONDS is set (once per process)."""
+    global _watch_thread
+    if MODEL_WATCH_SECONDS <= 0 or _watch_thread is not None:
+        return False
+    _watch_thread = threading.Thread(
+        target=_watch_model_file, args=(MODEL_WATCH_SECONDS,), name="model-watch", daemon=True
+    )
+    _watch_thread.start()
+    return True
 
 
 try:
@@ -30,16 +181,67 @@ except Exception as exc:
     print(f"WARNING: AI Legal Model failed to load: {exc}")
 
 
-try:
-    import google.generativeai as genai
-except ImportError:
-    genai = None  # type: ignore
-
-
 GEMINI_API_KEY = (os.getenv("GEMINI_API_KEY") or os.getenv("AI_API_KEY") or "").strip()
 DEFAULT_GEMINI_MODEL = "models/gemini-2.5-flash"
-GEMINI_MODEL_NAME = None
+DEFAULT_GEMINI_LIGHT_MODEL = "models/gemini-2.5-flash-lite"
+GEMINI_MODEL_NAME = None  # heavy tier; also the model used when routing is disabled
+GEMINI_MODEL_NAMES: Dict[str, str] = {}
+GEMINI_MODELS: Dict[str, GeminiModelRegistry] = {}
 GEMINI_MODEL = None
+_gemini_initialized = False
+_gemini_lock = threading.Lock()
+
+# Collapses identical concurrent Gemini requests into one upstream call
+gemini_flight = SingleFlight("gemini")
+
+# Latency SLOs (seconds) after which async endpoints serve the heuristic fallback; 0 disables
+ANALYZE_DEADLINE_SECONDS = float(os.getenv("ANALYZE_DEADLINE_SECONDS", "15"))
+RESEARCH_DEADLINE_SECONDS = float(os.getenv("RESEARCH_DEADLINE_SECONDS", "20"))
+PREDICT_DEADLINE_SECONDS = float(os.getenv("PREDICT_DEADLINE_SECONDS", "10"))
+deadline_counters: Dict[str, Dict[str, int]] = {
+    task: {"gemini": 0, "fallback": 0, "deadline_exceeded": 0} for task in ("analysis", "research")
+}
+
+# Keyword lists shared by the heuristic fallbacks and the complexity router
+CONTRACT_KEYWORDS = ("contract", "agreement", "terms", "conditions", "party", "obligation")
+TENANT_KEYWORDS = ("rent", "lease", "tenant", "landlord", "property", "eviction")
+EMPLOYMENT_KEYWORDS = ("employment", "job", "salary", "termination", "workplace", "employee")
+CRIMINAL_KEYWORDS = ("crime", "criminal", "court", "judge", "conviction", "sentence")
+LEGAL_KEYWORDS = (
+    CONTRACT_KEYWORDS + TENANT_KEYWORDS + EMPLOYMENT_KEYWORDS + CRIMINAL_KEYWORDS
+    + ("breach", "labor", "discrimination", "ipc", "crpc", "real estate", "immovable",
+       "constitutional", "fundamental rights", "directive principles")
+)
+
+# Built once at import; each fallback classifies its input in a single regex pass
+ANALYSIS_CATEGORIES = KeywordClassifier({
+    "Contract Law": CONTRACT_KEYWORDS,
+    "Tenant/Landlord Law": TENANT_KEYWORDS,
+    "Employment Law": EMPLOYMENT_KEYWORDS,
+    "Criminal Law": CRIMINAL_KEYWORDS,
+})
+RESEARCH_TOPICS = KeywordClassifier({
+    "Contract Law in India": ("contract", "agreement", "breach"),
+    "Employment and Labour Law in India": ("employment", "workplace", "labor", "discrimination"),
+    "Criminal Law in India": ("criminal", "crime", "ipc", "crpc"),
+    "Property Law in India": ("property", "real estate", "land", "immovable"),
+    "Constitutional Law in India": ("constitutional", "fundamental rights", "directive principles"),
+})
+SIMPLE_ANSWER_TOPICS = KeywordClassifier({
+    "tenant": ("tenant", "rent", "landlord", "lease"),
+    "employment": ("employment", "job", "workplace", "salary"),
+    "contract": ("contract", "agreement", "legal document"),
+    "consumer": ("consumer", "product", "service", "warranty"),
+})
+
+# Sends simple requests to the light Gemini tier and complex ones to the heavy tier
+model_router = router_from_env(LEGAL_KEYWORDS)
+
+# Documents above this many estimated tokens are analysed section by section
+ANALYZE_CHUNK_TOKENS = int(os.getenv("ANALYZE_CHUNK_TOKENS", "8000"))
+ANALYZE_CHUNK_PARALLELISM = int(os.getenv("ANALYZE_CHUNK_PARALLELISM", "4"))
+# Deadline per round of ANALYZE_CHUNK_PARALLELISM concurrent section calls; replaces the request deadline
+ANALYZE_CHUNK_DEADLINE_SECONDS = float(os.getenv("ANALYZE_CHUNK_DEADLINE_SECONDS", "15"))
 
 def _sanitize_model_name(name: str) -> str:
     """Ensure Gemini model names are in the correct format."""
@@ -51,26 +253,56 @@ def _sanitize_model_name(name: str) -> str:
     return f"models/{cleaned}"
 
 
-if genai is not None and GEMINI_API_KEY:
-    try:
-        genai.configure(api_key=GEMINI_API_KEY)
-        GEMINI_MODEL_NAME = _sanitize_model_name(os.getenv("GEMINI_MODEL_NAME") or DEFAULT_GEMINI_MODEL)
-        GEMINI_MODEL = genai.GenerativeModel(
-            model_name=GEMINI_MODEL_NAME,
-            system_instruction=(
-                "You are LawGic AI, a legal assistant. Provide concise, structured legal analysis "
-                "as JSON with keys: category (string), summary (string), key_points (array of strings), "
-                "recommendations (array of strings), risk_level (string), disclaimer (string)."
-            ),
-        )
-        print(f"INFO: Gemini model '{GEMINI_MODEL_NAME}' ready for live analysis")
-    except Exception as exc:
-        GEMINI_MODEL = None
-        print(f"WARNING: Gemini initialization failed: {exc}")
-elif genai is None:
-    print("WARNING: google-generativeai not installed. Install backend requirements to enable Gemini.")
-else:
-    print("INFO: Set GEMINI_API_KEY or AI_API_KEY to enable Gemini responses")
+def _configured_model_names() -> Dict[str, str]:
+    """Gemini model name per tier, as configured in the environment."""
+    heavy_default = _sanitize_model_name(os.getenv("GEMINI_MODEL_NAME") or DEFAULT_GEMINI_MODEL)
+    return {
+        "light": _sanitize_model_name(os.getenv("GEMINI_LIGHT_MODEL_NAME") or DEFAULT_GEMINI_LIGHT_MODEL),
+        "heavy": _sanitize_model_name(os.getenv("GEMINI_HEAVY_MODEL_NAME") or heavy_default),
+    }
+
+
+def init_gemini() -> Any:
+    """Import and configure google-generativeai on first call.
+
+    Returns the heavy-tier model handle, or None when Gemini is unavailable.
+    """
+    global GEMINI_MODEL_NAME, GEMINI_MODEL_NAMES, GEMINI_MODELS, GEMINI_MODEL, _gemini_initialized
+    if _gemini_initialized:
+        return GEMINI_MODEL
+    with _gemini_lock:
+        if _gemini_initialized:
+            return GEMINI_MODEL
+        genai = lazy_module("google.generativeai") if GEMINI_API_KEY else None
+        if genai is not None:
+            try:
+                genai.configure(api_key=GEMINI_API_KEY)
+                GEMINI_MODEL_NAME = _sanitize_model_name(os.getenv("GEMINI_MODEL_NAME") or DEFAULT_GEMINI_MODEL)
+                GEMINI_MODEL_NAMES = _configured_model_names()
+                registries: Dict[str, GeminiModelRegistry] = {}
+                for tier in TIERS:
+                    name = GEMINI_MODEL_NAMES[tier]
+                    if name not in registries:
+                        registries[name] = GeminiModelRegistry(genai, name)
+                    GEMINI_MODELS[tier] = registries[name]
+                GEMINI_MODEL = GEMINI_MODELS[HEAVY].get("analysis", "en").model
+                print(f"INFO: Gemini models ready for live analysis (light='{GEMINI_MODEL_NAMES['light']}', "
+                      f"heavy='{GEMINI_MODEL_NAMES['heavy']}')")
+            except Exception as exc:
+                GEMINI_MODELS = {}
+                GEMINI_MODEL = None
+                print(f"WARNING: Gemini initialization failed: {exc}")
+        elif GEMINI_API_KEY:
+            print("WARNING: google-generativeai not installed. Install backend requirements to enable Gemini.")
+        else:
+            print("INFO: Set GEMINI_API_KEY or AI_API_KEY to enable Gemini responses")
+        _gemini_initialized = True
+    return GEMINI_MODEL
+
+
+async def init_gemini_async() -> Any:
+    """`init_gemini` for the event loop: the first call imports and configures the SDK in a thread."""
+    return GEMINI_MODEL if _gemini_initialized else await asyncio.to_thread(init_gemini)
 
 
 def predict(text: str, language: str = "en") -> Dict[str, Any]:
@@ -85,19 +317,10 @@ def predict(text: str, language: str = "en") -> Dict[str, Any]:
 
     cleaned_text = text.strip()
 
-    if model is not None:
-        try:
-            result = model.predict([cleaned_text])[0]
-            if isinstance(result, str):
-                try:
-                    return json.loads(result)
-                except json.JSONDecodeError:
-                    return {"analysis": result}
-            if isinstance(result, dict):
-                return result
-            return {"analysis": result}
-        except Exception as exc:
-            print(f"WARNING: Real model prediction failed: {exc}")
+    if load_local_model() is not None:
+        local_result = _local_model_predict(cleaned_text)
+        if local_result is not None:
+            return local_result
 
     # Try Gemini first (highest priority)
     gemini_result = _predict_with_gemini(cleaned_text, task="analysis", language=language)
@@ -148,106 +371,349 @@ def predict_research(text: str, language: str = "en") -> Dict[str, Any]:
     return research_legal_topic_fallback(cleaned_text, language)
 
 
-def _predict_with_gemini(text: str, task: str = "analysis", language: str = "en") -> Optional[Dict[str, Any]]:
-    """Generate structured analysis or research via Gemini."""
-    if GEMINI_MODEL is None:
-        return None
+def _normalize_local_output(result: Any) -> Dict[str, Any]:
+    if isinstance(result, str):
+        try:
+            return json.loads(result)
+        except json.JSONDecodeError:
+            return {"analysis": result}
+    if isinstance(result, dict):
+        return result
+    return {"analysis": result}
+
 
+def _run_local_model(candidate: Any, texts: List[str]) -> List[Dict[str, Any]]:
+    # Models exposing a structured API skip the JSON string round trip
+    predict_structured = getattr(candidate, "predict_structured", None)
+    if predict_structured is not None:
+        return list(predict_structured(texts))
+    return [_normalize_local_output(result) for result in candidate.predict(texts)]
+
+
+def _local_model_predict_batch(texts: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """Run the joblib model on a batch of inputs, normalising each output to a dict."""
+    # One consistent (model, version) pair for the whole batch, even if a reload swaps it meanwhile
+    with _model_lock:
+        current, version = model, model_version
     try:
-        # Language-specific prompts
-        lang_instruction = "" if language == "en" else "Respond in Hindi language. "
-        
-        # Different prompts for different tasks
-        if task == "research":
-            if language == "hi":
-                system_instruction = (
-                    lang_instruction +
-                    "आप LawGic AI हैं, कानूनी अनुसंधान सहायक। दिए गए कानूनी विषय के लिए भारतीय 3 प्रासंगिक मामलों के साथ JSON में व्यापक अनुसंधान: {"
-                    "\"topic\": \"विषय हिंदी में\", "
-                    "\"relevant_cases\": [हिंदी में case_name, year, court, summary के साथ 3 भारतीय मामले], "
-                    "\"relevant_statutes\": [हिंदी में act_name, year, section, summary के साथ भारतीय कानून], "
-                    "\"legal_principles\": [हिंदी में मुख्य कानूनी सिद्धांत], "
-                    "\"jurisdiction\": \"हिंदी में भारतीय क्षेत्राधिकार जानकारी\", "
-                    "\"analysis\": \"हिंदी में विस्तृत कानूनी विश्लेषण\", "
-                    "\"remedies\": [हिंदी में उपलब्ध कानूनी उपाय], "
-                    "\"recent_developments\": \"हिंदी में कानून में हाल के बदलाव\", "
-                    "\"references\": [हिंदी में अतिरिक्त कानूनी स्रोत]\"} "
-                    "भारतीय कानूनी प्रणाली पर ध्यान दें - केवल सुप्रीम कोर्ट, हाई कोर्ट और भारतीय कानून।"
-                )
-            else:
-                system_instruction = (
-                    "You are LawGic AI, a specialized Indian legal research assistant. For the given legal topic, "
-                    "provide a comprehensive legal research summary with EXACTLY 3 relevant Indian court cases (post-1950) as JSON: {"
-                    "\"topic\": \"string\", "
-                    "\"relevant_cases\": [3 objects with case_name, year, court, summary - ALL INDIAN CASES], "
-                    "\"relevant_statutes\": [array of Indian laws/acts with act_name, year, section, summary], "
-                    "\"legal_principles\": [array of key legal principles], "
-                    "\"jurisdiction\": \"Indian jurisdiction info\", "
-                    "\"analysis\": \"detailed legal analysis\", "
-                    "\"remedies\": [array of available legal remedies], "
-                    "\"recent_developments\": \"recent changes in law\", "
-                    "\"references\": [array of additional legal sources]\"} "
-                    "Focus on Indian legal system - Supreme Court, High Courts, and Indian statutes only."
-                )
-        else:  # analysis task
-            if language == "hi":
-                system_instruction = (
-                    lang_instruction +
-                    "आप LawGic AI हैं, कानूनी दस्तावेज़ विश्लेषण सहायक। दस्तावेज़ का विश्लेषण करके हिंदी में JSON में दें: {"
-                    "\"category\": \"हिंदी में श्रेणी\", "
-                    "\"document_summary\": \"हिंदी में संक्षिप्त पेशेवर सारांश\", "
-                    "\"key_findings\": [हिंदी में महत्वपूर्ण कानूनी बिंदु], "
-                    "\"risk_assessment\": {\"level\": \"उच्च/मध्यम/कम\", \"factors\": [हिंदी में जोखिम कारक]}, "
-                    "\"recommendations\": [हिंदी में कार्ययोग्य कानूनी सलाह], "
-                    "\"compliance_issues\": [हिंदी में संभावित अनुपालन समस्याएं], "
-                    "\"next_steps\": [हिंदी में सुझाए गए कार्य], "
-                    "\"disclaimer\": \"हिंदी में पेशेवर कानूनी अस्वीकरण\"}"
-                )
-            else:
-                system_instruction = (
-                    "You are LawGic AI, a legal document analysis assistant. Analyze the document and return formatted JSON: {"
-                    "\"category\": \"string\", "
-                    "\"document_summary\": \"brief professional summary (not copy of original)\", "
-                    "\"key_findings\": [array of important legal points], "
-                    "\"risk_assessment\": {\"level\": \"High/Medium/Low\", \"factors\": [array of risk factors]}, "
-                    "\"recommendations\": [array of actionable legal advice], "
-                    "\"compliance_issues\": [array of potential compliance problems], "
-                    "\"next_steps\": [array of suggested actions], "
-                    "\"disclaimer\": \"professional legal disclaimer\"}"
-                )
-        
-        # Create a temporary model with the appropriate system instruction
-        temp_model = genai.GenerativeModel(
-            model_name=GEMINI_MODEL_NAME,
-            system_instruction=system_instruction,
-        )
-        
-        generation_config = genai.types.GenerationConfig(
-            temperature=0.1,  # Lower temperature for more consistent JSON
-            max_output_tokens=2048,  # More tokens for complex contracts
-            response_mime_type="application/json",
-        )
-        response = temp_model.generate_content(
-            text,
-            generation_config=generation_config,
-        )
+        results = _run_local_model(current, texts)
+    except Exception as exc:
+        print(f"WARNING: Real model prediction failed: {exc}")
+        return [None] * len(texts)
+    if version is not None:
+        for result in results:
+            if isinstance(result, dict):
+                result["model_version"] = version
+    return results
 
-        payload = _extract_gemini_text(response)
-        if not payload:
-            return None
 
-        cleaned_output = _strip_json_code_fences(payload.strip())
-        parsed = json.loads(cleaned_output)
-        if isinstance(parsed, dict):
-            return parsed
-        return {"analysis": parsed}
-    except json.JSONDecodeError as exc:
+def _local_model_predict(cleaned_text: str) -> Optional[Dict[str, Any]]:
+    """Run the joblib model on a single input."""
+    return _local_model_predict_batch([cleaned_text])[0]
+
+
+def local_model_stats() -> Dict[str, Any]:
+    """Load details of the joblib model plus this worker's memory use."""
+    return {
+        "loaded": model is not None,
+        "load_attempted": _model_checked,
+        "version": model_version,
+        "path": str(MODEL_PATH),
+        "mmap_mode": MODEL_MMAP_MODE,
+        "load_seconds": round(model_load_seconds, 3) if model_load_seconds is not None else None,
+        "loaded_at": model_loaded_at,
+        "reloads": reload_counters,
+        "watch_seconds": MODEL_WATCH_SECONDS,
+        "pid": os.getpid(),
+        **memory_usage_mb(),
+    }
+
+
+# Concurrent async requests share one vectorised model.predict call
+local_batcher = MicroBatcher(
+    "local_model",
+    _local_model_predict_batch,
+    max_batch_size=int(os.getenv("LOCAL_MODEL_BATCH_SIZE", "32")),
+    max_wait_ms=float(os.getenv("LOCAL_MODEL_BATCH_WAIT_MS", "5")),
+)
+
+
+async def predict_async(text: str, language: str = "en", use_cache: bool = True) -> Dict[str, Any]:
+    """Async variant of `predict` that never blocks the event loop."""
+    if not text or not text.strip():
+        return predict(text, language)
+
+    cleaned_text = text.strip()
+
+    # The first request after a cold start loads the model off the event loop
+    local_model = model if _model_checked else await asyncio.to_thread(load_local_model)
+    if local_model is not None:
+        local_result = await local_batcher.submit(cleaned_text)
+        if local_result is not None:
+            return local_result
+
+    return await _predict_with_deadline(
+        cleaned_text, "analysis", language, use_cache, analyze_legal_text_fallback, PREDICT_DEADLINE_SECONDS
+    )
+
+
+async def predict_analyze_async(text: str, language: str = "en", use_cache: bool = True) -> Dict[str, Any]:
+    """Async variant of `predict_analyze` for the analyze endpoint."""
+    if not text or not text.strip():
+        return predict_analyze(text, language)
+
+    return await _predict_with_deadline(
+        text.strip(), "analysis", language, use_cache, analyze_legal_text_fallback, ANALYZE_DEADLINE_SECONDS
+    )
+
+
+async def predict_research_async(text: str, language: str = "en", use_cache: bool = True) -> Dict[str, Any]:
+    """Async variant of `predict_research` for the research endpoint."""
+    if not text or not text.strip():
+        return predict_research(text, language)
+
+    return await _predict_with_deadline(
+        text.strip(), "research", language, use_cache, research_legal_topic_fallback, RESEARCH_DEADLINE_SECONDS
+    )
+
+
+async def _predict_with_deadline(
+    cleaned_text: str,
+    task: str,
+    language: str,
+    use_cache: bool,
+    fallback: Callable[[str, str], Dict[str, Any]],
+    deadline: float,
+) -> Dict[str, Any]:
+    """Race Gemini against the heuristic fallback under a latency deadline.
+
+    Both start together. Gemini wins if it answers before `deadline` seconds;
+    otherwise the fallback result is returned and the Gemini call is abandoned
+    (the coalesced upstream call keeps running and still fills the cache).
+    A deadline of 0 waits for Gemini indefinitely. Documents analysed section
+    by section get `_chunked_deadline` instead, since their sections are
+    analysed in rounds. Cached Gemini answers are served first, even while the
+    circuit breaker is open or Gemini is not configured; otherwise, in those
+    cases, the fallback is returned straight away.
+    """
+    chunked = task == "analysis" and estimate_tokens(cleaned_text) > ANALYZE_CHUNK_TOKENS
+    sections = split_into_sections(cleaned_text, ANALYZE_CHUNK_TOKENS) if chunked else [cleaned_text]
+    gemini_model = await init_gemini_async()
+    gemini_ready = gemini_model is not None and gemini_breaker.available()
+
+    # A live chunked call reads the section cache itself, so only look ahead when it cannot run
+    if use_cache and (not chunked or not gemini_ready):
+        cached = await _cached_prediction(sections, task, language, chunked)
+        if cached is not None:
+            deadline_counters[task]["gemini"] += 1
+            cached["source"] = "gemini"
+            return cached
+
+    if not gemini_ready:
+        result = fallback(cleaned_text, language)
+        result["source"] = "fallback"
+        return result
+
+    if chunked:
+        gemini_call = _predict_chunked_async(sections, language, use_cache)
+        if deadline > 0:
+            deadline = _chunked_deadline(len(sections))
+    else:
+        # The cache was checked above; the call still stores its result
+        gemini_call = _predict_with_gemini_async(cleaned_text, task=task, language=language, use_cache=False)
+
+    fallback_task = asyncio.ensure_future(asyncio.to_thread(fallback, cleaned_text, language))
+    gemini_task = asyncio.ensure_future(gemini_call)
+    done, _ = await asyncio.wait({gemini_task}, timeout=deadline if deadline > 0 else None)
+
+    if gemini_task in done and gemini_task.result() is not None:
+        fallback_task.cancel()
+        deadline_counters[task]["gemini"] += 1
+        result = gemini_task.result()
+        result["source"] = "gemini"
+        return result
+
+    if gemini_task not in done:
+        gemini_task.cancel()
+        deadline_counters[task]["deadline_exceeded"] += 1
+        print(f"INFO: Gemini {task} exceeded {deadline:.1f}s deadline; serving fallback")
+    deadline_counters[task]["fallback"] += 1
+    result = await fallback_task
+    result["source"] = "fallback"
+    return result
+
+
+
+def _chunked_deadline(section_count: int) -> float:
+    """ANALYZE_CHUNK_DEADLINE_SECONDS for each round of parallel section calls (0 waits indefinitely)."""
+    return ANALYZE_CHUNK_DEADLINE_SECONDS * math.ceil(section_count / max(1, ANALYZE_CHUNK_PARALLELISM))
+
+
+async def _predict_chunked_async(sections: List[str], language: str, use_cache: bool) -> Optional[Dict[str, Any]]:
+    """Map-reduce analysis for documents larger than one prompt budget.
+
+    Sections (from `split_into_sections`) are analysed concurrently (at most
+    ANALYZE_CHUNK_PARALLELISM at a time) and merged back into the analysis
+    schema. Sections that fail are skipped; None is returned only if every
+    section failed.
+    """
+    semaphore = asyncio.Semaphore(ANALYZE_CHUNK_PARALLELISM)
+
+    async def _analyze_section(section: str) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            return await _predict_with_gemini_async(section, task="analysis", language=language, use_cache=use_cache)
+
+    results = await asyncio.gather(*[_analyze_section(section) for section in sections])
+    succeeded = [result for result in results if result is not None]
+    if not succeeded:
+        return None
+    if len(succeeded) < len(sections):
+        print(f"WARNING: {len(sections) - len(succeeded)} of {len(sections)} document sections failed analysis")
+    merged = merge_analyses(succeeded)
+    merged["sections_total"] = len(sections)
+    return merged
+
+def _build_gemini_request(task: str, language: str, tier: str) -> Tuple[Any, Any]:
+    """Return the prebuilt Gemini model handle and generation config for a task and tier."""
+    handle = GEMINI_MODELS[tier].get(task, language)
+    return handle.model, handle.generation_config
+
+
+def _parse_gemini_response(response: Any) -> Optional[Dict[str, Any]]:
+    """Decode the JSON payload of a Gemini response into a dict."""
+    payload = _extract_gemini_text(response)
+    if not payload:
+        return None
+
+    try:
+        parsed = parse_json_lenient(payload)
+    except ValueError as exc:
         print(f"WARNING: Gemini JSON decode failed: {exc}")
         print(f"WARNING: Raw response: {payload[:500]}...")
         return None
+
+    if isinstance(parsed, dict):
+        return parsed
+    return {"analysis": parsed}
+
+
+def _cache_key(text: str, task: str, language: str, tier: str) -> str:
+    # Names come from the environment when Gemini never initialised, so keys match those written earlier
+    model_names = GEMINI_MODEL_NAMES or _configured_model_names()
+    return ResponseCache.make_key(text, task, language, model_names[tier])
+
+
+async def _cached_prediction(
+    sections: List[str], task: str, language: str, chunked: bool
+) -> Optional[Dict[str, Any]]:
+    """A stored Gemini answer for this request, or None.
+
+    A chunked analysis is only answered from the cache when every section is
+    cached, since the merged result is never stored as a whole.
+    """
+    if response_cache is None:
+        return None
+    results = []
+    for section in sections:
+        cached = await response_cache.aget(_cache_key(section, task, language, model_router.route(section, task)))
+        if cached is None:
+            return None
+        results.append(cached)
+    if not chunked:
+        return results[0]
+    merged = merge_analyses(results)
+    merged["sections_total"] = len(sections)
+    return merged
+
+
+def _predict_with_gemini(
+    text: str, task: str = "analysis", language: str = "en", use_cache: bool = True
+) -> Optional[Dict[str, Any]]:
+    """Generate structured analysis or research via Gemini."""
+    tier = model_router.route(text, task)
+    cache_key = _cache_key(text, task, language, tier)
+    if response_cache is not None and use_cache:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    if init_gemini() is None or not gemini_breaker.allow_request():
+        return None
+
+    started = time.monotonic()
+    try:
+        temp_model, generation_config = _build_gemini_request(task, language, tier)
+        with gemini_limiter.limit_sync(estimate_tokens(text)):
+            response = temp_model.generate_content(
+                text,
+                generation_config=generation_config,
+            )
+    except Exception as exc:
+        gemini_breaker.record_failure()
+        model_router.record(tier, time.monotonic() - started, failed=True)
+        print(f"WARNING: Gemini prediction failed: {exc}")
+        return None
+    elapsed = time.monotonic() - started
+    gemini_breaker.record_success(elapsed)
+    model_router.record(tier, elapsed)
+
+    result = _parse_gemini_response(response)
+
+    if response_cache is not None and result is not None:
+        response_cache.set(cache_key, result)
+    return result
+
+
+async def _predict_with_gemini_async(
+    text: str, task: str = "analysis", language: str = "en", use_cache: bool = True
+) -> Optional[Dict[str, Any]]:
+    """Async variant of `_predict_with_gemini` using the SDK's non-blocking API.
+
+    Identical concurrent requests are coalesced into a single upstream call.
+    """
+    if await init_gemini_async() is None:
+        return None
+
+    tier = model_router.route(text, task)
+    cache_key = _cache_key(text, task, language, tier)
+    if response_cache is not None and use_cache:
+        cached = await response_cache.aget(cache_key)
+        if cached is not None:
+            return cached
+
+    return await gemini_flight.do(
+        cache_key, lambda: _generate_with_gemini_async(text, task, language, tier, cache_key)
+    )
+
+
+async def _generate_with_gemini_async(
+    text: str, task: str, language: str, tier: str, cache_key: str
+) -> Optional[Dict[str, Any]]:
+    if not gemini_breaker.allow_request():
+        return None
+
+    started = time.monotonic()
+    try:
+        temp_model, generation_config = _build_gemini_request(task, language, tier)
+        async with gemini_limiter.limit(estimate_tokens(text)):
+            response = await temp_model.generate_content_async(
+                text,
+                generation_config=generation_config,
+            )
     except Exception as exc:
+        gemini_breaker.record_failure()
+        model_router.record(tier, time.monotonic() - started, failed=True)
         print(f"WARNING: Gemini prediction failed: {exc}")
         return None
+    elapsed = time.monotonic() - started
+    gemini_breaker.record_success(elapsed)
+    model_router.record(tier, elapsed)
+
+    result = _parse_gemini_response(response)
+
+    if response_cache is not None and result is not None:
+        await response_cache.aset(cache_key, result)
+    return result
 
 
 def _extract_gemini_text(response: Any) -> str:
@@ -271,50 +737,9 @@ def _extract_gemini_text(response: Any) -> str:
     return ""
 
 
-def _strip_json_code_fences(content: str) -> str:
-    """Remove Markdown code fences so JSON can be parsed reliably."""
-    if content.startswith("```"):
-        content = re.sub(r"^```json?", "", content, flags=re.IGNORECASE).strip()
-        content = content.rstrip("`").strip()
-    return content
-
-
 def analyze_legal_text_fallback(text: str, language: str = "en") -> Dict[str, Any]:
     """Heuristic legal analysis when no live model is available."""
-    text_lower = text.lower()
-
-    contract_keywords = [
-        "contract",
-        "agreement",
-        "terms",
-        "conditions",
-        "party",
-        "obligation",
-    ]
-    tenant_keywords = [
-        "rent",
-        "lease",
-        "tenant",
-        "landlord",
-        "property",
-        "eviction",
-    ]
-    employment_keywords = [
-        "employment",
-        "job",
-        "salary",
-        "termination",
-        "workplace",
-        "employee",
-    ]
-    criminal_keywords = [
-        "crime",
-        "criminal",
-        "court",
-        "judge",
-        "conviction",
-        "sentence",
-    ]
+    category = ANALYSIS_CATEGORIES.classify(text)
 
     analysis: Dict[str, Any] = {
         "category": "General Legal Query",
@@ -323,8 +748,10 @@ def analyze_legal_text_fallback(text: str, language: str = "en") -> Dict[str, An
         "recommendations": [],
     }
 
-    if any(keyword in text_lower for keyword in contract_keywords):
-        analysis["category"] = "Contract Law"
+    if category is not None:
+        analysis["category"] = category
+
+    if category == "Contract Law":
         analysis["key_points"] = [
             "Contract terms and obligations identified",
             "Party responsibilities outlined",
@@ -335,8 +762,7 @@ def analyze_legal_text_fallback(text: str, language: str = "en") -> Dict[str, An
             "Ensure mutual obligations are clear",
             "Consider legal consultation for complex terms",
         ]
-    elif any(keyword in text_lower for keyword in tenant_keywords):
-        analysis["category"] = "Tenant/Landlord Law"
+    elif category == "Tenant/Landlord Law":
         analysis["key_points"] = [
             "Rental agreement provisions analyzed",
             "Tenant and landlord rights identified",
@@ -347,8 +773,7 @@ def analyze_legal_text_fallback(text: str, language: str = "en") -> Dict[str, An
             "Document all communications with landlord",
             "Check local housing authority guidelines",
         ]
-    elif any(keyword in text_lower for keyword in employment_keywords):
-        analysis["category"] = "Employment Law"
+    elif category == "Employment Law":
         analysis["key_points"] = [
             "Employment terms and conditions reviewed",
             "Worker rights and protections noted",
@@ -359,8 +784,7 @@ def analyze_legal_text_fallback(text: str, language: str = "en") -> Dict[str, An
             "Keep records of workplace communications",
             "Consult HR or legal counsel if needed",
         ]
-    elif any(keyword in text_lower for keyword in criminal_keywords):
-        analysis["category"] = "Criminal Law"
+    elif category == "Criminal Law":
         analysis["key_points"] = [
             "Criminal law matters identified",
             "Legal procedures and rights noted",
@@ -388,20 +812,8 @@ def analyze_legal_text_fallback(text: str, language: str = "en") -> Dict[str, An
 
 def research_legal_topic_fallback(text: str, language: str = "en") -> Dict[str, Any]:
     """Indian legal research fallback when no live model is available."""
-    text_lower = text.lower()
-    
     # Determine topic category
-    research_topic = "General Legal Research"
-    if any(keyword in text_lower for keyword in ["contract", "agreement", "breach"]):
-        research_topic = "Contract Law in India"
-    elif any(keyword in text_lower for keyword in ["employment", "workplace", "labor", "discrimination"]):
-        research_topic = "Employment and Labour Law in India"
-    elif any(keyword in text_lower for keyword in ["criminal", "crime", "ipc", "crpc"]):
-        research_topic = "Criminal Law in India"
-    elif any(keyword in text_lower for keyword in ["property", "real estate", "land", "immovable"]):
-        research_topic = "Property Law in India"
-    elif any(keyword in text_lower for keyword in ["constitutional", "fundamental rights", "directive principles"]):
-        research_topic = "Constitutional Law in India"
+    research_topic = RESEARCH_TOPICS.classify(text, default="General Legal Research")
     
     # Indian cases and statutes based on topic
     indian_cases = []
@@ -543,9 +955,9 @@ def research_legal_topic_fallback(text: str, language: str = "en") -> Dict[str,
 
 def get_simple_legal_answer(text: str) -> str:
     """Simple legal answer fallback for quick predict endpoint."""
-    text_lower = text.lower()
+    topic = SIMPLE_ANSWER_TOPICS.classify(text)
     
-    if any(keyword in text_lower for keyword in ["tenant", "rent", "landlord", "lease"]):
+    if topic == "tenant":
         return (
             "**Tenant Rights Overview:**\n\n"
             "As a tenant in India, you have several key rights:\n\n"
@@ -557,7 +969,7 @@ def get_simple_legal_answer(text: str) -> str:
             "Keep all rental agreements and payment receipts for your records."
         )
     
-    elif any(keyword in text_lower for keyword in ["employment", "job", "workplace", "salary"]):
+    elif topic == "employment":
         return (
             "**Employment Rights in India:**\n\n"
             "Key employment rights include:\n\n"
@@ -569,7 +981,7 @@ def get_simple_legal_answer(text: str) -> str:
             "**Tip:** Keep employment contracts, payslips, and communications documented."
         )
     
-    elif any(keyword in text_lower for keyword in ["contract", "agreement", "legal document"]):
+    elif topic == "contract":
         return (
             "**Contract Review Basics:**\n\n"
             "When reviewing any contract, focus on:\n\n"
@@ -581,7 +993,7 @@ def get_simple_legal_answer(text: str) -> str:
             "**Advice:** Have legal documents reviewed by a qualified lawyer before signing."
         )
     
-    elif any(keyword in text_lower for keyword in ["consumer", "product", "service", "warranty"]):
+    elif topic == "consumer":
         return (
             "**Consumer Rights in India:**\n\n"
             "Under the Consumer Protection Act 2019:\n\n"
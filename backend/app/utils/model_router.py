@@ -0,0 +1,103 @@
+"""
+Route Gemini requests to a light or heavy model tier by estimated complexity.
+
+The estimate is local and cheap: input size, task and how densely the text
+uses legal vocabulary. Short, plain questions go to the light (faster) model;
+long documents, dense legal text and the tasks listed in `heavy_tasks` go to
+the heavy one. Per-tier volume and latency are recorded so the effect of the
+rules can be checked on /health.
+"""
+
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, NamedTuple
+
+from app.utils.keyword_classifier import KeywordClassifier
+
+LIGHT = "light"
+HEAVY = "heavy"
+TIERS = (LIGHT, HEAVY)
+
+_WORD = re.compile(r"\w+")
+
+
+class ComplexityEstimate(NamedTuple):
+    tokens: int
+    keyword_hits: int
+    keyword_density: float
+
+
+class ComplexityRouter:
+    """Picks a model tier per request from configurable thresholds."""
+
+    def __init__(
+        self,
+        keywords: Iterable[str],
+        enabled: bool = True,
+        light_max_tokens: int = 512,
+        heavy_keyword_hits: int = 4,
+        heavy_keyword_density: float = 0.08,
+        heavy_tasks: Iterable[str] = ("research",),
+    ):
+        self.enabled = enabled
+        self.light_max_tokens = light_max_tokens
+        self.heavy_keyword_hits = heavy_keyword_hits
+        self.heavy_keyword_density = heavy_keyword_density
+        self.heavy_tasks = frozenset(heavy_tasks)
+        self._keywords = KeywordClassifier({"legal": tuple(keywords)})
+        self._lock = threading.Lock()
+        self.counters: Dict[str, Dict[str, float]] = {
+            tier: {"requests": 0, "failures": 0, "total_seconds": 0.0} for tier in TIERS
+        }
+
+    def estimate(self, text: str) -> ComplexityEstimate:
+        words = max(1, len(_WORD.findall(text)))
+        hits = self._keywords.total_hits(text)
+        return ComplexityEstimate(max(1, len(text) // 4), hits, hits / words)
+
+    def route(self, text: str, task: str) -> str:
+        """Return the tier ("light" or "heavy") that should serve this request."""
+        if not self.enabled or task in self.heavy_tasks:
+            return HEAVY
+        # Size alone decides long inputs, so they are never scanned for keywords
+        if len(text) // 4 > self.light_max_tokens:
+            return HEAVY
+        estimate = self.estimate(text)
+        if (estimate.keyword_hits >= self.heavy_keyword_hits
+                and estimate.keyword_density >= self.heavy_keyword_density):
+            return HEAVY
+        return LIGHT
+
+    def record(self, tier: str, seconds: float, failed: bool = False) -> None:
+        with self._lock:
+            counters = self.counters[tier]
+            counters["requests"] += 1
+            counters["total_seconds"] += seconds
+            if failed:
+                counters["failures"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            tiers = {}
+            for tier, counters in self.counters.items():
+                requests = counters["requests"]
+                tiers[tier] = {
+                    "requests": int(requests),
+                    "failures": int(counters["failures"]),
+                    "mean_latency_ms": round(counters["total_seconds"] / requests * 1000, 1) if requests else None,
+                }
+        return {"enabled": self.enabled, "tiers": tiers}
+
+
+def router_from_env(keywords: Iterable[str]) -> ComplexityRouter:
+    """Build a router configured by the GEMINI_ROUTING* environment variables."""
+    heavy_tasks = os.getenv("GEMINI_ROUTE_HEAVY_TASKS", "research")
+    return ComplexityRouter(
+        keywords,
+        enabled=os.getenv("GEMINI_ROUTING_ENABLED", "1") == "1",
+        light_max_tokens=int(os.getenv("GEMINI_ROUTE_LIGHT_MAX_TOKENS", "512")),
+        heavy_keyword_hits=int(os.getenv("GEMINI_ROUTE_HEAVY_KEYWORD_HITS", "4")),
+        heavy_keyword_density=float(os.getenv("GEMINI_ROUTE_HEAVY_KEYWORD_DENSITY", "0.08")),
+        heavy_tasks=[task.strip() for task in heavy_tasks.split(",") if task.strip()],
+    )
@@ -0,0 +1,37 @@
+"""
+Per-process memory figures for /health and the worker memory benchmark.
+
+RSS counts every resident page, including pages shared copy-on-write with
+other workers; PSS divides shared pages between the processes mapping them,
+so summing PSS across workers gives the real footprint. Both come from
+/proc on Linux; elsewhere only the peak RSS from `resource` (or nothing) is
+available.
+"""
+
+import os
+from typing import Dict, Optional
+
+_SMAPS_ROLLUP = "/proc/self/smaps_rollup"
+
+
+def memory_usage_mb() -> Dict[str, Optional[float]]:
+    """Current RSS/PSS of this process in MB (None where unsupported)."""
+    usage: Dict[str, Optional[float]] = {"rss_mb": None, "pss_mb": None}
+    try:
+        with open(_SMAPS_ROLLUP) as handle:
+            for line in handle:
+                key, _, value = line.partition(":")
+                if key in ("Rss", "Pss"):
+                    usage[f"{key.lower()}_mb"] = round(int(value.split()[0]) / 1024, 1)
+        return usage
+    except OSError:
+        pass
+    try:
+        import resource
+
+        # ru_maxrss is KB on Linux and bytes on macOS; this is only a peak figure
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        usage["rss_mb"] = round(peak / (1024 * 1024 if os.uname().sysname == "Darwin" else 1024), 1)
+    except (ImportError, AttributeError):
+        pass
+    return usage
@@ -0,0 +1,267 @@
+"""
+Compressed copies of the similarity-index vectors, searched without decoding.
+
+Two codecs, chosen when the index is built:
+
+- int8: every dimension scaled to one byte between its trained min and max
+  (4x smaller than float32)
+- pq:   product quantization. The vector is cut into `m` sub-vectors and each
+  is replaced by the id of its nearest of 256 trained centroids, so a
+  768-dim vector becomes m bytes (96 by default: 32x smaller)
+
+Queries stay float32 and are scored against the codes directly (asymmetric
+distance computation). For int8 this is one matmul against the byte matrix
+with the scale folded into the query. For PQ, a (m, 256) table of query/
+centroid dot products is built, and each code row sums m lookups. The best
+`k * QUANTIZED_RERANK` candidates are then re-scored with their exact vectors
+from the similarity index's memory map, so only those rows are paged in.
+
+Builds live under QUANTIZED_INDEX_DIR and are published like the IVF builds
+(see ann_index.py). Codes are kept in the exact index's row order, so rows
+saved after a build are scanned exactly as a tail until
+scripts/build_quantized_index.py --update encodes them.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.utils.ann_index import CurrentBuild, new_build_dir, publish_build
+from app.utils.similarity_search import DimensionMismatch, SimilarityIndex, normalize_rows, top_k
+
+DEFAULT_QUANTIZED_DIR = Path(__file__).parent.parent.parent / "cache" / "quantized"
+QUANTIZED_INDEX_DIR = Path(os.getenv("QUANTIZED_INDEX_DIR") or DEFAULT_QUANTIZED_DIR)
+QUANTIZED_RERANK = int(os.getenv("QUANTIZED_RERANK", "10"))
+
+CODECS = ("int8", "pq")
+_CHUNK = 4096  # keeps each converted block in cache while scoring
+
+
+class ScalarQuantizer:
+    """One byte per dimension, linear between the per-dimension min and max of the training data."""
+
+    def __init__(self, low: np.ndarray, scale: np.ndarray):
+        self.low = low.astype(np.float32)
+        self.scale = scale.astype(np.float32)
+
+    @classmethod
+    def train(cls, sample: np.ndarray) -> "ScalarQuantizer":
+        low, high = sample.min(axis=0), sample.max(axis=0)
+        return cls(low, np.maximum(high - low, 1e-12) / 255)
+
+    def encode(self, matrix: np.ndarray) -> np.ndarray:
+        return np.clip(np.rint((matrix - self.low) / self.scale), 0, 255).astype(np.uint8)
+
+    def scorer(self, query: np.ndarray):
+        """Dot products of the query with the rows the codes stand for, from the codes."""
+        weights, bias = query * self.scale, float(query @ self.low)
+        return lambda codes: codes.astype(np.float32) @ weights + bias
+
+    def codebook(self) -> np.ndarray:
+        return np.stack([self.low, self.scale])
+
+    @classmethod
+    def from_codebook(cls, codebook: np.ndarray) -> "ScalarQuantizer":
+        return cls(codebook[0], codebook[1])
+
+
+class ProductQuantizer:
+    """m sub-vectors, each replaced by the nearest of 256 centroids (one byte)."""
+
+    def __init__(self, centroids: np.ndarray):
+        if centroids.ndim != 3 or not 0 < centroids.shape[1] <= 256:
+            raise ValueError(f"PQ centroids must be (m, <=256, dim // m) to fit one-byte codes, got {centroids.shape}")
+        self.centroids = centroids.astype(np.float32)  # (m, 256, dim // m)
+        self.m, self.ksub, self.dsub = centroids.shape
+        # Start of each sub-vector's row in the flattened lookup table, in the narrowest dtype that holds
+        # every index (m * ksub - 1): uint16 up to m=256 keeps the scan fast, wider beyond that
+        self._offsets = (np.arange(self.m) * self.ksub).astype(np.min_scalar_type(self.m * self.ksub - 1))
+
+    @classmethod
+    def train(cls, sample: np.ndarray, m: int, iterations: int = 10, seed: int = 0) -> "ProductQuantizer":
+        if sample.shape[1] % m:
+            raise ValueError(f"{sample.shape[1]} dimensions do not split into {m} sub-vectors")
+        rng = np.random.default_rng(seed)
+        ksub = min(256, len(sample))
+        subvectors = sample.reshape(len(sample), m, -1)
+        centroids = np.empty((m, ksub, subvectors.shape[2]), dtype=np.float32)
+        for j in range(m):
+            data = np.ascontiguousarray(subvectors[:, j])
+            book = data[rng.choice(len(data), ksub, replace=False)].copy()
+            for _ in range(iterations):
+                labels = cls._nearest(data, book)
+                counts = np.bincount(labels, minlength=ksub)
+                sums = np.zeros_like(book)
+                np.add.at(sums, labels, data)
+                filled = counts > 0
+                book[filled] = sums[filled] / counts[filled, None]
+                empty = np.flatnonzero(~filled)
+                if len(empty):
+                    book[empty] = data[rng.choice(len(data), len(empty), replace=False)]
+            centroids[j] = book
+        return cls(centroids)
+
+    @staticmethod
+    def _nearest(data: np.ndarray, book: np.ndarray) -> np.ndarray:
+        # argmin |x - c|^2 == argmax x.c - |c|^2 / 2
+        return np.argmax(data @ book.T - 0.5 * np.einsum("kd,kd->k", book, book), axis=1)
+
+    def encode(self, matrix: np.ndarray) -> np.ndarray:
+        subvectors = matrix.reshape(len(matrix), self.m, self.dsub)
+        codes = np.empty((len(matrix), self.m), dtype=np.uint8)
+        for j in range(self.m):
+            codes[:, j] = self._nearest(np.ascontiguousarray(subvectors[:, j]), self.centroids[j])
+        return codes
+
+    def scorer(self, query: np.ndarray):
+        """Dot products via a (m, 256) lookup table built once per query."""
+        table = np.einsum("mkd,md->mk", self.centroids, query.reshape(self.m, self.dsub)).ravel()
+        return lambda codes: np.take(table, codes + self._offsets).sum(axis=1)
+
+    def codebook(self) -> np.ndarray:
+        return self.centroids
+
+    @classmethod
+    def from_codebook(cls, codebook: np.ndarray) -> "ProductQuantizer":
+        return cls(codebook)
+
+
+def _quantizer(codec: str, codebook: np.ndarray):
+    return ScalarQuantizer.from_codebook(codebook) if codec == "int8" else ProductQuantizer.from_codebook(codebook)
+
+
+def _write_build(
+    root: Path, codec: str, quantizer: Any, dim: int, vectors: Any, covered_rows: int, last_id: int,
+    existing_codes: Optional[np.ndarray] = None,
+) -> Path:
+    """Encode float32 rows (in exact-index order, after any existing codes) into a new build and publish it."""
+    build = new_build_dir(root, codec)
+    width = quantizer.m if codec == "pq" else dim
+    kept = len(existing_codes) if existing_codes is not None else 0
+    codes = np.lib.format.open_memmap(
+        build / "codes.npy", mode="w+", dtype=np.uint8, shape=(kept + len(vectors), width)
+    )
+    if kept:
+        codes[:kept] = existing_codes
+    for start in range(0, len(vectors), _CHUNK):
+        block = np.asarray(vectors[start:start + _CHUNK])
+        codes[kept + start:kept + start + len(block)] = quantizer.encode(block)
+    codes.flush()
+    np.save(build / "codebook.npy", quantizer.codebook())
+    (build / "meta.json").write_text(json.dumps({
+        "codec": codec, "dim": dim, "covered_rows": covered_rows, "last_id": last_id,
+    }))
+    publish_build(build)
+    return build
+
+
+def build_quantized(
+    flat: SimilarityIndex, codec: str = "pq", root: Path = QUANTIZED_INDEX_DIR, m: Optional[int] = None,
+    iterations: int = 10, sample: int = 20_000, seed: int = 0,
+) -> Path:
+    """Train a codec on a sample of the exact index and encode every row."""
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec {codec!r}; use one of {CODECS}")
+    matrix, ids = flat.arrays()
+    if not len(ids):
+        raise ValueError("The similarity index is empty; nothing to build from")
+    picks = np.sort(np.random.default_rng(seed).choice(len(ids), min(sample, len(ids)), replace=False))
+    training = np.asarray(matrix[picks])
+    started = time.perf_counter()
+    if codec == "int8":
+        quantizer = ScalarQuantizer.train(training)
+    else:
+        quantizer = ProductQuantizer.train(training, m or matrix.shape[1] // 8, iterations, seed)
+    print(f"INFO: Trained {codec} codec on {len(picks)} vectors in {time.perf_counter() - started:.1f}s")
+    return _write_build(root, codec, quantizer, matrix.shape[1], matrix, len(ids), int(ids[-1]))
+
+
+def update_quantized(flat: SimilarityIndex, root: Path = QUANTIZED_INDEX_DIR) -> Optional[Path]:
+    """Write a new build with the tail encoded by the current codec (no retraining)."""
+    index = QuantizedIndex.load(root, flat)
+    if index is None:
+        raise ValueError(f"No quantized build in {root}; run a full build first")
+    tail_matrix, tail_ids = index.tail()
+    if not len(tail_ids):
+        return None
+    return _write_build(
+        root, index.codec, index.quantizer, index.dim, tail_matrix,
+        index.covered_rows + len(tail_ids), int(tail_ids[-1]), existing_codes=index.codes,
+    )
+
+
+class QuantizedIndex:
+    """Codes for the first covered_rows rows of the exact index, plus its later rows as an exact tail."""
+
+    def __init__(self, build: Path, flat: SimilarityIndex):
+        meta = json.loads((build / "meta.json").read_text())
+        self.build = build
+        self.flat = flat
+        self.codec = meta["codec"]
+        self.dim = meta["dim"]
+        self.covered_rows = meta["covered_rows"]
+        self.last_id = meta["last_id"]
+        self.quantizer = _quantizer(self.codec, np.load(build / "codebook.npy"))
+        self.codes = np.load(build / "codes.npy", mmap_mode="r")
+
+    @classmethod
+    def load(cls, root: Path, flat: SimilarityIndex) -> Optional["QuantizedIndex"]:
+        """Load the current build, or None if there is none or it no longer matches the exact index."""
+        pointer = root / "current"
+        if not pointer.exists():
+            return None
+        index = cls(root / pointer.read_text().strip(), flat)
+        _, flat_ids = flat.arrays()
+        # Codes are addressed by exact-index row, so they only fit the index they were built from
+        if len(flat_ids) < index.covered_rows or int(flat_ids[index.covered_rows - 1]) != index.last_id:
+            print(f"WARNING: Quantized build {index.build.name} does not match the similarity index; "
+                  "using exact search")
+            return None
+        return index
+
+    def tail(self) -> Tuple[np.ndarray, np.ndarray]:
+        matrix, ids = self.flat.arrays()
+        return matrix[self.covered_rows:], ids[self.covered_rows:]
+
+    def search(
+        self, query: Any, k: int = 10, exclude_ids: Sequence[int] = (), rerank: Optional[int] = None,
+    ) -> List[Tuple[int, float]]:
+        """Top-k by code scores, with the best k * rerank candidates re-scored exactly (rerank=0: codes only)."""
+        q = normalize_rows(query)[0]
+        if q.shape[0] != self.dim:
+            raise DimensionMismatch(f"query has {q.shape[0]} dimensions, index has {self.dim}")
+        matrix, ids = self.flat.arrays()
+        rerank = QUANTIZED_RERANK if rerank is None else rerank
+
+        score = self.quantizer.scorer(q)
+        scores = np.concatenate(
+            [score(self.codes[start:start + _CHUNK]) for start in range(0, self.covered_rows, _CHUNK)]
+            + [matrix[self.covered_rows:] @ q]
+        ).astype(np.float32)
+        if exclude_ids:
+            scores[np.isin(ids[:len(scores)], np.asarray(exclude_ids, dtype=np.int64))] = -np.inf
+        rows = top_k(scores, k * rerank if rerank else k)
+        if rerank:
+            rows = np.sort(rows[np.isfinite(scores[rows])])
+            exact = matrix[rows] @ q
+            best = top_k(exact, k)
+            return [(int(ids[rows[i]]), float(exact[i])) for i in best]
+        return [(int(ids[i]), float(scores[i])) for i in rows if np.isfinite(scores[i])]
+
+    def stats(self) -> dict:
+        return {
+            "build": self.build.name, "codec": self.codec, "rows": self.covered_rows, "tail": len(self.tail()[1]),
+            "bytes": int(self.codes.nbytes), "bytes_per_vector": self.codes.shape[1],
+        }
+
+
+_current_quantized = CurrentBuild(QUANTIZED_INDEX_DIR, QuantizedIndex.load, "quantized")
+
+
+def current_quantized_index(flat: SimilarityIndex) -> Optional[QuantizedIndex]:
+    """The live quantized build, or None when none has been built."""
+    return _current_quantized.get(flat)
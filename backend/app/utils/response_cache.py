@@ -0,0 +1,77 @@
+"""
+Two-tier cache for Gemini responses.
+
+An in-process LRU in front of a SQLite file shared by every uvicorn worker on
+the host (see `SQLiteLRUCache`). Responses are stored as JSON and callers
+always get their own copy.
+"""
+
+import copy
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.utils.gemini_prompts import PROMPT_VERSION
+from app.utils.sqlite_cache import SQLiteLRUCache
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent.parent / "cache" / "gemini_responses.db"
+
+
+class ResponseCache(SQLiteLRUCache):
+    """Response dicts, kept as JSON text on disk."""
+
+    table = "response_cache"
+    label = "Response cache"
+    value_columns = "value TEXT NOT NULL"
+    value_column = "value"
+
+    def __init__(
+        self,
+        db_path: Path = DEFAULT_CACHE_PATH,
+        memory_entries: int = 512,
+        disk_entries: int = 20000,
+        ttl_seconds: float = 7 * 24 * 3600,
+    ):
+        super().__init__(db_path, memory_entries, disk_entries, ttl_seconds)
+
+    @staticmethod
+    def make_key(text: str, task: str, language: str, model_name: Optional[str]) -> str:
+        """Hash the normalised request together with everything that shapes the answer."""
+        normalized = " ".join(text.split())
+        material = "\x1f".join([normalized, task, language, model_name or "", PROMPT_VERSION])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _to_memory(self, value: Dict[str, Any]) -> Dict[str, Any]:
+        return copy.deepcopy(value)
+
+    def _from_memory(self, stored: Dict[str, Any]) -> Dict[str, Any]:
+        return copy.deepcopy(stored)
+
+    def _encode(self, stored: Dict[str, Any]) -> Dict[str, Any]:
+        return {"value": json.dumps(stored, ensure_ascii=False)}
+
+    def _decode(self, raw: str) -> Dict[str, Any]:
+        return json.loads(raw)
+
+
+def bypass_requested(x_cache_bypass: Optional[str] = None, cache_control: Optional[str] = None) -> bool:
+    """True when the client asked to skip cached responses."""
+    if x_cache_bypass and x_cache_bypass.strip().lower() in {"1", "true", "yes"}:
+        return True
+    return bool(cache_control and "no-cache" in cache_control.lower())
+
+
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "1").strip() != "0"
+response_cache: Optional[ResponseCache] = None
+if RESPONSE_CACHE_ENABLED:
+    response_cache = ResponseCache(
+        db_path=Path(os.getenv("RESPONSE_CACHE_PATH") or DEFAULT_CACHE_PATH),
+        memory_entries=int(os.getenv("RESPONSE_CACHE_MEMORY_ENTRIES", "512")),
+        disk_entries=int(os.getenv("RESPONSE_CACHE_DISK_ENTRIES", "20000")),
+        ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+    )
+    # Workers forked from a preloaded app must not share the parent's SQLite handle
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=response_cache.reopen_after_fork)
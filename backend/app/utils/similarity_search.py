@@ -0,0 +1,287 @@
+"""
+Exact top-k cosine similarity over stored document embeddings.
+
+The index is two append-only files in SIMILARITY_INDEX_DIR:
+
+- vectors.f32: contiguous float32 rows, L2-normalised once when appended
+- ids.i64:     the document id of each row (int64)
+
+plus `dim` and `model` files naming the vector size and the embedding model
+the rows came from. Vectors from any other model are refused, so cosine scores
+never compare vectors from unrelated spaces.
+
+Queries memory-map vectors.f32, so the matrix lives in the page cache and is
+shared by every worker instead of being copied onto each heap. A search is one
+matrix-vector product plus `argpartition`. Rows are appended as documents are
+saved. Every process notices growth (from itself or another worker) by
+checking the file size before each query, and catches up with the documents
+table on startup via `sync_from_db`.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialised within one process
+    fcntl = None  # type: ignore
+
+DEFAULT_INDEX_DIR = Path(__file__).parent.parent.parent / "cache" / "similarity"
+SIMILARITY_SEARCH = os.getenv("SIMILARITY_SEARCH", "auto").lower()
+
+
+class DimensionMismatch(ValueError):
+    """Raised when a vector does not match the dimension of the index."""
+
+
+class ModelMismatch(ValueError):
+    """Raised when a vector comes from a different embedding model than the index."""
+
+
+def normalize_rows(vectors: Any) -> np.ndarray:
+    """Return float32 rows scaled to unit length (zero rows stay zero)."""
+    matrix = np.array(vectors, dtype=np.float32, ndmin=2)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first."""
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class SimilarityIndex:
+    """Append-only, memory-mapped matrix of unit-length embeddings keyed by document id."""
+
+    def __init__(self, directory: Path = DEFAULT_INDEX_DIR):
+        self.directory = Path(directory)
+        self.vectors_path = self.directory / "vectors.f32"
+        self.ids_path = self.directory / "ids.i64"
+        self.dim_path = self.directory / "dim"
+        self.model_path = self.directory / "model"
+        self._lock = threading.Lock()
+        self._rows = 0
+        self._matrix: Optional[np.ndarray] = None
+        self._ids: Optional[np.ndarray] = None
+        self.dim: Optional[int] = int(self.dim_path.read_text()) if self.dim_path.exists() else None
+        self.model: Optional[str] = None
+        self._current_model()
+
+    def _current_model(self) -> Optional[str]:
+        """The index's embedding model, picking up one recorded by another worker."""
+        if self.model is None and self.model_path.exists():
+            self.model = self.model_path.read_text().strip() or None
+        return self.model
+
+    def check_model(self, model: Optional[str]) -> None:
+        """Raise ModelMismatch if `model` is known and differs from the index's model."""
+        current = self._current_model()
+        if model and current and model != current:
+            raise ModelMismatch(f"vector is from {model}, index holds {current} vectors")
+
+    def __len__(self) -> int:
+        return self._refresh()[1].shape[0]
+
+    def _refresh(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Remap the files if they grew since the last look; returns (matrix, ids)."""
+        if self.dim is None and self.dim_path.exists():
+            self.dim = int(self.dim_path.read_text())
+        try:
+            id_rows = self.ids_path.stat().st_size // 8
+            vector_rows = self.vectors_path.stat().st_size // (4 * self.dim) if self.dim else 0
+        except OSError:
+            id_rows = vector_rows = 0
+        # ids are written after vectors, so a row counts once its id is complete
+        rows = min(id_rows, vector_rows)
+        with self._lock:
+            if rows != self._rows or self._matrix is None:
+                if rows:
+                    self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+                    self._ids = np.memmap(self.ids_path, dtype=np.int64, mode="r", shape=(rows,))
+                else:
+                    self._matrix = np.empty((0, self.dim or 0), dtype=np.float32)
+                    self._ids = np.empty(0, dtype=np.int64)
+                self._rows = rows
+            return self._matrix, self._ids
+
+    def add(
+        self, document_ids: Sequence[int], vectors: Any, skip_existing: bool = False, model: Optional[str] = None,
+    ) -> int:
+        """Append rows for the given documents; returns the number of rows added.
+
+        `model` names the embedding model of the vectors; the first one given
+        is recorded for the index and any other is refused. skip_existing drops
+        ids already on disk, for catch-up runs that may race with another
+        worker doing the same.
+        """
+        matrix = normalize_rows(vectors)
+        ids = np.asarray(document_ids, dtype=np.int64)
+        if len(ids) != len(matrix):
+            raise ValueError(f"{len(ids)} ids for {len(matrix)} vectors")
+        if not len(ids):
+            return 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.directory / "append.lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            if self.dim is None:
+                if self.dim_path.exists():
+                    self.dim = int(self.dim_path.read_text())
+                else:
+                    self.dim_path.write_text(str(matrix.shape[1]))
+                    self.dim = matrix.shape[1]
+            if matrix.shape[1] != self.dim:
+                raise DimensionMismatch(f"vectors have {matrix.shape[1]} dimensions, index has {self.dim}")
+            self.check_model(model)
+            if model and self.model is None:
+                self.model_path.write_text(model)
+                self.model = model
+            # A crashed append can leave a partial row; trim both files back to whole rows first
+            rows = min(self._file_rows(self.ids_path, 8), self._file_rows(self.vectors_path, 4 * self.dim))
+            if skip_existing and rows:
+                fresh = ~np.isin(ids, np.memmap(self.ids_path, dtype=np.int64, mode="r", shape=(rows,)))
+                matrix, ids = matrix[fresh], ids[fresh]
+                if not len(ids):
+                    return 0
+            for path, row_bytes, data in ((self.vectors_path, 4 * self.dim, matrix), (self.ids_path, 8, ids)):
+                with open(path, "ab") as handle:
+                    handle.truncate(rows * row_bytes)
+                    handle.write(data.tobytes())
+                    handle.flush()
+        return len(ids)
+
+    @staticmethod
+    def _file_rows(path: Path, row_bytes: int) -> int:
+        return path.stat().st_size // row_bytes if path.exists() else 0
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Read-only (matrix, ids) views of every row appended so far."""
+        return self._refresh()
+
+    def last_id(self) -> int:
+        ids = self._refresh()[1]
+        return int(ids.max()) if len(ids) else 0
+
+    def search(self, query: Any, k: int = 10, exclude_ids: Sequence[int] = ()) -> List[Tuple[int, float]]:
+        """Return up to k (document_id, cosine similarity) pairs, most similar first."""
+        matrix, ids = self._refresh()
+        if not len(ids):
+            return []
+        q = normalize_rows(query)[0]
+        if q.shape[0] != self.dim:
+            raise DimensionMismatch(f"query has {q.shape[0]} dimensions, index has {self.dim}")
+        scores = matrix @ q
+        if exclude_ids:
+            scores[np.isin(ids, np.asarray(exclude_ids, dtype=np.int64))] = -np.inf
+        best = top_k(scores, k)
+        return [(int(ids[i]), float(scores[i])) for i in best if np.isfinite(scores[i])]
+
+    def sync_from_db(self, session: Any, batch: int = 1000) -> int:
+        """Append documents saved since the last indexed id; returns how many were added.
+
+        Documents recorded as embedded by another model than the index's are
+        skipped; older rows without a recorded model are taken as they are.
+        """
+        from app.db.models import Document
+
+        added = 0
+        last_id = self.last_id()
+        while True:
+            rows = (
+                session.query(Document.id, Document.embedding, Document.doc_metadata)
+                .filter(Document.id > last_id, Document.embedding.isnot(None))
+                .order_by(Document.id)
+                .limit(batch)
+                .all()
+            )
+            if not rows:
+                return added
+            models = [embedding_model(metadata) for _, _, metadata in rows]
+            model = self._current_model() or next((name for name in models if name), None)
+            dim = self.dim or len(rows[0][1])
+            usable = [
+                (doc_id, vector) for (doc_id, vector, _), name in zip(rows, models)
+                if len(vector) == dim and name in (None, model)
+            ]
+            if usable:
+                added += self.add(
+                    [doc_id for doc_id, _ in usable], np.stack([vector for _, vector in usable]),
+                    skip_existing=True, model=model,
+                )
+            last_id = rows[-1][0]
+
+    def stats(self) -> dict:
+        matrix, _ = self._refresh()
+        return {
+            "rows": matrix.shape[0], "dim": self.dim, "model": self.model,
+            "bytes": int(matrix.nbytes), "path": str(self.directory),
+        }
+
+
+def embedding_model(metadata: Any) -> Optional[str]:
+    """The embedding model recorded in a document's metadata, if any."""
+    return metadata.get("embedding_model") if isinstance(metadata, dict) else None
+
+
+similarity_index = SimilarityIndex(Path(os.getenv("SIMILARITY_INDEX_DIR") or DEFAULT_INDEX_DIR))
+
+
+def search_similar(
+    query: Any, k: int = 10, exclude_ids: Sequence[int] = (), model: Optional[str] = None,
+) -> Tuple[str, List[Tuple[int, float]]]:
+    """Top-k through the index SIMILARITY_SEARCH selects; returns (method, matches).
+
+    "auto" uses the IVF build if there is one, then a quantized build, then
+    exact search; "ivf" and "quantized" fall back to exact when not built.
+    Every build is derived from the exact index, so a query from another
+    embedding model than `similarity_index.model` is refused up front.
+    """
+    from app.utils.ann_index import current_ann_index
+    from app.utils.quantization import current_quantized_index
+
+    similarity_index.check_model(model)
+
+    if SIMILARITY_SEARCH in ("auto", "ivf"):
+        ann_index = current_ann_index(similarity_index)
+        if ann_index is not None:
+            return "ivf", ann_index.search(query, k, exclude_ids)
+    if SIMILARITY_SEARCH in ("auto", "quantized"):
+        quantized_index = current_quantized_index(similarity_index)
+        if quantized_index is not None:
+            return quantized_index.codec, quantized_index.search(query, k, exclude_ids)
+    return "exact", similarity_index.search(query, k, exclude_ids)
+
+
+def index_document(document_id: int, vector: Any, model: Optional[str] = None) -> None:
+    """Add a freshly saved document to the index (best effort)."""
+    try:
+        similarity_index.add([document_id], [vector], model=model)
+    except (OSError, ValueError) as exc:
+        print(f"WARNING: Could not add document {document_id} to the similarity index: {exc}")
+
+
+def sync_index_with_db() -> int:
+    """Catch the index up with the documents table (SQLite deployments)."""
+    from app.db import database
+
+    if not hasattr(database, "SessionLocal"):
+        return 0
+    session = database.SessionLocal()
+    try:
+        added = similarity_index.sync_from_db(session)
+    finally:
+        session.close()
+    if added:
+        print(f"INFO: Added {added} stored documents to the similarity index")
+    return added
@@ -0,0 +1,46 @@
+"""
+Single-flight coalescing for identical concurrent async calls.
+
+The first caller for a key starts the upstream call. Callers that arrive with
+the same key while it is still running await the same task, so the work runs
+only once.
+"""
+
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Deduplicates in-flight coroutines that share a key."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.executed = 0
+        self.collapsed = 0
+        self._inflight: Dict[str, "asyncio.Task[Any]"] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `fn()` once per key at a time; concurrent callers share its result."""
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is not None:
+            self.collapsed += 1
+            # Each follower gets its own copy so callers cannot mutate each other's result
+            return copy.deepcopy(await asyncio.shield(task))
+
+        self.executed += 1
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so a cancelled leader does not cancel the call its followers are waiting on
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executed": self.executed,
+            "collapsed": self.collapsed,
+            "in_flight": len(self._inflight),
+        }
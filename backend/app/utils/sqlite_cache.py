@@ -0,0 +1,247 @@
+"""
+Two-tier LRU/TTL store shared by the response and embedding caches.
+
+Tier 1 is a bounded in-process LRU; tier 2 is a SQLite file that survives
+restarts and is shared by every worker on the host. Entries expire after a
+TTL and the least recently used entries are evicted once a tier is full.
+Async callers use `aget`/`aset`, which run the SQLite work in a thread so a
+busy or locked database never stalls the event loop. Disk reads do not
+write: access times are buffered and flushed in batches.
+
+Subclasses name their table and columns and say how values are kept in
+memory and encoded on disk; everything else lives here.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Disk hits buffered before their last_access updates are written without waiting for a store
+MAX_PENDING_TOUCHES = 256
+
+
+class LRUCache:
+    """Thread-safe LRU mapping with per-entry expiry."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.time() - stored_at > self.ttl_seconds:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None) -> None:
+        with self._lock:
+            self._data[key] = (stored_at or time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteLRUCache:
+    """In-memory LRU in front of a persistent SQLite table.
+
+    Subclasses set `table`, `label`, `value_columns` (DDL for the columns
+    besides key and timestamps) and `value_column` (the one read back), and
+    implement `_to_memory`, `_from_memory`, `_encode` and `_decode`.
+    """
+
+    table = ""
+    label = ""
+    value_columns = ""
+    value_column = ""
+
+    def __init__(self, db_path: Path, memory_entries: int, disk_entries: int, ttl_seconds: float):
+        self.db_path = Path(db_path)
+        self.disk_entries = disk_entries
+        self.ttl_seconds = ttl_seconds
+        self.memory = LRUCache(memory_entries, ttl_seconds)
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "disk_evictions": 0}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._inherited: List[sqlite3.Connection] = []
+        self._touched: Dict[str, float] = {}
+        self._open()
+
+    # Value handling, per subclass
+
+    def _to_memory(self, value: Any) -> Any:
+        """The form a stored value is kept in, in the memory tier."""
+        raise NotImplementedError
+
+    def _from_memory(self, stored: Any) -> Any:
+        """What callers get back for a value held in memory."""
+        raise NotImplementedError
+
+    def _encode(self, stored: Any, *extra: Any) -> Dict[str, Any]:
+        """Column values for a row, keyed by column name."""
+        raise NotImplementedError
+
+    def _decode(self, raw: Any) -> Any:
+        """The memory form of `value_column` read from disk."""
+        raise NotImplementedError
+
+    # Storage
+
+    def _open(self) -> None:
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), timeout=5, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                f"key TEXT PRIMARY KEY, {self.value_columns}, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table}_access ON {self.table}(last_access)")
+            self._conn.commit()
+        except sqlite3.Error as exc:
+            self._conn = None
+            print(f"WARNING: {self.label} disk tier disabled: {exc}")
+
+    def reopen_after_fork(self) -> None:
+        """Give a forked worker (e.g. gunicorn --preload) its own SQLite connection.
+
+        The inherited connection belongs to the parent; it is kept referenced,
+        never used or closed, so the parent's handle is left untouched.
+        """
+        self._lock = threading.Lock()
+        self._touched = {}
+        if self._conn is not None:
+            self._inherited.append(self._conn)
+            self._open()
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._memory_get(key)
+        if value is None:
+            value = self._disk_lookup(key)
+        return value
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """`get` for the event loop: memory hits inline, the disk lookup in a thread."""
+        value = self._memory_get(key)
+        if value is None:
+            value = await asyncio.to_thread(self._disk_lookup, key)
+        return value
+
+    def set(self, key: str, value: Any, *extra: Any) -> None:
+        self._disk_set(key, self._memory_set(key, value), *extra)
+
+    async def aset(self, key: str, value: Any, *extra: Any) -> None:
+        """`set` for the event loop: the disk write runs in a thread."""
+        await asyncio.to_thread(self._disk_set, key, self._memory_set(key, value), *extra)
+
+    def _memory_get(self, key: str) -> Optional[Any]:
+        stored = self.memory.get(key)
+        if stored is None:
+            return None
+        self.counters["memory_hits"] += 1
+        return self._from_memory(stored)
+
+    def _memory_set(self, key: str, value: Any) -> Any:
+        stored = self._to_memory(value)
+        self.counters["stores"] += 1
+        self.memory.set(key, stored)
+        return stored
+
+    def _disk_lookup(self, key: str) -> Optional[Any]:
+        stored = self._disk_get(key)
+        if stored is not None:
+            self.counters["disk_hits"] += 1
+            return self._from_memory(stored)
+        self.counters["misses"] += 1
+        return None
+
+    def _disk_get(self, key: str) -> Optional[Any]:
+        if self._conn is None:
+            return None
+        now = time.time()
+        try:
+            with self._lock:
+                # Read-only: expired rows are skipped here and deleted by the next store
+                row = self._conn.execute(
+                    f"SELECT {self.value_column}, created_at FROM {self.table} WHERE key = ? AND created_at >= ?",
+                    (key, now - self.ttl_seconds),
+                ).fetchone()
+                if row is None:
+                    return None
+                self._touched[key] = now
+                if len(self._touched) >= MAX_PENDING_TOUCHES:
+                    self._commit_touches()
+            stored = self._decode(row[0])
+        except (sqlite3.Error, ValueError) as exc:
+            print(f"WARNING: {self.label} read failed: {exc}")
+            return None
+        self.memory.set(key, stored, stored_at=row[1])
+        return stored
+
+    def _flush_touches(self) -> None:
+        """Write buffered last_access times (caller holds the lock and commits)."""
+        if self._touched:
+            touched, self._touched = self._touched, {}
+            self._conn.executemany(
+                f"UPDATE {self.table} SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in touched.items()],
+            )
+
+    def _commit_touches(self) -> None:
+        """Flush buffered access times on their own (caller holds the lock); a failure only loses recency."""
+        try:
+            self._flush_touches()
+            self._conn.commit()
+        except sqlite3.Error as exc:
+            self._conn.rollback()
+            print(f"WARNING: {self.label} access-time update failed: {exc}")
+
+    def _disk_set(self, key: str, stored: Any, *extra: Any) -> None:
+        if self._conn is None:
+            return
+        now = time.time()
+        try:
+            row = {"key": key, **self._encode(stored, *extra), "created_at": now, "last_access": now}
+            with self._lock:
+                # Recent hits must count before choosing what to evict
+                self._flush_touches()
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+                    tuple(row.values()),
+                )
+                self._conn.execute(f"DELETE FROM {self.table} WHERE created_at < ?", (now - self.ttl_seconds,))
+                evicted = self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN ("
+                    f"SELECT key FROM {self.table} ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                    (self.disk_entries,),
+                ).rowcount
+                self._conn.commit()
+            self.counters["disk_evictions"] += max(evicted, 0)
+        except (sqlite3.Error, TypeError, ValueError) as exc:
+            print(f"WARNING: {self.label} write failed: {exc}")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.counters["memory_hits"] + self.counters["disk_hits"] + self.counters["misses"]
+        hits = self.counters["memory_hits"] + self.counters["disk_hits"]
+        return {
+            **self.counters,
+            "memory_entries": len(self.memory),
+            "memory_evictions": self.memory.evictions,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
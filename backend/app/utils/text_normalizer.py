@@ -0,0 +1,92 @@
+"""
+Clean extracted document text before it is sent to the LLM.
+
+PDF extraction keeps running headers, footers, page numbers, words hyphenated
+across line breaks and long whitespace runs. None of it helps the analysis
+but all of it is billed as input tokens. Pages are expected to be separated
+by form feeds (see `file_handler.extract_text_from_file`).
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List, NamedTuple
+
+from app.utils.rate_limiter import estimate_tokens
+
+PAGE_BREAK = "\f"
+
+# Lines checked at the top and bottom of each page for running headers/footers
+_EDGE_LINES = 3
+# Running headers/footers are short; longer lines are treated as body text
+_MAX_EDGE_LINE_CHARS = 80
+_PAGE_NUMBER = re.compile(r"^\s*(?:page\s*)?[-–—]?\s*\d{1,4}\s*[-–—]?(?:\s*(?:of|/)\s*\d{1,4})?\s*$", re.IGNORECASE)
+_DIGITS = re.compile(r"\d+")
+_HYPHEN_BREAK = re.compile(r"(\w)-[ \t]*\n[ \t]*([a-z])")
+_INLINE_SPACE = re.compile(r"[ \t\u00a0]+")
+_BLANK_LINES = re.compile(r"\n[ \t]*\n(?:[ \t]*\n)+")
+
+
+class NormalizedText(NamedTuple):
+    text: str
+    original_tokens: int
+    normalized_tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.normalized_tokens
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "original_tokens": self.original_tokens,
+            "normalized_tokens": self.normalized_tokens,
+            "tokens_saved": self.tokens_saved,
+        }
+
+
+def _line_signature(line: str) -> str:
+    """Compare header/footer candidates with page numbers masked out."""
+    return _DIGITS.sub("#", " ".join(line.split()).lower())
+
+
+def _repeated_edge_lines(pages: List[List[str]]) -> set:
+    """Signatures of lines that recur at the top or bottom of most pages."""
+    if len(pages) < 3:
+        return set()
+    counts: Counter = Counter()
+    for lines in pages:
+        content = [line for line in lines if line.strip()]
+        edges = content[:_EDGE_LINES] + content[-_EDGE_LINES:]
+        counts.update({_line_signature(line) for line in edges if len(line.strip()) <= _MAX_EDGE_LINE_CHARS})
+    threshold = max(3, len(pages) // 2)
+    return {signature for signature, count in counts.items() if count >= threshold and signature}
+
+
+def _strip_page_edges(lines: List[str], repeated: set) -> List[str]:
+    """Drop page numbers and running headers/footers from the edges of one page."""
+    content_rows = [i for i, line in enumerate(lines) if line.strip()]
+    edge_rows = set(content_rows[:_EDGE_LINES] + content_rows[-_EDGE_LINES:])
+    return [
+        line for i, line in enumerate(lines)
+        if not (i in edge_rows and (_PAGE_NUMBER.match(line) or _line_signature(line) in repeated))
+    ]
+
+
+def normalize_document_text(text: str) -> NormalizedText:
+    """Strip boilerplate, de-hyphenate and collapse whitespace."""
+    original_tokens = estimate_tokens(text) if text else 0
+    pages = [page.splitlines() for page in text.split(PAGE_BREAK)]
+    repeated = _repeated_edge_lines(pages)
+
+    kept_pages = []
+    for lines in pages:
+        if len(pages) > 1:
+            lines = _strip_page_edges(lines, repeated)
+        kept_pages.append("\n".join(lines))
+
+    cleaned = "\n\n".join(page for page in kept_pages if page.strip())
+    cleaned = _HYPHEN_BREAK.sub(r"\1\2", cleaned)
+    cleaned = _INLINE_SPACE.sub(" ", cleaned)
+    cleaned = "\n".join(line.strip() for line in cleaned.split("\n"))
+    cleaned = _BLANK_LINES.sub("\n\n", cleaned).strip()
+
+    return NormalizedText(cleaned, original_tokens, estimate_tokens(cleaned) if cleaned else 0)
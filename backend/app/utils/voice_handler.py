@@ -1,11 +1,11 @@
 from fastapi import UploadFile
 import tempfile
 
-try:
-    import speech_recognition as sr
-    SPEECH_RECOGNITION_AVAILABLE = True
-except ImportError:
-    SPEECH_RECOGNITION_AVAILABLE = False
+from app.utils.lazy_import import is_installed, lazy_module
+
+# speech_recognition is only imported when a voice upload arrives
+SPEECH_RECOGNITION_AVAILABLE = is_installed("speech_recognition")
+if not SPEECH_RECOGNITION_AVAILABLE:
     print("⚠️ Speech recognition not available. Using demo mode.")
 
 async def convert_voice_to_text(voice_file: UploadFile) -> str:
@@ -20,6 +20,7 @@ async def convert_voice_to_text(voice_file: UploadFile) -> str:
             tmp_path = tmp.name
 
         # Recognize speech
+        sr = lazy_module("speech_recognition")
         r = sr.Recognizer()
         with sr.AudioFile(tmp_path) as source:
             audio = r.record(source)
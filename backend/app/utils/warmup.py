@@ -0,0 +1,80 @@
+"""
+Background warm-up of the dependencies that are imported lazily.
+
+Importing the app no longer loads model.pkl, google-generativeai or the
+document/speech libraries. With WARMUP_ON_STARTUP=1 (the default) each worker
+loads them in a daemon thread straight after startup, so it can answer /health
+and fallback traffic immediately and the first real requests usually find
+everything ready. Each step is idempotent; whatever the warm-up has not reached
+yet is still loaded on first use.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from app.utils import embedding_utils, model_loader
+from app.utils.lazy_import import is_installed, lazy_module
+
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "1") == "1"
+
+warmup_state: Dict[str, Any] = {"enabled": WARMUP_ON_STARTUP, "started": False, "done": False, "seconds": {}}
+
+
+def _import_if_installed(*names: str) -> Callable[[], None]:
+    def _import() -> None:
+        for name in names:
+            if is_installed(name):
+                lazy_module(name)
+    return _import
+
+
+def _sync_similarity_index() -> None:
+    # Imported here: the index pulls in numpy
+    from app.utils.similarity_search import sync_index_with_db
+
+    sync_index_with_db()
+
+
+STEPS: Tuple[Tuple[str, Callable[[], Any]], ...] = (
+    ("local_model", model_loader.load_local_model),
+    ("gemini", model_loader.init_gemini),
+    ("embeddings", embedding_utils.init_embedding_client),
+    ("local_embeddings", embedding_utils.init_local_embedder),
+    ("documents", _import_if_installed("docx", "PyPDF2")),
+    ("speech", _import_if_installed("speech_recognition")),
+    ("similarity_index", _sync_similarity_index),
+)
+
+
+def warm_up(steps: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """Run the named warm-up steps (all by default) and record how long each took."""
+    wanted = set(steps) if steps is not None else None
+    for name, step in STEPS:
+        if wanted is not None and name not in wanted:
+            continue
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as exc:
+            print(f"WARNING: Warm-up step '{name}' failed: {exc}")
+        # Keep the first (real) timing; repeats after a fork are no-ops
+        warmup_state["seconds"].setdefault(name, round(time.perf_counter() - started, 3))
+    return warmup_state["seconds"]
+
+
+def _run() -> None:
+    started = time.perf_counter()
+    warm_up()
+    warmup_state["done"] = True
+    print(f"INFO: Warm-up finished in {time.perf_counter() - started:.2f}s (pid {os.getpid()})")
+
+
+def start_background_warm_up() -> bool:
+    """Start the warm-up thread once per process if WARMUP_ON_STARTUP is set."""
+    if not WARMUP_ON_STARTUP or warmup_state["started"]:
+        return False
+    warmup_state["started"] = True
+    threading.Thread(target=_run, name="warm-up", daemon=True).start()
+    return True
@@ -0,0 +1,38 @@
+"""
+Gunicorn settings for running the backend with several uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+With preload_app the app is imported once in the master, which also loads the
+joblib model (see MODEL_MMAP_MODE) before forking, so the workers share the
+loaded pages copy-on-write instead of each loading a private copy.
+"""
+
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+
+def when_ready(server):
+    """Load the shared model, then move everything out of the GC's reach before forking.
+
+    Otherwise the first collection in each worker writes to every object
+    header and un-shares most of the preloaded pages. The Gemini clients are
+    left to each worker's warm-up: gRPC channels must not cross a fork. The
+    similarity-index sync reads the documents table, so the pooled database
+    connection it opened is closed before forking.
+    """
+    if preload_app:
+        import gc
+
+        from app.db import database
+        from app.utils.warmup import warm_up
+
+        warm_up(("local_model", "local_embeddings", "documents", "speech", "similarity_index"))
+        if hasattr(database, "engine"):
+            database.engine.dispose()
+        gc.freeze()
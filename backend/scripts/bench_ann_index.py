@@ -0,0 +1,106 @@
+"""
+IVF index vs. exact search: recall@10, QPS and memory per nprobe.
+
+Builds an exact similarity index of clustered synthetic vectors (embeddings
+of real documents cluster by topic; uniform random vectors would not), then
+an IVF build from it, and runs held-out queries at increasing nprobe.
+Reports, against exact search:
+- recall@10: share of the exact top 10 the IVF search also returns
+- QPS for one thread, queries run one at a time as /api/similar does
+- MB of vectors scanned per query (the pages a query touches) and the size
+  of the build on disk (mmapped, so shared by all workers)
+
+It then appends 1% more vectors (the unclustered tail), checks they are
+found, and times an --update build that files them into the clusters.
+
+Usage: python scripts/bench_ann_index.py [rows] [dim] [queries]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from app.utils.ann_index import IVFIndex, build_ivf, update_ivf  # noqa: E402
+from app.utils.similarity_search import SimilarityIndex, top_k  # noqa: E402
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+DIM = int(sys.argv[2]) if len(sys.argv) > 2 else 768
+QUERIES = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+TOPICS = max(10, ROWS // 200)
+K = 10
+
+
+def clustered(rng, centres, count):
+    # Each vector leans towards one topic and partly towards a second, plus noise
+    first, second = rng.integers(len(centres), size=(2, count))
+    weight = rng.uniform(0.0, 0.5, size=(count, 1)).astype(np.float32)
+    noise = rng.standard_normal((count, DIM), dtype=np.float32)
+    return (1 - weight) * centres[first] + weight * centres[second] + 2 * noise
+
+
+def timed(search, queries):
+    started = time.perf_counter()
+    results = [[doc_id for doc_id, _ in search(query)] for query in queries]
+    return results, len(queries) / (time.perf_counter() - started)
+
+
+def recall(approx, exact):
+    return np.mean([len(set(a) & set(e)) / len(e) for a, e in zip(approx, exact)])
+
+
+def scanned_mb(index: IVFIndex, queries, nprobe: int) -> float:
+    sizes = np.diff(index.offsets)
+    rows = [sizes[top_k(index.centroids @ query, nprobe)].sum() for query in queries]
+    return float(np.mean(rows)) * DIM * 4 / 2**20
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    centres = rng.standard_normal((TOPICS, DIM), dtype=np.float32)
+    with tempfile.TemporaryDirectory() as directory:
+        flat = SimilarityIndex(Path(directory) / "flat")
+        for start in range(0, ROWS, 10_000):
+            count = min(10_000, ROWS - start)
+            flat.add(np.arange(start + 1, start + count + 1), clustered(rng, centres, count))
+        queries = clustered(rng, centres, QUERIES)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+        started = time.perf_counter()
+        build_ivf(flat, Path(directory) / "ann")
+        build_seconds = time.perf_counter() - started
+        index = IVFIndex.load(Path(directory) / "ann", flat)
+        build_mb = index.stats()["bytes"] / 2**20
+
+        exact, exact_qps = timed(lambda query: flat.search(query, K), queries)
+        print(f"{ROWS} vectors x {DIM} dims, {TOPICS} topics, {QUERIES} queries; "
+              f"nlist {index.nlist}, build {build_seconds:.1f}s, {build_mb:.0f} MB on disk")
+        print(f"{'search':<12} {'recall@10':>9} {'QPS':>8} {'MB/query':>9}")
+        print(f"{'exact':<12} {1.0:9.3f} {exact_qps:8.0f} {ROWS * DIM * 4 / 2**20:9.1f}")
+        for nprobe in (1, 2, 4, 8, 16, 32, 64):
+            if nprobe > index.nlist:
+                break
+            approx, qps = timed(lambda query: index.search(query, K, nprobe=nprobe), queries)
+            print(f"{'nprobe ' + str(nprobe):<12} {recall(approx, exact):9.3f} {qps:8.0f} "
+                  f"{scanned_mb(index, queries, nprobe):9.1f}")
+
+        extra = ROWS // 100
+        new_vectors = clustered(rng, centres, extra)
+        flat.add(np.arange(ROWS + 1, ROWS + extra + 1), new_vectors)
+        found = np.mean([index.search(vector, 1, nprobe=1)[0][0] == ROWS + 1 + i
+                         for i, vector in enumerate(new_vectors[:100])])
+        started = time.perf_counter()
+        update_ivf(flat, Path(directory) / "ann")
+        update_seconds = time.perf_counter() - started
+        updated = IVFIndex.load(Path(directory) / "ann", flat)
+        print(f"tail of {extra}: {found:.0%} found as their own nearest neighbour before the update; "
+              f"--update took {update_seconds:.1f}s, tail now {updated.stats()['tail']}")
+
+
+if __name__ == "__main__":
+    main()
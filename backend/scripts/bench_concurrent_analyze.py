@@ -0,0 +1,102 @@
+"""
+Concurrency benchmark for /api/analyze/.
+
+Gemini is replaced by a stub with a fixed latency so the numbers only reflect
+how the backend schedules upstream calls. With the async execution path,
+N concurrent requests should finish in roughly one call's latency; the
+blocking path is shown for comparison.
+
+Usage: python scripts/bench_concurrent_analyze.py [concurrency] [latency_seconds]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Keep the benchmark offline and away from the tracked demo databases
+os.environ["GEMINI_API_KEY"] = ""
+os.environ["AI_API_KEY"] = ""
+os.environ.setdefault("GEMINI_RPM", "100000")
+os.environ.setdefault("GEMINI_INITIAL_CONCURRENCY", "256")
+os.environ.setdefault("GEMINI_MAX_CONCURRENCY", "256")
+os.environ["RESPONSE_CACHE_ENABLED"] = "0"
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(tempfile.gettempdir()) / 'lawgic_bench.db'}"
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+import httpx  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.db.database import init_db  # noqa: E402
+from app.utils import model_loader  # noqa: E402
+
+CONCURRENCY = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+LATENCY = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+
+FAKE_PAYLOAD = json.dumps({
+    "category": "Contract Law",
+    "document_summary": "Benchmark stub response",
+    "key_findings": [],
+    "risk_assessment": {"level": "Low", "factors": []},
+    "recommendations": [],
+    "compliance_issues": [],
+    "next_steps": [],
+    "disclaimer": "stub",
+})
+
+
+class _FakeResponse:
+    text = FAKE_PAYLOAD
+
+
+class _FakeModel:
+    def generate_content(self, *args, **kwargs):
+        time.sleep(LATENCY)
+        return _FakeResponse()
+
+    async def generate_content_async(self, *args, **kwargs):
+        await asyncio.sleep(LATENCY)
+        return _FakeResponse()
+
+
+model_loader.GEMINI_MODEL = object()
+model_loader._build_gemini_request = lambda task, language, tier: (_FakeModel(), None)
+
+
+async def _run(label: str) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[
+            client.post("/api/analyze/", data={"text": f"Contract agreement number {i}"})
+            for i in range(CONCURRENCY)
+        ])
+        elapsed = time.perf_counter() - start
+    statuses = {r.status_code for r in responses}
+    print(f"{label:<10} {CONCURRENCY} requests in {elapsed:.2f}s "
+          f"({elapsed / LATENCY:.1f}x single-call latency), statuses={sorted(statuses)}")
+
+
+async def _run_blocking() -> None:
+    """Reproduce the old behaviour: the sync call made from inside the handler."""
+    start = time.perf_counter()
+
+    async def _call(i: int):
+        return model_loader.predict_analyze(f"Contract agreement number {i}")
+
+    await asyncio.gather(*[_call(i) for i in range(CONCURRENCY)])
+    elapsed = time.perf_counter() - start
+    print(f"{'blocking':<10} {CONCURRENCY} requests in {elapsed:.2f}s "
+          f"({elapsed / LATENCY:.1f}x single-call latency)")
+
+
+if __name__ == "__main__":
+    init_db()
+    print(f"Simulated Gemini latency: {LATENCY:.2f}s")
+    asyncio.run(_run("async"))
+    asyncio.run(_run_blocking())
@@ -0,0 +1,78 @@
+"""
+Upstream calls and latency of concurrent embedding requests, with and without
+micro-batching.
+
+The Gemini embedding API is stubbed with a fixed per-call latency plus a small
+per-text cost, roughly how batchEmbedContents behaves. N concurrent
+`get_embedding` calls on distinct texts (cache disabled) are timed.
+
+Usage: python scripts/bench_embedding_batching.py [requests] [batch_size] [wait_ms]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ["GEMINI_API_KEY"] = ""
+os.environ["AI_API_KEY"] = ""
+os.environ["EMBEDDING_CACHE_ENABLED"] = "0"
+os.environ["GEMINI_RPM"] = "100000"  # measure batching, not the rate limiter
+os.environ["GEMINI_MAX_CONCURRENCY"] = "4"
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from app.utils import embedding_utils  # noqa: E402
+from app.utils.micro_batcher import MicroBatcher  # noqa: E402
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+BATCH_SIZE = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+WAIT_MS = float(sys.argv[3]) if len(sys.argv) > 3 else 10.0
+
+CALL_LATENCY = 0.080
+PER_TEXT = 0.001
+
+
+class _FakeGenai:
+    calls = 0
+
+    @classmethod
+    def embed_content(cls, model, content):
+        cls.calls += 1
+        time.sleep(CALL_LATENCY + PER_TEXT * len(content))
+        return {"embedding": [[float(len(text))] * 768 for text in content]}
+
+
+embedding_utils.genai = _FakeGenai
+embedding_utils._genai_initialized = True
+
+
+async def _timed(text: str) -> float:
+    started = time.perf_counter()
+    vector = await embedding_utils.get_embedding(text)
+    assert vector[0] == float(len(text))
+    return time.perf_counter() - started
+
+
+async def run(label: str, batch_size: int, offset: int) -> None:
+    _FakeGenai.calls = 0
+    embedding_utils.embedding_batcher = MicroBatcher(
+        "embeddings", embedding_utils._embed_batch_with_gemini, max_batch_size=batch_size, max_wait_ms=WAIT_MS
+    )
+    texts = [f"Document {offset + i}: indemnity and termination clauses" for i in range(REQUESTS)]
+    started = time.perf_counter()
+    latencies = sorted(await asyncio.gather(*(_timed(text) for text in texts)))
+    elapsed = time.perf_counter() - started
+    print(f"{label:<10} {_FakeGenai.calls:5d} upstream calls   {elapsed * 1000:8.1f} ms total   "
+          f"p50 {latencies[len(latencies) // 2] * 1000:7.1f} ms   p99 {latencies[int(len(latencies) * 0.99)] * 1000:7.1f} ms")
+
+
+async def main() -> None:
+    await run("unbatched", batch_size=1, offset=0)
+    await run("batched", batch_size=BATCH_SIZE, offset=REQUESTS)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+Embedding cache: upstream calls, latency and storage size.
+
+The Gemini embedding API is stubbed with a fixed latency and 768-dim vectors.
+A workload where analyze and research both embed each document, and some
+documents come back later, is run cold, then again after a simulated restart
+(fresh cache over the same SQLite file, so only the disk tier is warm).
+
+Usage: python scripts/bench_embedding_cache.py [documents] [latency_ms]
+"""
+
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+cache_path = Path(tempfile.mkdtemp()) / "bench_embeddings.db"
+os.environ["GEMINI_API_KEY"] = ""
+os.environ["AI_API_KEY"] = ""
+os.environ["EMBEDDING_CACHE_PATH"] = str(cache_path)
+os.environ["GEMINI_RPM"] = "100000"  # measure the cache, not the rate limiter
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from app.utils import embedding_utils  # noqa: E402
+from app.utils.embedding_cache import EmbeddingCache  # noqa: E402
+
+DOCUMENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+LATENCY = (float(sys.argv[2]) if len(sys.argv) > 2 else 80.0) / 1000
+DIM = 768
+
+
+class _FakeGenai:
+    calls = 0
+
+    @classmethod
+    def embed_content(cls, model, content):
+        cls.calls += 1
+        time.sleep(LATENCY)
+        return {"embedding": [_vector(text) for text in content]}
+
+
+def _vector(text: str):
+    rng = random.Random(text)
+    return [rng.uniform(-1, 1) for _ in range(DIM)]
+
+
+embedding_utils.genai = _FakeGenai
+embedding_utils._genai_initialized = True
+
+
+def workload():
+    random.seed(0)
+    docs = [f"Document {i}: the tenant shall pay rent monthly; clause {i} covers termination." for i in range(DOCUMENTS)]
+    # analyze + research on every document, then a third of them revisited
+    return [doc for doc in docs for _ in range(2)] + random.sample(docs, DOCUMENTS // 3)
+
+
+async def run(label: str) -> None:
+    _FakeGenai.calls = 0
+    texts = workload()
+    started = time.perf_counter()
+    for text in texts:
+        await embedding_utils.get_embedding(text)
+    elapsed = time.perf_counter() - started
+    stats = embedding_utils.embedding_cache.stats()
+    print(f"{label:<16} {len(texts):5d} lookups  {_FakeGenai.calls:5d} upstream calls  "
+          f"{elapsed / len(texts) * 1000:7.2f} ms/lookup  hit_rate {stats['hit_rate']:.2f}")
+
+
+async def main() -> None:
+    await run("cold")
+    embedding_utils.embedding_cache = EmbeddingCache(db_path=cache_path)
+    await run("after restart")
+
+    with sqlite3.connect(cache_path) as conn:
+        blob_bytes = conn.execute("SELECT AVG(LENGTH(vector)) FROM embedding_cache").fetchone()[0]
+    vector = (await embedding_utils.get_embedding(workload()[0]))
+    print(f"bytes/vector: float32 blob {blob_bytes:.0f}   json text {len(json.dumps(vector))}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+"""
+Document embedding storage: JSON text column vs. packed float32/float16 blobs.
+
+Inserts N documents through the ORM into a fresh SQLite file per format,
+then reads every embedding back as a numpy array. Reports bytes per stored
+vector, insert and read throughput.
+
+Usage: python scripts/bench_embedding_storage.py [rows] [dim]
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import Column, Integer, Text, create_engine, func, select
+from sqlalchemy.orm import Session, declarative_base
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from app.db.types import VectorBlob  # noqa: E402
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+DIM = int(sys.argv[2]) if len(sys.argv) > 2 else 1536
+
+
+def make_model(column_type):
+    base = declarative_base()
+
+    class Doc(base):
+        __tablename__ = "documents"
+        id = Column(Integer, primary_key=True)
+        content = Column(Text)
+        embedding = Column(column_type)
+
+    return base, Doc
+
+
+def run(label: str, column_type, encode, decode) -> None:
+    base, Doc = make_model(column_type)
+    engine = create_engine(f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}")
+    base.metadata.create_all(engine)
+    vectors = np.random.default_rng(0).standard_normal((ROWS, DIM)).tolist()
+
+    started = time.perf_counter()
+    with Session(engine) as session:
+        session.add_all(Doc(content=f"doc {i}", embedding=encode(vector)) for i, vector in enumerate(vectors))
+        session.commit()
+    insert_seconds = time.perf_counter() - started
+
+    with Session(engine) as session:
+        size = session.execute(select(func.avg(func.length(Doc.embedding)))).scalar()
+        started = time.perf_counter()
+        matrix = np.stack([decode(value) for value in session.execute(select(Doc.embedding)).scalars()])
+        read_seconds = time.perf_counter() - started
+    assert matrix.shape == (ROWS, DIM)
+
+    print(f"{label:<10} {size:10.0f} B/row   insert {ROWS / insert_seconds:8.0f} rows/s   "
+          f"read {ROWS / read_seconds:9.0f} rows/s")
+
+
+def main() -> None:
+    print(f"{ROWS} rows x {DIM} dims")
+    run("json text", Text, json.dumps, lambda value: np.asarray(json.loads(value), dtype=np.float32))
+    run("float32", VectorBlob("float32"), lambda vector: vector, lambda value: value)
+    run("float16", VectorBlob("float16"), lambda vector: vector, lambda value: value)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Microbenchmark for per-request Gemini setup cost.
+
+Compares building a fresh GenerativeModel + GenerationConfig per request (the
+old `_predict_with_gemini` behaviour) with looking up a prebuilt handle from
+GeminiModelRegistry. No network calls are made: only handle construction is
+measured.
+
+Usage: python scripts/bench_gemini_model_setup.py [iterations]
+"""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+import google.generativeai as genai  # noqa: E402
+
+from app.utils.gemini_prompts import GeminiModelRegistry, get_system_instruction  # noqa: E402
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+MODEL_NAME = "models/gemini-2.5-flash"
+VARIANTS = [("analysis", "en"), ("analysis", "hi"), ("research", "en"), ("research", "hi")]
+
+
+def per_request_setup(task: str, language: str):
+    model = genai.GenerativeModel(
+        model_name=MODEL_NAME,
+        system_instruction=get_system_instruction(task, language),
+    )
+    config = genai.types.GenerationConfig(
+        temperature=0.1,
+        max_output_tokens=2048,
+        response_mime_type="application/json",
+    )
+    return model, config
+
+
+def measure(label: str, fn) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        task, language = VARIANTS[i % len(VARIANTS)]
+        fn(task, language)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    print(f"{label:<12} {elapsed / ITERATIONS * 1e6:9.2f} us/request  "
+          f"peak {peak / 1024:8.1f} KiB  live blocks {blocks}")
+
+
+if __name__ == "__main__":
+    genai.configure(api_key="benchmark-no-network")
+    registry = GeminiModelRegistry(genai, MODEL_NAME)
+    print(f"{ITERATIONS} setups per approach")
+    measure("per-request", per_request_setup)
+    measure("registry", registry.get)
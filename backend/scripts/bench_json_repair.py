@@ -0,0 +1,67 @@
+"""
+Decode-failure rate of the old fence-strip + json.loads path vs. the lenient parser.
+
+Runs both over a small corpus of the defects Gemini output actually shows
+(fences, chatty prefixes, trailing commas, truncation at max_output_tokens).
+
+Usage: python scripts/bench_json_repair.py [iterations]
+"""
+
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from app.utils.json_repair import decode_stats, parse_json_lenient  # noqa: E402
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+_FULL = json.dumps({
+    "category": "Contract Law",
+    "document_summary": "Lease with automatic renewal and arbitration.",
+    "key_findings": ["Automatic renewal", "Binding arbitration"],
+    "risk_assessment": {"level": "Medium", "factors": ["Renewal without notice"]},
+    "recommendations": ["Negotiate a notice period"],
+    "disclaimer": "Not legal advice.",
+})
+
+SAMPLES = [
+    _FULL,
+    f"```json\n{_FULL}\n```",
+    f"Here is the analysis:\n{_FULL}\nLet me know if you need more.",
+    _FULL.replace('"]', '",]').replace("}", ",}", 1),
+    _FULL[:len(_FULL) // 2],
+    _FULL[:-40],
+]
+
+
+def legacy_parse(content: str):
+    content = content.strip()
+    if content.startswith("```"):
+        content = re.sub(r"^```json?", "", content, flags=re.IGNORECASE).strip()
+        content = content.rstrip("`").strip()
+    return json.loads(content)
+
+
+def run(label: str, parse) -> None:
+    failures = 0
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        for sample in SAMPLES:
+            try:
+                parse(sample)
+            except ValueError:
+                failures += 1
+    elapsed = time.perf_counter() - start
+    total = ITERATIONS * len(SAMPLES)
+    print(f"{label:<10} failure rate {failures / total:6.1%}   {elapsed / total * 1e6:8.2f} us/parse")
+
+
+if __name__ == "__main__":
+    run("legacy", legacy_parse)
+    run("lenient", parse_json_lenient)
+    print(f"stats: {decode_stats()}")
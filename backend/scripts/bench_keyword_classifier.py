@@ -0,0 +1,79 @@
+"""
+Scaling of the compiled keyword classifier vs. the old substring scans.
+
+The legacy path lower-cases the input and runs `any(keyword in text_lower ...)`
+over each category in turn, as the four fallbacks used to; the classifier
+scores every category in one regex pass. Inputs contain no keywords until
+the very end, which is the worst case for the short-circuiting legacy scans.
+Time per MB should stay flat as the input grows. Each legacy scan is a C
+substring search, so on keyword-free filler the legacy path stays faster per
+MB; what the classifier adds is per-category scores and word-start matching
+for the same single, linear pass.
+
+Usage: python scripts/bench_keyword_classifier.py [max_megabytes]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from app.ml.ai_legal_model import QUERY_CATEGORIES  # noqa: E402
+from app.utils.keyword_classifier import KeywordClassifier  # noqa: E402
+from app.utils.model_loader import ANALYSIS_CATEGORIES, RESEARCH_TOPICS, SIMPLE_ANSWER_TOPICS  # noqa: E402
+
+MAX_MB = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+FILLER = ("the said whereas hereby notwithstanding shall deliver payment within days of "
+          "receipt section clause schedule annexure hereinafter referred witness").split()
+CLASSIFIERS = [ANALYSIS_CATEGORIES, RESEARCH_TOPICS, SIMPLE_ANSWER_TOPICS, QUERY_CATEGORIES]
+
+
+def make_text(megabytes: int) -> str:
+    random.seed(megabytes)
+    words = []
+    size = 0
+    while size < megabytes * 1024 * 1024:
+        word = random.choice(FILLER)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words) + " the tenant signed a lease"
+
+
+def legacy_scan(classifier: KeywordClassifier, text: str) -> None:
+    text_lower = text.lower()
+    for category, keywords in classifier._category_keywords.items():
+        if any(keyword in text_lower for keyword in keywords):
+            return
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    # Rebuild the per-category keyword lists the legacy scans iterated over
+    for classifier in CLASSIFIERS:
+        categories = {}
+        for keyword, owners in classifier._keyword_categories.items():
+            for owner in owners:
+                categories.setdefault(owner, []).append(keyword)
+        classifier._category_keywords = categories
+
+    print(f"{'size':>6} {'legacy ms':>10} {'ms/MB':>8} {'single-pass ms':>15} {'ms/MB':>8}")
+    megabytes = 1
+    while megabytes <= MAX_MB:
+        text = make_text(megabytes)
+        legacy = sum(timed(lambda c=c: legacy_scan(c, text)) for c in CLASSIFIERS)
+        compiled = sum(timed(lambda c=c: c.scores(text)) for c in CLASSIFIERS)
+        print(f"{megabytes:>4}MB {legacy * 1000:10.1f} {legacy * 1000 / megabytes:8.1f} "
+              f"{compiled * 1000:15.1f} {compiled * 1000 / megabytes:8.1f}")
+        megabytes *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Offline embedding fallback: old seeded-random vectors vs. hashed n-grams.
+
+Reports, for both:
+- whether two processes with different PYTHONHASHSEED agree on a vector
+- nearest-neighbour topic accuracy on small synthetic legal snippets
+  (random vectors score at chance)
+- throughput, one text at a time and as one batch
+
+Usage: python scripts/bench_local_embeddings.py [texts]
+"""
+
+import os
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from app.utils.local_embeddings import local_embedder  # noqa: E402
+
+TEXTS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+TOPICS = {
+    "tenancy": ["tenant", "landlord", "rent", "lease", "eviction", "security deposit", "premises"],
+    "employment": ["employee", "salary", "termination", "workplace", "notice period", "gratuity", "employer"],
+    "criminal": ["accused", "bail", "police", "FIR", "conviction", "sentence", "IPC"],
+    "consumer": ["product", "refund", "warranty", "defective", "seller", "consumer forum", "service"],
+}
+FILLER = "the a my under with about regarding please explain whether can I what should do is it legal".split()
+
+
+def _old_dummy(text: str) -> np.ndarray:
+    np.random.seed(hash(text) % (2**32))
+    return np.random.random(1536)
+
+
+def _new(text: str) -> np.ndarray:
+    return local_embedder.embed(text)
+
+
+def snippets(count: int):
+    rng = random.Random(0)
+    labelled = []
+    for i in range(count):
+        topic = rng.choice(sorted(TOPICS))
+        words = rng.sample(TOPICS[topic], 3) + rng.sample(FILLER, 6)
+        rng.shuffle(words)
+        labelled.append((topic, f"{' '.join(words)} ({i})"))
+    return labelled
+
+
+def nn_accuracy(matrix: np.ndarray, labels) -> float:
+    matrix = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+    scores = matrix @ matrix.T
+    np.fill_diagonal(scores, -np.inf)
+    nearest = scores.argmax(axis=1)
+    return sum(labels[i] == labels[j] for i, j in enumerate(nearest)) / len(labels)
+
+
+def cross_process_stable(fn_name: str) -> bool:
+    code = (
+        "import hashlib, sys; sys.path.insert(0, 'scripts'); import bench_local_embeddings as b; "
+        f"print(hashlib.sha1(b.{fn_name}('Tenant rights under the lease').tobytes()).hexdigest())"
+    )
+    digests = {
+        subprocess.run(
+            [sys.executable, "-c", code], cwd=backend_dir, capture_output=True, text=True,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+        ).stdout.strip()
+        for seed in ("1", "2")
+    }
+    return len(digests) == 1
+
+
+def main() -> None:
+    labelled = snippets(TEXTS)
+    labels = [topic for topic, _ in labelled]
+    texts = [text for _, text in labelled]
+
+    print(f"{'':<14} {'dim':>5} {'stable':>7} {'nn-acc':>7} {'single/s':>10} {'batch/s':>10}")
+    for name, fn in (("seeded random", _old_dummy), ("hashed ngrams", _new)):
+        started = time.perf_counter()
+        matrix = np.stack([fn(text) for text in texts])
+        single = len(texts) / (time.perf_counter() - started)
+        batch = "-"
+        if fn is _new:
+            started = time.perf_counter()
+            batched = local_embedder.embed_batch(texts)
+            batch = f"{len(texts) / (time.perf_counter() - started):10.0f}"
+            assert np.allclose(batched, matrix, atol=1e-6)
+        stable = cross_process_stable(fn.__name__)
+        print(f"{name:<14} {matrix.shape[1]:>5} {str(stable):>7} {nn_accuracy(matrix, labels):7.2f} "
+              f"{single:10.0f} {batch:>10}")
+
+
+if __name__ == "__main__":
+    main()
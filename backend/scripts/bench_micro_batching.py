@@ -0,0 +1,65 @@
+"""
+Throughput of the local model.pkl path with and without micro-batching.
+
+The model is a stub with sklearn-like cost: a fixed per-call overhead plus a
+small per-row cost, so one call on a batch is much cheaper than the same
+rows one call at a time. N concurrent requests go through `predict_async`.
+
+Usage: python scripts/bench_micro_batching.py [requests] [batch_size] [wait_ms]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ["GEMINI_API_KEY"] = ""
+os.environ["AI_API_KEY"] = ""
+os.environ["RESPONSE_CACHE_ENABLED"] = "0"
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from app.utils import model_loader  # noqa: E402
+from app.utils.micro_batcher import MicroBatcher  # noqa: E402
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+BATCH_SIZE = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+WAIT_MS = float(sys.argv[3]) if len(sys.argv) > 3 else 5.0
+
+CALL_OVERHEAD = 0.010
+PER_ROW = 0.0002
+
+
+class _FakeVectorizedModel:
+    def predict(self, texts):
+        time.sleep(CALL_OVERHEAD + PER_ROW * len(texts))
+        return [{"category": "Contract Law", "length": len(text)} for text in texts]
+
+
+model_loader.load_local_model()
+model_loader.model = _FakeVectorizedModel()
+
+
+async def run(label: str, batch_size: int) -> None:
+    model_loader.local_batcher = MicroBatcher(
+        "local_model", model_loader._local_model_predict_batch, max_batch_size=batch_size, max_wait_ms=WAIT_MS
+    )
+    texts = [f"Request {i}: is this lease clause enforceable?" for i in range(REQUESTS)]
+    start = time.perf_counter()
+    results = await asyncio.gather(*(model_loader.predict_async(text) for text in texts))
+    elapsed = time.perf_counter() - start
+    assert all(result["length"] == len(text) for result, text in zip(results, texts))
+    stats = model_loader.local_batcher.stats()
+    print(f"{label:<10} {REQUESTS / elapsed:10.1f} req/s   {elapsed * 1000:8.1f} ms total   "
+          f"batches={stats['batches']} mean_batch={stats['mean_batch_size']}")
+
+
+async def main() -> None:
+    await run("unbatched", batch_size=1)
+    await run("batched", batch_size=BATCH_SIZE)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+"""
+Hot reload of model.pkl under load.
+
+Concurrent `predict_async` calls run against a stand-in model while the file
+is replaced and reloaded several times (plus once with a broken file). Every
+request must be answered by the local model - none dropped to the fallback -
+and each response carries the version that served it.
+
+Usage: python scripts/bench_model_reload.py [seconds] [concurrency] [model_mb]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+os.environ["GEMINI_API_KEY"] = ""
+os.environ["AI_API_KEY"] = ""
+os.environ["RESPONSE_CACHE_ENABLED"] = "0"
+
+import joblib  # noqa: E402
+import numpy as np  # noqa: E402
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from app.utils import model_loader  # noqa: E402
+
+SECONDS = float(sys.argv[1]) if len(sys.argv) > 1 else 6.0
+CONCURRENCY = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+MODEL_MB = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+
+
+class _TaggedModel:
+    def __init__(self, tag: str, megabytes: int):
+        self.tag = tag
+        self.weights = np.random.default_rng(0).standard_normal(megabytes * 1024 * 1024 // 8)
+
+    def predict(self, texts):
+        time.sleep(0.002)
+        return [{"category": "Contract Law", "tag": self.tag} for _ in texts]
+
+
+def _publish(path: Path, payload) -> None:
+    """Write next to the target and rename over it, as a deploy should."""
+    staging = path.with_suffix(".tmp")
+    if isinstance(payload, bytes):
+        staging.write_bytes(payload)
+    else:
+        joblib.dump(payload, staging)
+    os.replace(staging, path)
+
+
+async def _client(stop: float, latencies, sources) -> None:
+    while time.perf_counter() < stop:
+        started = time.perf_counter()
+        result = await model_loader.predict_async("Is the automatic renewal clause enforceable?")
+        latencies.append(time.perf_counter() - started)
+        sources[result.get("model_version") or result.get("source", "unknown")] += 1
+
+
+async def _reloader(path: Path, stop: float, outcomes) -> None:
+    generation = 1
+    while time.perf_counter() < stop - 1.0:
+        await asyncio.sleep(0.8)
+        generation += 1
+        broken = generation == 4
+        _publish(path, b"not a pickle" if broken else _TaggedModel(f"v{generation}", MODEL_MB))
+        try:
+            result = await asyncio.to_thread(model_loader.reload_local_model)
+            outcomes.append(f"{result['previous_version']} -> {result['version']} in {result['load_seconds']:.2f}s")
+        except Exception as exc:
+            outcomes.append(f"rejected broken file ({type(exc).__name__}), still serving {model_loader.model_version}")
+
+
+async def main() -> None:
+    path = Path(tempfile.mkdtemp()) / "model.pkl"
+    model_loader.MODEL_PATH = path
+    _publish(path, _TaggedModel("v1", MODEL_MB))
+    model_loader.load_local_model()
+
+    latencies, sources, outcomes = [], Counter(), []
+    stop = time.perf_counter() + SECONDS
+    await asyncio.gather(_reloader(path, stop, outcomes), *(_client(stop, latencies, sources) for _ in range(CONCURRENCY)))
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    for line in outcomes:
+        print(f"reload: {line}")
+    print(f"{len(latencies)} requests   p50 {p50:.1f} ms   p99 {p99:.1f} ms   max {latencies[-1] * 1000:.1f} ms")
+    print(f"served by: {dict(sources)}")
+    print(f"reloads: {model_loader.reload_counters}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""
+Mean latency of a mixed workload with and without complexity routing.
+
+Each Gemini tier is stubbed with its own fixed latency. The workload mixes
+one-line questions, short clauses, full contracts and research topics, so the
+numbers show how much traffic the router moves to the light tier and what
+that does to the mean.
+
+Usage: python scripts/bench_model_routing.py [light_latency] [heavy_latency]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ["GEMINI_API_KEY"] = ""
+os.environ["AI_API_KEY"] = ""
+os.environ.setdefault("GEMINI_RPM", "100000")
+os.environ.setdefault("GEMINI_INITIAL_CONCURRENCY", "256")
+os.environ.setdefault("GEMINI_MAX_CONCURRENCY", "256")
+os.environ["RESPONSE_CACHE_ENABLED"] = "0"
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from app.utils import model_loader  # noqa: E402
+from app.utils.model_router import ComplexityRouter  # noqa: E402
+
+LATENCY = {
+    "light": float(sys.argv[1]) if len(sys.argv) > 1 else 0.3,
+    "heavy": float(sys.argv[2]) if len(sys.argv) > 2 else 1.0,
+}
+
+CONTRACT = (
+    "This lease agreement is made between the landlord and the tenant. The tenant shall pay rent "
+    "monthly. Either party may terminate the agreement with notice. The landlord may initiate "
+    "eviction proceedings in court for breach of any obligation under these terms and conditions. "
+) * 30
+
+WORKLOAD = [
+    ("analysis", "Can my landlord keep the deposit?"),
+    ("analysis", "What is a non-compete clause?"),
+    ("analysis", "Is a verbal promise binding?"),
+    ("analysis", "The employee shall not disclose confidential information."),
+    ("analysis", "Contract breach by party: termination of lease, eviction of tenant, court judge sentence."),
+    ("analysis", CONTRACT),
+    ("research", "Tenant eviction protections"),
+    ("research", "Wrongful termination of employment"),
+]
+
+
+class _FakeResponse:
+    text = json.dumps({"category": "Contract Law", "key_findings": ["stub"]})
+
+
+class _FakeModel:
+    def __init__(self, tier: str):
+        self.tier = tier
+
+    async def generate_content_async(self, *args, **kwargs):
+        await asyncio.sleep(LATENCY[self.tier])
+        return _FakeResponse()
+
+
+model_loader.GEMINI_MODEL = object()
+model_loader._build_gemini_request = lambda task, language, tier: (_FakeModel(tier), None)
+
+
+async def run(label: str, enabled: bool) -> None:
+    router = ComplexityRouter(model_loader.LEGAL_KEYWORDS, enabled=enabled)
+    model_loader.model_router = router
+    latencies = []
+    for task, text in WORKLOAD:
+        start = time.perf_counter()
+        await model_loader._predict_with_gemini_async(text, task=task, use_cache=False)
+        latencies.append(time.perf_counter() - start)
+    mean_ms = sum(latencies) / len(latencies) * 1000
+    print(f"{label:<16} mean {mean_ms:8.1f} ms   tiers: {router.stats()['tiers']}")
+
+
+async def main() -> None:
+    await run("single model", enabled=False)
+    await run("routed", enabled=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
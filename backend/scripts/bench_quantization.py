@@ -0,0 +1,87 @@
+"""
+Quantized vs. float32 similarity search: memory, speed and recall side by side.
+
+Builds an exact similarity index of clustered synthetic vectors, then int8
+and product-quantized (PQ) builds from it, and runs held-out queries.
+Reports, for each:
+- bytes per vector and MB per million vectors (the scanned codes; the exact
+  vectors stay on disk and only reranked rows are read)
+- QPS for one thread, one query at a time as /api/similar runs them
+- recall@10 against exact search, from the codes alone (rerank 0) and with
+  the top k * rerank candidates re-scored exactly
+
+Usage: python scripts/bench_quantization.py [rows] [dim] [queries]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from app.utils.quantization import QuantizedIndex, build_quantized  # noqa: E402
+from app.utils.similarity_search import SimilarityIndex  # noqa: E402
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+DIM = int(sys.argv[2]) if len(sys.argv) > 2 else 768
+QUERIES = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+TOPICS = max(10, ROWS // 200)
+K = 10
+
+
+def clustered(rng, centres, count):
+    # Same mix as bench_ann_index.py: one main topic, part of a second, plus noise
+    first, second = rng.integers(len(centres), size=(2, count))
+    weight = rng.uniform(0.0, 0.5, size=(count, 1)).astype(np.float32)
+    noise = rng.standard_normal((count, DIM), dtype=np.float32)
+    return (1 - weight) * centres[first] + weight * centres[second] + 2 * noise
+
+
+def timed(search, queries):
+    started = time.perf_counter()
+    results = [[doc_id for doc_id, _ in search(query)] for query in queries]
+    return results, len(queries) / (time.perf_counter() - started)
+
+
+def recall(approx, exact):
+    return np.mean([len(set(a) & set(e)) / len(e) for a, e in zip(approx, exact)])
+
+
+def report(label, bytes_per_vector, qps, hit_rate):
+    print(f"{label:<22} {bytes_per_vector:>8} {bytes_per_vector * 1e6 / 2**20:>10.0f} {qps:>8.0f} {hit_rate:>9.3f}")
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    centres = rng.standard_normal((TOPICS, DIM), dtype=np.float32)
+    with tempfile.TemporaryDirectory() as directory:
+        flat = SimilarityIndex(Path(directory) / "flat")
+        for start in range(0, ROWS, 10_000):
+            count = min(10_000, ROWS - start)
+            flat.add(np.arange(start + 1, start + count + 1), clustered(rng, centres, count))
+        queries = clustered(rng, centres, QUERIES)
+
+        exact, exact_qps = timed(lambda query: flat.search(query, K), queries)
+        print(f"{ROWS} vectors x {DIM} dims, {QUERIES} queries, k={K}")
+        print(f"{'search':<22} {'B/vector':>8} {'MB per 1M':>10} {'QPS':>8} {'recall@10':>9}")
+        report("float32 exact", DIM * 4, exact_qps, 1.0)
+
+        for codec, m in (("int8", None), ("pq", DIM // 8), ("pq", DIM // 16)):
+            root = Path(directory) / f"{codec}-{m}"
+            started = time.perf_counter()
+            build_quantized(flat, codec, root, m)
+            build_seconds = time.perf_counter() - started
+            index = QuantizedIndex.load(root, flat)
+            name = codec if m is None else f"pq m={m}"
+            for rerank in (0, 10):
+                approx, qps = timed(lambda query: index.search(query, K, rerank=rerank), queries)
+                report(f"{name} rerank {rerank}", index.codes.shape[1], qps, recall(approx, exact))
+            print(f"{'':<22} (build {build_seconds:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Latency of Gemini response cache misses vs. memory and disk hits.
+
+Gemini is stubbed with a fixed latency; a "restart" is simulated by building
+a fresh ResponseCache over the same SQLite file so only the disk tier is warm.
+
+Usage: python scripts/bench_response_cache.py [latency_seconds]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+cache_path = Path(tempfile.mkdtemp()) / "bench_responses.db"
+os.environ["GEMINI_API_KEY"] = ""
+os.environ["AI_API_KEY"] = ""
+os.environ["RESPONSE_CACHE_PATH"] = str(cache_path)
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from app.utils import model_loader  # noqa: E402
+from app.utils.response_cache import ResponseCache  # noqa: E402
+
+LATENCY = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+TEXT = "This rental agreement contains an automatic renewal clause and binding arbitration."
+
+
+class _FakeResponse:
+    text = json.dumps({"category": "Contract Law", "key_findings": ["stub"]})
+
+
+class _FakeModel:
+    async def generate_content_async(self, *args, **kwargs):
+        await asyncio.sleep(LATENCY)
+        return _FakeResponse()
+
+
+model_loader.GEMINI_MODEL = object()
+model_loader._build_gemini_request = lambda task, language, tier: (_FakeModel(), None)
+
+
+async def timed(label: str) -> None:
+    start = time.perf_counter()
+    await model_loader.predict_analyze_async(TEXT)
+    print(f"{label:<12} {(time.perf_counter() - start) * 1000:10.2f} ms")
+
+
+async def main() -> None:
+    await timed("miss")
+    await timed("memory hit")
+    model_loader.response_cache = ResponseCache(db_path=cache_path)
+    await timed("disk hit")
+    await timed("memory hit")
+    print(f"stats: {model_loader.response_cache.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+"""
+Contract risk matching cost: compiled rule pack vs. one regex per rule.
+
+Both report every hit with offsets. The per-rule baseline rescans the
+contract once per rule, so it grows with rules x text length; the compiled
+pack scans once and should barely move when the rule count grows.
+
+Usage: python scripts/bench_risk_rules.py [repeats]
+"""
+
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from app.ml.risk_rules import RiskRule, RiskRulePack, risk_rules  # noqa: E402
+
+REPEATS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+CLAUSES = [
+    "The Landlord may terminate without notice if rent is more than thirty days late.",
+    "Late fees of five percent apply to all overdue payments.",
+    "This agreement is subject to automatic renewal; either party may give 30 days notice.",
+    "The parties shall use reasonable efforts to resolve disputes amicably.",
+    "Payment is due on the first business day of each month.",
+    "The tenant shall keep the premises clean and in good repair at all times.",
+]
+FILLER = "payment premises tenant landlord party notice schedule deliver goods warranty indemnity".split()
+
+
+def make_contract(clauses: int) -> str:
+    random.seed(clauses)
+    return " ".join(random.choice(CLAUSES) for _ in range(clauses))
+
+
+def make_pack(extra_rules: int) -> RiskRulePack:
+    random.seed(extra_rules)
+    extra = [
+        RiskRule(f"synthetic_{i}", " ".join(random.sample(FILLER, 3)) + f" x{i}", "low", None)
+        for i in range(extra_rules)
+    ]
+    return RiskRulePack(risk_rules.get().rules + extra)
+
+
+def per_rule_scan(patterns, text: str) -> int:
+    return sum(1 for pattern in patterns for _ in pattern.finditer(text))
+
+
+def timed_us(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn()
+    return (time.perf_counter() - start) / REPEATS * 1e6
+
+
+def main() -> None:
+    print(f"{'rules':>6} {'contract':>10} {'hits':>6} {'per-rule us':>12} {'compiled us':>12}")
+    for extra_rules in (0, 500):
+        pack = make_pack(extra_rules)
+        patterns = [re.compile(r"\b" + re.escape(rule.phrase) + r"\b", re.IGNORECASE) for rule in pack.rules]
+        for clauses in (10, 100, 1000):
+            text = make_contract(clauses)
+            hits = len(pack.find(text))
+            baseline = timed_us(lambda: per_rule_scan(patterns, text))
+            compiled = timed_us(lambda: pack.find(text))
+            print(f"{len(pack.rules):>6} {len(text) // 1024:>8}KB {hits:>6} {baseline:12.0f} {compiled:12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Exact top-k search over the memory-mapped similarity index.
+
+For each corpus size, appends random vectors to a fresh index in a temp
+directory (in batches, like the catch-up sync), then times k=10 queries with
+a document excluded, as /api/similar runs them. Reports append throughput,
+p50/p99 query latency, the mapped matrix size and the peak process RSS
+(which counts the mapped file pages; those are page cache shared by every
+worker, not per-worker heap).
+
+Usage: python scripts/bench_similarity_search.py [sizes, e.g. 10000,100000,1000000] [dim] [queries]
+"""
+
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from app.utils.similarity_search import SimilarityIndex  # noqa: E402
+
+SIZES = [int(size) for size in sys.argv[1].split(",")] if len(sys.argv) > 1 else [10_000, 100_000, 1_000_000]
+DIM = int(sys.argv[2]) if len(sys.argv) > 2 else 768
+QUERIES = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+BATCH = 10_000
+
+
+def run(size: int, directory: str) -> None:
+    rng = np.random.default_rng(size)
+    index = SimilarityIndex(Path(directory))
+    started = time.perf_counter()
+    for start in range(0, size, BATCH):
+        rows = min(BATCH, size - start)
+        index.add(np.arange(start + 1, start + rows + 1), rng.standard_normal((rows, DIM), dtype=np.float32))
+    append_seconds = time.perf_counter() - started
+
+    queries = rng.standard_normal((QUERIES, DIM), dtype=np.float32)
+    index.search(queries[0], 10)  # first touch pages the matrix in
+    latencies = []
+    for i, query in enumerate(queries):
+        started = time.perf_counter()
+        results = index.search(query, 10, exclude_ids=(i + 1,))
+        latencies.append((time.perf_counter() - started) * 1000)
+    assert len(results) == 10 and results[0][1] >= results[-1][1]
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{size:>9} {size / append_seconds:12.0f} {statistics.median(latencies):9.2f} {p99:9.2f} "
+          f"{index.stats()['bytes'] / 2**20:10.0f} {rss_mb:10.0f}")
+
+
+def main() -> None:
+    print(f"dim {DIM}, k=10, {QUERIES} queries per size")
+    print(f"{'vectors':>9} {'append/s':>12} {'p50 ms':>9} {'p99 ms':>9} {'mapped MB':>10} {'max RSS MB':>10}")
+    for size in SIZES:
+        with tempfile.TemporaryDirectory() as directory:
+            run(size, directory)
+
+
+if __name__ == "__main__":
+    main()
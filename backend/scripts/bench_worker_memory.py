@@ -0,0 +1,92 @@
+"""
+Per-worker memory and cold-start time for the three ways of loading model.pkl.
+
+An array-heavy stand-in model is dumped (uncompressed) with joblib, then N
+forked workers each load it and run a prediction:
+
+- private:  every worker calls joblib.load (the old behaviour)
+- mmap:     every worker calls joblib.load(mmap_mode="r")
+- preload:  the parent loads once before forking (gunicorn --preload)
+
+Summed PSS is the real footprint of the worker pool; RSS double-counts pages
+that are shared. Linux only (reads /proc/self/smaps_rollup).
+
+Usage: python scripts/bench_worker_memory.py [workers] [model_mb]
+"""
+
+import gc
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from app.utils.process_stats import memory_usage_mb  # noqa: E402
+
+WORKERS = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+MODEL_MB = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+
+class _ArrayModel:
+    """Stand-in for a vectoriser plus linear model: mostly large float arrays."""
+
+    def __init__(self, megabytes: int):
+        rows = megabytes * 1024 * 1024 // (8 * 1024)
+        self.weights = np.random.default_rng(0).standard_normal((rows, 1024))
+
+    def predict(self, texts):
+        features = np.ones(self.weights.shape[1])
+        return [float((self.weights @ features).sum()) for _ in texts]
+
+
+def _worker(mode: str, path: str, preloaded, results) -> None:
+    started = time.perf_counter()
+    if preloaded is None:
+        model = joblib.load(path, mmap_mode="r" if mode == "mmap" else None)
+    else:
+        model = preloaded
+    model.predict(["warm-up"])
+    results.put((time.perf_counter() - started, memory_usage_mb()))
+
+
+def run(mode: str, path: str) -> None:
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    preloaded = None
+    if mode == "preload":
+        started = time.perf_counter()
+        preloaded = joblib.load(path)
+        parent_load = time.perf_counter() - started
+        gc.freeze()
+    workers = [context.Process(target=_worker, args=(mode, path, preloaded, results)) for _ in range(WORKERS)]
+    for worker in workers:
+        worker.start()
+    samples = [results.get(timeout=300) for _ in workers]
+    for worker in workers:
+        worker.join()
+    if preloaded is not None:
+        gc.unfreeze()
+
+    cold = max(seconds for seconds, _ in samples)
+    rss = sum(usage["rss_mb"] or 0 for _, usage in samples) / len(samples)
+    pss = sum(usage["pss_mb"] or 0 for _, usage in samples)
+    extra = f"  (+{parent_load:.2f}s once in parent)" if mode == "preload" else ""
+    print(f"{mode:<8} cold start {cold:6.2f}s   RSS/worker {rss:8.1f} MB   total PSS {pss:8.1f} MB{extra}")
+
+
+def main() -> None:
+    path = str(Path(tempfile.mkdtemp()) / "model.pkl")
+    joblib.dump(_ArrayModel(MODEL_MB), path)
+    print(f"{WORKERS} workers, {MODEL_MB} MB model")
+    for mode in ("private", "mmap", "preload"):
+        run(mode, path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Build (or update) the IVF index behind /api/similar from stored embeddings.
+
+First catches the similarity index up with documents.embedding, then either
+clusters every vector into a new build, or with --update files the documents
+added since the last build into its existing clusters (much faster, no
+retraining; do a full build once the corpus has drifted or grown a lot).
+Workers switch to the new build on their next query. Uses DATABASE_URL,
+SIMILARITY_INDEX_DIR and ANN_INDEX_DIR like the app.
+
+Usage: python scripts/build_ann_index.py [--nlist N] [--iterations 10] [--sample N] [--update]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from app.utils.ann_index import ANN_INDEX_DIR, build_ivf, update_ivf  # noqa: E402
+from app.utils.similarity_search import similarity_index, sync_index_with_db  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--nlist", type=int, help="number of clusters (default about 4 * sqrt(rows))")
+    parser.add_argument("--iterations", type=int, default=10, help="k-means iterations")
+    parser.add_argument("--sample", type=int, help="vectors to train on (default 32 per cluster)")
+    parser.add_argument("--update", action="store_true", help="add new documents to the current build's clusters")
+    parser.add_argument("--index-dir", type=Path, default=ANN_INDEX_DIR)
+    args = parser.parse_args()
+
+    sync_index_with_db()
+    print(f"INFO: Similarity index holds {len(similarity_index)} vectors")
+    started = time.perf_counter()
+    if args.update:
+        build = update_ivf(similarity_index, args.index_dir)
+        if build is None:
+            print("INFO: No documents since the last build; nothing to do")
+            return
+    else:
+        build = build_ivf(similarity_index, args.index_dir, args.nlist, args.iterations, args.sample)
+    print(f"INFO: Wrote {build} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
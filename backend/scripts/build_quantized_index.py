@@ -0,0 +1,53 @@
+"""
+Build (or update) the quantized copy of stored embeddings behind /api/similar.
+
+First catches the similarity index up with documents.embedding, then trains
+the chosen codec on a sample and encodes every vector (int8: one byte per
+dimension; pq: --subspaces bytes per vector). With --update, documents added
+since the last build are encoded with the current codec, without retraining.
+Workers switch to the new build on their next query. Uses DATABASE_URL,
+SIMILARITY_INDEX_DIR and QUANTIZED_INDEX_DIR like the app; set
+SIMILARITY_SEARCH=quantized if an IVF build also exists.
+
+Usage: python scripts/build_quantized_index.py [--codec pq|int8] [--subspaces N] [--update]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from app.utils.quantization import CODECS, QUANTIZED_INDEX_DIR, build_quantized, update_quantized  # noqa: E402
+from app.utils.similarity_search import similarity_index, sync_index_with_db  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--codec", choices=CODECS, default="pq")
+    parser.add_argument("--subspaces", type=int, help="pq bytes per vector (default dim / 8; must divide dim)")
+    parser.add_argument("--iterations", type=int, default=10, help="pq k-means iterations")
+    parser.add_argument("--sample", type=int, default=20_000, help="vectors to train on")
+    parser.add_argument("--update", action="store_true", help="encode new documents with the current codec")
+    parser.add_argument("--index-dir", type=Path, default=QUANTIZED_INDEX_DIR)
+    args = parser.parse_args()
+
+    sync_index_with_db()
+    print(f"INFO: Similarity index holds {len(similarity_index)} vectors")
+    started = time.perf_counter()
+    if args.update:
+        build = update_quantized(similarity_index, args.index_dir)
+        if build is None:
+            print("INFO: No documents since the last build; nothing to do")
+            return
+    else:
+        build = build_quantized(
+            similarity_index, args.codec, args.index_dir, args.subspaces, args.iterations, args.sample,
+        )
+    print(f"INFO: Wrote {build} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Convert documents.embedding from JSON text to packed binary vectors.
+
+- SQLite: rows whose embedding is still text are rewritten in place (SQLite
+  keeps blobs as blobs in the old TEXT column), so the script can be re-run
+  or interrupted safely.
+- PostgreSQL: a bytea column is filled next to the text one, which is then
+  dropped and the new column renamed, in one transaction at the end.
+
+Rows whose JSON cannot be parsed are set to NULL and counted. Uses
+DATABASE_URL like the app.
+
+Usage: python scripts/migrate_embeddings_to_blob.py [--dtype float32|float16] [--batch 500] [--dry-run]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+
+backend_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(backend_dir))
+
+from app.db.database import DATABASE_URL  # noqa: E402
+from app.db.types import pack_vector  # noqa: E402
+
+
+def _convert(rows, dtype):
+    updates, invalid = [], 0
+    for row_id, payload in rows:
+        try:
+            updates.append({"id": row_id, "blob": pack_vector(json.loads(payload), dtype)})
+        except (TypeError, ValueError):
+            updates.append({"id": row_id, "blob": None})
+            invalid += 1
+    return updates, invalid
+
+
+def migrate(url: str, dtype: str, batch: int, dry_run: bool) -> None:
+    # The app uses an async driver for PostgreSQL; the migration runs synchronously
+    engine = create_engine(url.replace("+asyncpg", ""))
+    sqlite = engine.dialect.name == "sqlite"
+
+    with engine.begin() as conn:
+        if sqlite:
+            pending = "typeof(embedding) = 'text'"
+            target = "embedding"
+        else:
+            column_type = conn.execute(text(
+                "SELECT data_type FROM information_schema.columns "
+                "WHERE table_name = 'documents' AND column_name = 'embedding'"
+            )).scalar()
+            if column_type == "bytea":
+                print("INFO: documents.embedding is already binary; nothing to do")
+                return
+            if not dry_run:
+                conn.execute(text("ALTER TABLE documents ADD COLUMN IF NOT EXISTS embedding_blob bytea"))
+            pending = "embedding IS NOT NULL"
+            target = "embedding_blob"
+        total, text_bytes = conn.execute(text(
+            f"SELECT COUNT(*), COALESCE(SUM(LENGTH(embedding)), 0) FROM documents WHERE {pending}"
+        )).one()
+
+    print(f"INFO: {total} JSON embeddings ({text_bytes / 1024:.1f} KB) to convert to {dtype}")
+    if dry_run or not total:
+        return
+
+    converted = invalid = blob_bytes = 0
+    last_id = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(text(
+                f"SELECT id, embedding FROM documents WHERE {pending} AND id > :last ORDER BY id LIMIT :batch"
+            ), {"last": last_id, "batch": batch}).all()
+            if not rows:
+                break
+            updates, bad = _convert(rows, dtype)
+            conn.execute(text(f"UPDATE documents SET {target} = :blob WHERE id = :id"), updates)
+        last_id = rows[-1][0]
+        converted += len(rows) - bad
+        invalid += bad
+        blob_bytes += sum(len(update["blob"]) for update in updates if update["blob"] is not None)
+        print(f"INFO: {converted + invalid}/{total} rows processed")
+
+    if not sqlite:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE documents DROP COLUMN embedding"))
+            conn.execute(text("ALTER TABLE documents RENAME COLUMN embedding_blob TO embedding"))
+
+    print(f"INFO: Converted {converted} rows ({text_bytes / 1024:.1f} KB -> {blob_bytes / 1024:.1f} KB), "
+          f"{invalid} unreadable rows set to NULL")
+    if sqlite:
+        print("INFO: Run VACUUM to return the freed pages to the filesystem")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--dtype", choices=("float32", "float16"), default="float32")
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    args = parser.parse_args()
+    migrate(args.database_url, args.dtype, args.batch, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,9 +18,9 @@ backend_dir = repo_root / "backend"
 sys.path.insert(0, str(backend_dir))
 
 # Import after setting environment
-from app.utils.model_loader import _predict_with_gemini, GEMINI_MODEL  # noqa: E402
+from app.utils.model_loader import _predict_with_gemini, init_gemini  # noqa: E402
 
-print(f"GEMINI_MODEL is None: {GEMINI_MODEL is None}")
+print(f"GEMINI_MODEL is None: {init_gemini() is None}")
 print(f"GEMINI_API_KEY set: {'GEMINI_API_KEY' in os.environ}")
 
 test_text = "This is a contract agreement with automatic renewal and binding arbitration."
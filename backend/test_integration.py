@@ -47,6 +47,35 @@ def test_imports():
     
     return True
 
+# Cold `import app.main` must stay under this budget (override for slow machines)
+def test_import_time():
+    """Check cold import time of the app with `python -X importtime`."""
+    from tests.test_import_time import IMPORT_TIME_BUDGET_MS, LAZY_MODULES, import_timings
+
+    print("\n⏱️ Testing cold import time...")
+    try:
+        timings = import_timings()
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return False
+
+    eager = [name for name in LAZY_MODULES if name in timings]
+    if eager:
+        print(f"❌ Heavy modules imported at startup: {', '.join(eager)}")
+        return False
+
+    total_ms = timings.get("app.main")
+    if total_ms is None:
+        print("❌ No importtime entry for app.main")
+        return False
+    slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)[1:6]
+    print("📋 Slowest imports: " + ", ".join(f"{name} {ms:.0f}ms" for name, ms in slowest))
+    if total_ms > IMPORT_TIME_BUDGET_MS:
+        print(f"❌ app.main imported in {total_ms:.0f}ms, over the {IMPORT_TIME_BUDGET_MS:.0f}ms budget")
+        return False
+    print(f"✅ app.main imported in {total_ms:.0f}ms (budget {IMPORT_TIME_BUDGET_MS:.0f}ms)")
+    return True
+
 def test_model_prediction():
     """Test model prediction functionality."""
     print("\n🤖 Testing model prediction...")
@@ -112,6 +141,9 @@ def main():
     
     all_passed = True
     
+    # Test cold import time first, before this process has imported anything
+    all_passed &= test_import_time()
+
     # Test imports
     all_passed &= test_imports()
     
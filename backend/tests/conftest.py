@@ -0,0 +1,29 @@
+"""
+Shared test setup.
+
+Runs before any `app` module is imported: Gemini keys are blanked so no test
+can reach the real API, and every database, cache and index path points into
+a scratch directory instead of the working tree.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+_SCRATCH = Path(tempfile.mkdtemp(prefix="lawgic-tests-"))
+os.environ.update({
+    "GEMINI_API_KEY": "",
+    "AI_API_KEY": "",
+    "WARMUP_ON_STARTUP": "0",
+    "MODEL_WATCH_SECONDS": "0",
+    "DATABASE_URL": f"sqlite:///{_SCRATCH / 'app.db'}",
+    "RESPONSE_CACHE_PATH": str(_SCRATCH / "responses.db"),
+    "EMBEDDING_CACHE_PATH": str(_SCRATCH / "embeddings.db"),
+    "SIMILARITY_INDEX_DIR": str(_SCRATCH / "similarity"),
+    "ANN_INDEX_DIR": str(_SCRATCH / "ann"),
+    "QUANTIZED_INDEX_DIR": str(_SCRATCH / "quantized"),
+})
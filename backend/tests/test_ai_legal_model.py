@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from app.ml.ai_legal_model import AiLegalAssistantModel
+
+
+@pytest.fixture
+def model():
+    return AiLegalAssistantModel()
+
+
+@pytest.mark.parametrize("text, analysis_type", [
+    ("Please review this rental AGREEMENT before I sign.", "contract_review"),
+    ("The Clauses on payment look odd.", "contract_review"),
+    ("My landlord is evicting me without notice.", "legal_guidance"),
+    # Keywords match at word starts only, so "determine" is not "terms"
+    ("How do courts determine custody?", "legal_guidance"),
+])
+def test_contracts_and_queries_are_told_apart(model, text, analysis_type):
+    assert model.predict_structured([text])[0]["analysis_type"] == analysis_type
+
+
+def _review(model, text):
+    return model.predict_structured([text])[0]
+
+
+def test_each_flagged_clause_is_reported_once_for_its_riskiest_hit(model):
+    text = "This agreement has late fees and no refund. Renewal needs 30 days notice."
+    review = _review(model, text)
+    assert review["overall_risk"] == "High"
+    assert [finding["rule_id"] for finding in review["findings"]] == ["no_refund", "thirty_days_notice"]
+    first = review["findings"][0]
+    assert text[first["start"]:first["end"]] == "no refund"
+    assert text[first["clause_start"]:first["clause_end"]] == first["clause"] == "This agreement has late fees and no refund."
+
+
+def test_findings_are_capped_riskiest_first(model, monkeypatch):
+    monkeypatch.setattr("app.ml.ai_legal_model.MAX_CONTRACT_FINDINGS", 2)
+    text = "Contract. Late fees apply. Standard terms apply. No refund is given. Unlimited liability applies."
+    review = _review(model, text)
+    assert [finding["rule_id"] for finding in review["findings"]] == ["no_refund", "unlimited_liability"]
+    assert review["flagged_clauses"] == 4
+    assert review["overall_risk"] == "High"
+
+
+def test_long_clauses_are_quoted_around_the_indicator(model):
+    text = "Under this contract " + "the party shall " * 100 + "pay late fees " + "as invoiced " * 100 + "."
+    finding = _review(model, text)["findings"][0]
+    assert "late fees" in finding["clause"]
+    assert len(finding["clause"]) <= 402
+    assert (finding["clause_start"], finding["clause_end"]) == (0, len(text))
+
+
+def _without_timestamp(analysis):
+    return {key: value for key, value in analysis.items() if key != "timestamp"}
+
+
+@pytest.mark.parametrize("X, texts", [
+    ("This agreement has no refund.", ["This agreement has no refund."]),
+    (["Contract with late fees.", "My employer has not paid my wages."],
+     ["Contract with late fees.", "My employer has not paid my wages."]),
+    (42, ["42"]),
+])
+def test_predict_is_predict_structured_serialised(model, X, texts):
+    from_json = [_without_timestamp(json.loads(output)) for output in model.predict(X)]
+    structured = [_without_timestamp(analysis) for analysis in model.predict_structured(texts)]
+    assert from_json == structured
+
+
+def test_local_model_runner_prefers_the_structured_api(model, monkeypatch):
+    from app.utils import model_loader
+
+    monkeypatch.setattr(type(model), "predict", lambda self, X: pytest.fail("JSON path used"))
+    results = model_loader._run_local_model(model, ["Review this contract for late fees."])
+    assert results[0]["analysis_type"] == "contract_review"
+    assert "timestamp" in results[0]
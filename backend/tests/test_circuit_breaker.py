@@ -0,0 +1,66 @@
+from app.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def make_breaker(probe_interval_seconds: float = 60.0) -> CircuitBreaker:
+    return CircuitBreaker(
+        "test", failure_rate_threshold=0.5, window_size=4, min_calls=4,
+        slow_call_seconds=1.0, probe_interval_seconds=probe_interval_seconds,
+    )
+
+
+def test_stays_closed_until_min_calls():
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+
+
+def test_opens_when_failure_rate_reaches_threshold():
+    breaker = make_breaker()
+    breaker.record_success(0.1)
+    breaker.record_success(0.1)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.available()
+    assert not breaker.allow_request()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_slow_successes_count_as_failures():
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.record_success(5.0)
+    assert breaker.state == OPEN
+
+
+def test_half_open_admits_a_single_probe():
+    breaker = make_breaker(probe_interval_seconds=0)
+    for _ in range(4):
+        breaker.record_failure()
+    assert breaker.available()
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.available()
+    assert not breaker.allow_request()
+
+
+def test_successful_probe_closes_the_circuit():
+    breaker = make_breaker(probe_interval_seconds=0)
+    for _ in range(4):
+        breaker.record_failure()
+    breaker.allow_request()
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+    assert breaker.stats()["window_calls"] == 1
+
+
+def test_failed_probe_reopens_the_circuit():
+    breaker = make_breaker(probe_interval_seconds=0)
+    for _ in range(4):
+        breaker.record_failure()
+    breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.opened_count == 2
@@ -0,0 +1,20 @@
+import os
+
+import pytest
+from sqlalchemy import text
+
+from app.db import database
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_children_do_not_reuse_pooled_connections():
+    with database.engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert database.engine.pool.checkedin() == 1
+
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0 if database.engine.pool.checkedin() == 0 else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert database.engine.pool.checkedin() == 1
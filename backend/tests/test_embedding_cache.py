@@ -0,0 +1,20 @@
+import sqlite3
+
+from app.utils.embedding_cache import EmbeddingCache
+
+MODEL = "models/text-embedding-004"
+
+
+def test_vectors_are_stored_as_float32_with_their_model(tmp_path):
+    path = tmp_path / "embeddings.db"
+    cache = EmbeddingCache(path)
+    cache.set("k", [0.1, 0.2, 0.3], MODEL)
+    with sqlite3.connect(path) as conn:
+        model, dim, blob = conn.execute("SELECT model, dim, vector FROM embedding_cache").fetchone()
+    assert (model, dim, len(blob)) == (MODEL, 3, 12)
+    # float32 round trip: close to, not exactly, the float64 input
+    assert EmbeddingCache(path, memory_entries=0).get("k") == cache.get("k") != [0.1, 0.2, 0.3]
+
+
+def test_keys_depend_on_the_model():
+    assert EmbeddingCache.make_key("text", MODEL) != EmbeddingCache.make_key("text", "local-hash")
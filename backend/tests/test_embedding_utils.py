@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from app.utils import embedding_utils
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.embedding_cache import EmbeddingCache
+from app.utils.micro_batcher import MicroBatcher
+
+
+class FakeGenai:
+    """Stands in for google.generativeai: one vector per text, derived from the text."""
+
+    def __init__(self, fail=False, short=False):
+        self.calls = []
+        self.fail = fail
+        self.short = short
+
+    def embed_content(self, model, content):
+        self.calls.append(list(content))
+        if self.fail:
+            raise RuntimeError("upstream unavailable")
+        vectors = [[float(len(text)), float(sum(map(ord, text)))] for text in content]
+        return {"embedding": vectors[:-1] if self.short else vectors}
+
+
+def vector_for(text):
+    return [float(len(text)), float(sum(map(ord, text)))]
+
+
+@pytest.fixture
+def gemini(monkeypatch, tmp_path):
+    def install(**kwargs):
+        client = FakeGenai(**kwargs)
+        monkeypatch.setattr(embedding_utils, "genai", client)
+        monkeypatch.setattr(embedding_utils, "_genai_initialized", True)
+        return client
+
+    monkeypatch.setattr(embedding_utils, "gemini_breaker", CircuitBreaker("test"))
+    monkeypatch.setattr(embedding_utils, "embedding_cache", EmbeddingCache(tmp_path / "embeddings.db"))
+    monkeypatch.setattr(embedding_utils, "embedding_batcher", MicroBatcher(
+        "test", embedding_utils._embed_batch_with_gemini, max_batch_size=32, max_wait_ms=20,
+    ))
+    return install
+
+
+async def test_concurrent_requests_share_one_upstream_call(gemini):
+    client = gemini()
+    texts = ["first clause", "second, longer clause", "third"]
+    vectors = await asyncio.gather(*(embedding_utils.get_embedding(text) for text in texts))
+
+    assert len(client.calls) == 1
+    assert sorted(client.calls[0]) == sorted(texts)
+    assert vectors == [vector_for(text) for text in texts]
+
+
+async def test_identical_requests_are_sent_once(gemini):
+    client = gemini()
+    vectors = await asyncio.gather(*(embedding_utils.get_embedding(text) for text in ["same", "same", "other"]))
+
+    assert sorted(client.calls[0]) == ["other", "same"]
+    assert vectors == [vector_for("same"), vector_for("same"), vector_for("other")]
+
+
+async def test_cached_vectors_skip_the_upstream_call(gemini):
+    client = gemini()
+    first = await embedding_utils.get_embedding("cached text")
+    assert await embedding_utils.get_embedding("cached text") == first
+    assert len(client.calls) == 1
+
+
+@pytest.mark.parametrize("failure", [{"fail": True}, {"short": True}])
+def test_failed_batch_yields_none_for_every_text(gemini, failure):
+    gemini(**failure)
+    assert embedding_utils._embed_batch_with_gemini(["a", "b"]) == [None, None]
+
+
+async def test_fallback_vectors_are_labelled_and_not_stored_while_gemini_is_configured(gemini):
+    gemini(fail=True)
+    vector, model = await embedding_utils.get_embedding_with_model("upstream is down")
+    assert model == embedding_utils.init_local_embedder().model_name
+    assert len(vector) == 768
+    assert await embedding_utils.get_document_embedding("upstream is down") == (None, None)
+
+
+async def test_gemini_vectors_are_stored_with_their_model(gemini):
+    gemini()
+    assert await embedding_utils.get_document_embedding("clause") == (
+        vector_for("clause"), embedding_utils.GEMINI_EMBED_MODEL,
+    )
+
+
+async def test_local_vectors_are_stored_when_gemini_is_not_configured(monkeypatch):
+    monkeypatch.setattr(embedding_utils, "genai", None)
+    monkeypatch.setattr(embedding_utils, "_genai_initialized", True)
+    vector, model = await embedding_utils.get_document_embedding("offline deployment")
+    assert model == embedding_utils.init_local_embedder().model_name
+    assert len(vector) == 768
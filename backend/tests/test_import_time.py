@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+# Loaded on first use or by the startup warm-up, never at import
+LAZY_MODULES = ("google.generativeai", "numpy", "joblib", "PyPDF2", "docx", "speech_recognition")
+
+
+def import_timings(module: str = "app.main") -> Dict[str, float]:
+    """Cumulative import time in ms per module, from a cold `python -X importtime`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            timings[name.strip()] = int(cumulative) / 1000
+    return timings
+
+
+def test_app_imports_within_budget_without_heavy_modules():
+    timings = import_timings()
+    assert [name for name in LAZY_MODULES if name in timings] == []
+    assert timings["app.main"] <= IMPORT_TIME_BUDGET_MS
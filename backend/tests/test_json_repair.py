@@ -0,0 +1,57 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+# The backend and both assistant packages carry the same module; all three must behave alike
+COPIES = [
+    REPO_ROOT / "backend" / "app" / "utils" / "json_repair.py",
+    REPO_ROOT / "model+backend+db" / "ai_legal_assistant" / "core" / "json_repair.py",
+    REPO_ROOT / "frontend+backend+model" / "ai_legal_assistant" / "core" / "json_repair.py",
+]
+
+
+@pytest.fixture(params=COPIES, ids=lambda path: path.parts[-4])
+def json_repair(request):
+    spec = importlib.util.spec_from_file_location(f"json_repair_{request.param_index}", request.param)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def counters(module):
+    return dict(module.decode_counters)
+
+
+def test_clean_json_is_counted_clean(json_repair):
+    assert json_repair.parse_json_lenient('{"a": 1}') == {"a": 1}
+    assert counters(json_repair) == {"clean": 1, "repaired": 0, "failed": 0}
+
+
+def test_code_fence_is_stripped(json_repair):
+    assert json_repair.parse_json_lenient('```json\n{"a": [1, 2]}\n```') == {"a": [1, 2]}
+    assert counters(json_repair)["clean"] == 1
+
+
+@pytest.mark.parametrize("payload, expected", [
+    ('{"a": 1, "b": [1, 2,],}', {"a": 1, "b": [1, 2]}),
+    ('Here is the analysis: {"a": 1} Hope this helps!', {"a": 1}),
+    ('{"key_points": ["one", "two"], "summary": "cut off mid', {"key_points": ["one", "two"], "summary": "cut off mid"}),
+    ('{"key_points": ["one", "two"], "recommendations": [{"text": "x", "prio', {"key_points": ["one", "two"], "recommendations": [{"text": "x"}]}),
+    ('The text says "[note]" then {"a":1}', {"a": 1}),
+    ('See [s. 27] and [the lease, above]: {"a": {"b": 2}}', {"a": {"b": 2}}),
+])
+def test_defects_are_repaired(json_repair, payload, expected):
+    assert json_repair.parse_json_lenient(payload) == expected
+    assert counters(json_repair) == {"clean": 0, "repaired": 1, "failed": 0}
+
+
+@pytest.mark.parametrize("payload", ["no json here", "[not json] {nor this}", "", '{"a": tru'])
+def test_unrecoverable_output_raises_value_error_and_counts_failure(json_repair, payload):
+    with pytest.raises(ValueError) as excinfo:
+        json_repair.parse_json_lenient(payload)
+    assert not isinstance(excinfo.value, json.JSONDecodeError)
+    assert counters(json_repair) == {"clean": 0, "repaired": 0, "failed": 1}
+    assert json_repair.decode_stats()["failure_rate"] == 1.0
@@ -0,0 +1,45 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from app.utils.local_embeddings import DEFAULT_DIM, HashedNgramEmbedder, local_embedder
+
+TEXTS = ["The tenant shall pay rent monthly.", "Termination requires 30 days notice.", ""]
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_rows_have_the_default_dimension_and_unit_length():
+    matrix = local_embedder.embed_batch(TEXTS)
+    assert matrix.shape == (len(TEXTS), DEFAULT_DIM) == (3, 768)
+    assert matrix.dtype == np.float32
+    assert np.allclose(np.linalg.norm(matrix[:2], axis=1), 1.0)
+    assert not matrix[2].any()
+
+
+def test_batches_match_single_texts():
+    matrix = local_embedder.embed_batch(TEXTS)
+    assert all(np.array_equal(matrix[i], local_embedder.embed(text)) for i, text in enumerate(TEXTS))
+
+
+def test_vectors_are_identical_across_processes():
+    script = (
+        "import json; from app.utils.local_embeddings import local_embedder; "
+        f"print(json.dumps(local_embedder.embed_batch({TEXTS!r}).tolist()))"
+    )
+    outputs = []
+    for seed in ("1", "2"):
+        # A different hash seed in each child would change anything relying on hash()
+        env = {**os.environ, "PYTHONHASHSEED": seed}
+        result = subprocess.run(
+            [sys.executable, "-c", script], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+        )
+        outputs.append(json.loads(result.stdout))
+    assert outputs[0] == outputs[1] == local_embedder.embed_batch(TEXTS).tolist()
+
+
+def test_model_name_reflects_the_vector_space():
+    assert local_embedder.model_name == f"local/hashed-ngrams-{DEFAULT_DIM}"
+    assert HashedNgramEmbedder(dim=256).model_name != local_embedder.model_name
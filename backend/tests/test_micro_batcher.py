@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from app.utils.micro_batcher import MicroBatcher
+
+
+def _recording(fn=lambda items: [item * 10 for item in items]):
+    batches = []
+
+    def run(items):
+        batches.append(list(items))
+        return fn(items)
+
+    return run, batches
+
+
+async def test_full_batch_flushes_without_waiting_for_the_window():
+    fn, batches = _recording()
+    batcher = MicroBatcher("test", fn, max_batch_size=3, max_wait_ms=60_000)
+    results = await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(3))), timeout=2)
+    assert results == [0, 10, 20]
+    assert batches == [[0, 1, 2]]
+
+
+async def test_partial_batch_flushes_when_the_window_closes():
+    fn, batches = _recording()
+    batcher = MicroBatcher("test", fn, max_batch_size=100, max_wait_ms=20)
+    results = await asyncio.gather(batcher.submit(1), batcher.submit(2))
+    assert results == [10, 20]
+    assert batches == [[1, 2]]
+    assert batcher.stats()["batches"] == 1
+
+
+async def test_burst_is_split_by_size_and_results_map_back_to_callers():
+    fn, batches = _recording()
+    batcher = MicroBatcher("test", fn, max_batch_size=2, max_wait_ms=20)
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+    assert results == [0, 10, 20, 30, 40]
+    assert batches == [[0, 1], [2, 3], [4]]
+    assert batcher.stats()["largest_batch"] == 2
+
+
+async def test_batch_error_reaches_every_caller():
+    def fail(items):
+        raise ValueError("model down")
+
+    batcher = MicroBatcher("test", fail, max_batch_size=3, max_wait_ms=20)
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+async def test_short_batch_result_is_an_error_for_every_caller():
+    batcher = MicroBatcher("test", lambda items: items[:1], max_batch_size=2, max_wait_ms=20)
+    results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+async def test_cancelled_caller_does_not_disturb_the_rest_of_the_batch():
+    fn, _ = _recording()
+    batcher = MicroBatcher("test", fn, max_batch_size=100, max_wait_ms=20)
+    cancelled = asyncio.ensure_future(batcher.submit(1))
+    kept = asyncio.ensure_future(batcher.submit(2))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    assert await kept == 20
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
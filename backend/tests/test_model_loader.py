@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+
+from app.utils import model_loader
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.model_router import HEAVY, LIGHT
+from app.utils.response_cache import ResponseCache
+
+QUESTION = "Can my landlord keep the whole deposit for normal wear and tear?"
+CACHED = {"category": "Tenant/Landlord Law", "confidence": 0.9, "key_points": ["cached"], "recommendations": []}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path / "responses.db")
+    monkeypatch.setattr(model_loader, "response_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def open_breaker(monkeypatch):
+    breaker = CircuitBreaker("test", window_size=2, min_calls=2, probe_interval_seconds=3600)
+    breaker.record_failure()
+    breaker.record_failure()
+    monkeypatch.setattr(model_loader, "gemini_breaker", breaker)
+    return breaker
+
+
+@pytest.fixture
+def gemini_configured(monkeypatch):
+    # A stand-in handle: with no registries behind it any real call fails before reaching the network
+    monkeypatch.setattr(model_loader, "GEMINI_MODEL", object())
+    monkeypatch.setattr(model_loader, "_gemini_initialized", True)
+
+
+def store(cache, text, task="analysis", value=CACHED):
+    tier = model_loader.model_router.route(text, task)
+    cache.set(model_loader._cache_key(text, task, "en", tier), value)
+
+
+async def test_open_breaker_serves_cached_answer(cache, open_breaker, gemini_configured):
+    store(cache, QUESTION)
+    result = await model_loader.predict_analyze_async(QUESTION)
+    assert result["key_points"] == ["cached"]
+    assert result["source"] == "gemini"
+    assert open_breaker.stats()["rejected"] == 0
+
+
+async def test_open_breaker_without_cached_answer_falls_back(cache, open_breaker, gemini_configured):
+    result = await model_loader.predict_analyze_async(QUESTION)
+    assert result["source"] == "fallback"
+
+
+async def test_cache_bypass_skips_cached_answer(cache, open_breaker, gemini_configured):
+    store(cache, QUESTION)
+    result = await model_loader.predict_analyze_async(QUESTION, use_cache=False)
+    assert result["source"] == "fallback"
+
+
+async def test_cached_answer_served_when_gemini_is_not_configured(cache, monkeypatch):
+    monkeypatch.setattr(model_loader, "GEMINI_MODEL", None)
+    monkeypatch.setattr(model_loader, "_gemini_initialized", True)
+    store(cache, QUESTION, task="research", value={"topic": "cached"})
+    result = await model_loader.predict_research_async(QUESTION)
+    assert result == {"topic": "cached", "source": "gemini"}
+
+
+async def test_chunked_document_served_when_every_section_is_cached(cache, open_breaker, gemini_configured, monkeypatch):
+    monkeypatch.setattr(model_loader, "ANALYZE_CHUNK_TOKENS", 40)
+    document = "\n\n".join(f"Clause {i}. The tenant shall pay rent on the first day of each month." * 3 for i in range(4))
+    sections = model_loader.split_into_sections(document, 40)
+    assert len(sections) > 1
+    for section in sections[:-1]:
+        store(cache, section)
+    assert (await model_loader.predict_analyze_async(document))["source"] == "fallback"
+
+    store(cache, sections[-1])
+    result = await model_loader.predict_analyze_async(document)
+    assert result["source"] == "gemini"
+    assert result["sections_total"] == len(sections)
+
+
+def test_cache_keys_do_not_depend_on_gemini_initialisation(monkeypatch):
+    monkeypatch.setattr(model_loader, "GEMINI_MODEL_NAMES", {})
+    before = {tier: model_loader._cache_key(QUESTION, "analysis", "en", tier) for tier in (LIGHT, HEAVY)}
+    monkeypatch.setattr(model_loader, "GEMINI_MODEL_NAMES", model_loader._configured_model_names())
+    after = {tier: model_loader._cache_key(QUESTION, "analysis", "en", tier) for tier in (LIGHT, HEAVY)}
+    assert before == after
+    assert before[LIGHT] != before[HEAVY]
+
+
+def test_chunked_deadline_grows_with_rounds_of_parallel_sections(monkeypatch):
+    monkeypatch.setattr(model_loader, "ANALYZE_CHUNK_DEADLINE_SECONDS", 15.0)
+    monkeypatch.setattr(model_loader, "ANALYZE_CHUNK_PARALLELISM", 4)
+    assert model_loader._chunked_deadline(1) == 15.0
+    assert model_loader._chunked_deadline(4) == 15.0
+    assert model_loader._chunked_deadline(9) == 45.0
+
+
+async def test_chunked_analysis_runs_under_its_own_deadline(gemini_configured, monkeypatch):
+    monkeypatch.setattr(model_loader, "gemini_breaker", CircuitBreaker("test"))
+    monkeypatch.setattr(model_loader, "ANALYZE_CHUNK_TOKENS", 40)
+    monkeypatch.setattr(model_loader, "ANALYZE_CHUNK_DEADLINE_SECONDS", 5.0)
+
+    async def slow_sections(sections, language, use_cache):
+        await asyncio.sleep(0.2)
+        return {"category": "Contract Law", "sections_total": len(sections)}
+
+    monkeypatch.setattr(model_loader, "_predict_chunked_async", slow_sections)
+    document = " ".join(["The tenant shall pay rent on the first day of each month."] * 40)
+    result = await model_loader._predict_with_deadline(
+        document, "analysis", "en", False, model_loader.analyze_legal_text_fallback, 0.05
+    )
+    assert result["source"] == "gemini"
+    assert result["sections_total"] > 1
+
+
+async def test_gemini_is_initialised_off_the_event_loop(monkeypatch):
+    on_event_loop = []
+
+    def recording_init_gemini():
+        try:
+            asyncio.get_running_loop()
+            on_event_loop.append(True)
+        except RuntimeError:
+            on_event_loop.append(False)
+        return None
+
+    monkeypatch.setattr(model_loader, "_gemini_initialized", False)
+    monkeypatch.setattr(model_loader, "init_gemini", recording_init_gemini)
+    assert await model_loader._predict_with_gemini_async(QUESTION, use_cache=False) is None
+    assert on_event_loop == [False]
@@ -0,0 +1,91 @@
+import joblib
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.ml.ai_legal_model import AiLegalAssistantModel
+from app.routes import admin
+from app.utils import model_loader
+
+
+class BrokenModel:
+    """Loads fine but answers the smoke test with nothing."""
+
+    def predict(self, X):
+        return []
+
+
+@pytest.fixture(autouse=True)
+def current_model(monkeypatch):
+    # Every module-level model field is restored after the test
+    serving = AiLegalAssistantModel()
+    monkeypatch.setattr(model_loader, "model", serving)
+    monkeypatch.setattr(model_loader, "model_version", "v-old")
+    monkeypatch.setattr(model_loader, "model_load_seconds", None)
+    monkeypatch.setattr(model_loader, "model_loaded_at", None)
+    monkeypatch.setattr(model_loader, "_model_checked", True)
+    monkeypatch.setattr(model_loader, "reload_counters", {"succeeded": 0, "failed": 0, "last_error": None})
+    return serving
+
+
+def _dump(tmp_path, candidate, name="model.pkl"):
+    path = tmp_path / name
+    joblib.dump(candidate, path)
+    return path
+
+
+def test_reload_swaps_in_a_model_that_passes_the_smoke_test(tmp_path):
+    path = _dump(tmp_path, AiLegalAssistantModel())
+    result = model_loader.reload_local_model(path)
+
+    assert result["previous_version"] == "v-old"
+    assert result["version"] == model_loader.model_version == model_loader._model_file_version(path)
+    assert isinstance(model_loader.model, AiLegalAssistantModel)
+    assert model_loader.reload_counters["succeeded"] == 1
+    analysis = model_loader._local_model_predict_batch(["Review this contract."])[0]
+    assert analysis["model_version"] == result["version"]
+
+
+def test_reload_rejects_a_model_that_fails_the_smoke_test(tmp_path, current_model):
+    path = _dump(tmp_path, BrokenModel())
+    with pytest.raises(ValueError, match="smoke prediction"):
+        model_loader.reload_local_model(path)
+
+    assert model_loader.model is current_model
+    assert model_loader.model_version == "v-old"
+    assert model_loader.reload_counters["failed"] == 1
+    assert "smoke prediction" in model_loader.reload_counters["last_error"]
+
+
+@pytest.fixture
+def admin_client(monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    return TestClient(app)
+
+
+def test_reload_route_reports_a_rejected_model(admin_client, tmp_path, monkeypatch):
+    monkeypatch.setattr(model_loader, "MODEL_PATH", _dump(tmp_path, BrokenModel()))
+    response = admin_client.post("/api/admin/model/reload", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 422
+    assert model_loader.model_version == "v-old"
+
+
+def test_reload_route_refuses_a_concurrent_reload(admin_client, tmp_path, monkeypatch):
+    monkeypatch.setattr(model_loader, "MODEL_PATH", _dump(tmp_path, AiLegalAssistantModel()))
+    # Hold the lock as an in-flight reload would
+    assert model_loader._reload_lock.acquire(blocking=False)
+    try:
+        response = admin_client.post("/api/admin/model/reload", headers={"X-Admin-Token": "secret"})
+    finally:
+        model_loader._reload_lock.release()
+    assert response.status_code == 409
+    assert model_loader.model_version == "v-old"
+
+    response = admin_client.post("/api/admin/model/reload", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    assert response.json()["previous_version"] == "v-old"
+
+
+def test_reload_route_needs_the_admin_token(admin_client):
+    response = admin_client.post("/api/admin/model/reload", headers={"X-Admin-Token": "wrong"})
+    assert response.status_code == 401
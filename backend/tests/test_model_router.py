@@ -0,0 +1,61 @@
+import pytest
+
+from app.utils.model_router import HEAVY, LIGHT, ComplexityRouter, router_from_env
+
+KEYWORDS = ("contract", "breach", "tenant", "lease", "eviction")
+
+
+def make_router(**overrides) -> ComplexityRouter:
+    settings = {"light_max_tokens": 50, "heavy_keyword_hits": 3, "heavy_keyword_density": 0.2}
+    settings.update(overrides)
+    return ComplexityRouter(KEYWORDS, **settings)
+
+
+def test_short_plain_questions_go_light():
+    assert make_router().route("Can I get my deposit back?", "analysis") == LIGHT
+
+
+def test_long_inputs_go_heavy_on_size_alone():
+    assert make_router().route("word " * 60, "analysis") == HEAVY
+
+
+def test_dense_legal_text_goes_heavy():
+    router = make_router()
+    dense = "Contract breach: tenant lease eviction."
+    assert router.estimate(dense).keyword_hits == 5
+    assert router.route(dense, "analysis") == HEAVY
+
+
+@pytest.mark.parametrize("text", [
+    "The contract mentions a breach.",  # too few hits
+    "Contract breach tenant, and then a very long story about many other unrelated everyday matters here.",
+])
+def test_both_keyword_thresholds_must_be_met(text):
+    assert make_router(light_max_tokens=1000).route(text, "analysis") == LIGHT
+
+
+def test_research_always_goes_heavy():
+    assert make_router().route("Hi", "research") == HEAVY
+
+
+def test_disabled_router_sends_everything_heavy():
+    assert make_router(enabled=False).route("Hi", "analysis") == HEAVY
+
+
+def test_router_from_env(monkeypatch):
+    monkeypatch.setenv("GEMINI_ROUTE_HEAVY_TASKS", "research, analysis")
+    monkeypatch.setenv("GEMINI_ROUTE_LIGHT_MAX_TOKENS", "10")
+    router = router_from_env(KEYWORDS)
+    assert router.heavy_tasks == {"research", "analysis"}
+    assert router.light_max_tokens == 10
+    assert router.route("Hi", "analysis") == HEAVY
+
+
+def test_per_tier_stats():
+    router = make_router()
+    router.record(LIGHT, 0.5)
+    router.record(LIGHT, 1.5, failed=True)
+    stats = router.stats()
+    assert stats["tiers"][LIGHT]["requests"] == 2
+    assert stats["tiers"][LIGHT]["failures"] == 1
+    assert stats["tiers"][LIGHT]["mean_latency_ms"] == 1000.0
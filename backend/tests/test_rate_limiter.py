@@ -0,0 +1,43 @@
+import pytest
+
+from app.utils.rate_limiter import AdaptiveConcurrencyLimiter, GeminiRateLimiter, TokenBucket, is_throttle_error
+
+
+def test_token_bucket_returns_wait_once_exhausted():
+    bucket = TokenBucket(capacity=2, per_second=1)
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+
+
+def test_concurrency_limit_grows_additively_and_halves_on_throttle():
+    limiter = AdaptiveConcurrencyLimiter(initial=4, minimum=1, maximum=16)
+    for _ in range(4):
+        limiter.on_success()
+    assert limiter.limit == pytest.approx(5.0, abs=0.1)
+    limiter.on_throttle()
+    assert limiter.limit == pytest.approx(2.5, abs=0.1)
+    for _ in range(5):
+        limiter.on_throttle()
+    assert limiter.limit == 1
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("429 Resource has been exhausted", True),
+    ("503 Service Unavailable", True),
+    ("quota exceeded for this project", True),
+    ("400 Invalid argument", False),
+])
+def test_throttle_errors_are_recognised(message, expected):
+    assert is_throttle_error(RuntimeError(message)) is expected
+
+
+async def test_limit_releases_the_slot_when_the_call_fails():
+    limiter = GeminiRateLimiter(requests_per_minute=600, tokens_per_minute=10**6, initial_concurrency=1)
+    with pytest.raises(RuntimeError):
+        async with limiter.limit(10):
+            raise RuntimeError("429 rate limit")
+    assert limiter.concurrency.in_flight == 0
+    assert limiter.stats()["throttled"] == 1
+    async with limiter.limit(10):
+        assert limiter.concurrency.in_flight == 1
@@ -0,0 +1,22 @@
+from app.utils.response_cache import ResponseCache, bypass_requested
+
+VALUE = {"category": "Contract Law", "key_points": ["a"]}
+
+
+async def test_results_are_copies(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.db")
+    await cache.aset("k", VALUE)
+    (await cache.aget("k"))["key_points"].append("mutated")
+    assert (await cache.aget("k"))["key_points"] == ["a"]
+
+
+def test_keys_ignore_whitespace_but_not_the_task():
+    key = ResponseCache.make_key("a  contract\n", "analysis", "en", "gemini")
+    assert key == ResponseCache.make_key("a contract", "analysis", "en", "gemini")
+    assert key != ResponseCache.make_key("a contract", "research", "en", "gemini")
+
+
+def test_bypass_headers():
+    assert bypass_requested(x_cache_bypass="true")
+    assert bypass_requested(cache_control="no-cache, max-age=0")
+    assert not bypass_requested()
@@ -0,0 +1,64 @@
+import json
+import os
+
+import pytest
+
+from app.ml import risk_rules as risk_rules_module
+from app.ml.risk_rules import RiskRule, RiskRulePack, RiskRuleStore
+
+
+@pytest.fixture
+def pack():
+    return RiskRulePack([
+        RiskRule("terminate_without_notice", "terminate without notice", "high", None),
+        RiskRule("late_fees", "late fees", "medium", None),
+        RiskRule("no_refund", "no refund", "high", None),
+    ])
+
+
+def test_hit_offsets_cover_the_matched_phrase(pack):
+    text = "Landlord may Terminate\nwithout  notice. Tenant pays late fees; no refund."
+    hits = pack.find(text)
+    assert [hit.rule.rule_id for hit in hits] == ["terminate_without_notice", "late_fees", "no_refund"]
+    assert [text[hit.start:hit.end] for hit in hits] == ["Terminate\nwithout  notice", "late fees", "no refund"]
+
+
+def test_clause_spans_stop_at_sentence_ends_semicolons_and_blank_lines(pack):
+    text = "Preamble.  Tenant pays late fees; no refund is given\n\n  Final terms apply."
+    spans = [text[hit.clause_start:hit.clause_end] for hit in pack.find(text)]
+    assert spans == ["Tenant pays late fees;", "no refund is given"]
+
+
+def test_phrases_match_whole_words_only(pack):
+    assert pack.find("The prelate fees were waived.") == []
+
+
+def _write_rules(path, rules, mtime):
+    path.write_text(json.dumps({"version": 1, "rules": rules}), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def test_store_reloads_when_the_file_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(risk_rules_module, "_RELOAD_CHECK_SECONDS", 0)
+    path = tmp_path / "rules.json"
+    _write_rules(path, [{"id": "late_fees", "phrase": "late fees", "level": "medium"}], 1_000_000)
+    store = RiskRuleStore(path)
+    assert [hit.rule.rule_id for hit in store.get().find("late fees and no refund")] == ["late_fees"]
+
+    _write_rules(path, [{"id": "no_refund", "phrase": "no refund", "level": "high"}], 1_000_100)
+    assert [hit.rule.rule_id for hit in store.get().find("late fees and no refund")] == ["no_refund"]
+
+
+def test_store_keeps_previous_rules_when_the_file_is_broken(tmp_path, monkeypatch):
+    monkeypatch.setattr(risk_rules_module, "_RELOAD_CHECK_SECONDS", 0)
+    path = tmp_path / "rules.json"
+    _write_rules(path, [{"id": "late_fees", "phrase": "late fees", "level": "medium"}], 1_000_000)
+    store = RiskRuleStore(path)
+    pack = store.get()
+
+    path.write_text("{not json", encoding="utf-8")
+    os.utime(path, (1_000_100, 1_000_100))
+    assert store.get() is pack
+
+    _write_rules(path, [{"id": "late_fees", "phrase": "late fees", "level": "bogus"}], 1_000_200)
+    assert store.get() is pack
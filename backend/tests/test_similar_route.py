@@ -0,0 +1,40 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils import similarity_search
+
+
+def test_analyzed_documents_are_indexed_off_the_event_loop(monkeypatch):
+    on_event_loop = []
+    index_document = similarity_search.index_document
+
+    def recording_index_document(document_id, vector, model=None):
+        try:
+            asyncio.get_running_loop()
+            on_event_loop.append(True)
+        except RuntimeError:
+            on_event_loop.append(False)
+        index_document(document_id, vector, model)
+
+    monkeypatch.setattr(similarity_search, "index_document", recording_index_document)
+    texts = [
+        "My landlord refuses to return the security deposit after I moved out of the flat.",
+        "The landlord is withholding my rental deposit although the flat was left clean.",
+        "My employer has not paid my salary for three months.",
+    ]
+    with TestClient(app) as client:
+        ids = []
+        for text in texts:
+            response = client.post("/api/analyze/", data={"text": text, "language": "en"})
+            assert response.status_code == 200
+            ids.append(response.json()["document_id"])
+
+        assert on_event_loop == [False, False, False]
+
+        response = client.get(f"/api/similar/{ids[0]}", params={"k": 2})
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert results[0]["document_id"] == ids[1]
+        assert ids[0] not in [result["document_id"] for result in results]
@@ -0,0 +1,58 @@
+import asyncio
+
+from app.utils.singleflight import SingleFlight
+
+
+async def test_identical_concurrent_calls_run_once():
+    flight = SingleFlight("test")
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"answer": 42}
+
+    results = await asyncio.gather(*[flight.do("same", fetch) for _ in range(5)])
+    assert calls == 1
+    assert results == [{"answer": 42}] * 5
+    assert flight.stats() == {"calls": 5, "executed": 1, "collapsed": 4, "in_flight": 0}
+
+
+async def test_followers_get_independent_copies():
+    flight = SingleFlight("test")
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return {"items": []}
+
+    first, second = await asyncio.gather(flight.do("key", fetch), flight.do("key", fetch))
+    first["items"].append("mutated")
+    assert second == {"items": []}
+
+
+async def test_different_keys_run_separately():
+    flight = SingleFlight("test")
+
+    async def fetch(value):
+        await asyncio.sleep(0.01)
+        return value
+
+    results = await asyncio.gather(flight.do("a", lambda: fetch(1)), flight.do("b", lambda: fetch(2)))
+    assert results == [1, 2]
+    assert flight.executed == 2
+
+
+async def test_cancelled_leader_does_not_cancel_followers():
+    flight = SingleFlight("test")
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    leader = asyncio.ensure_future(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await follower == "done"
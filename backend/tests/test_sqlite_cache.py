@@ -0,0 +1,127 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from app.utils import sqlite_cache
+from app.utils.embedding_cache import EmbeddingCache
+from app.utils.response_cache import ResponseCache
+
+MODEL = "models/text-embedding-004"
+
+
+class Flavor:
+    """One cache class with a sample value and the extra arguments its `set` takes."""
+
+    def __init__(self, cls, value, *extra):
+        self.cls = cls
+        self.value = value
+        self.extra = extra
+
+    def open(self, path, **kwargs):
+        return self.cls(path, **kwargs)
+
+    def set(self, cache, key):
+        cache.set(key, self.value, *self.extra)
+
+    async def aset(self, cache, key):
+        await cache.aset(key, self.value, *self.extra)
+
+
+@pytest.fixture(params=[
+    Flavor(ResponseCache, {"category": "Contract Law", "key_points": ["a"]}),
+    Flavor(EmbeddingCache, [0.5, -0.25, 0.125], MODEL),
+], ids=["response", "embedding"])
+def flavor(request):
+    return request.param
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "cache.db"
+
+
+def rows(path, table):
+    with sqlite3.connect(path) as conn:
+        return dict(conn.execute(f"SELECT key, last_access FROM {table}").fetchall())
+
+
+async def test_async_round_trip_through_both_tiers(flavor, path):
+    cache = flavor.open(path)
+    await flavor.aset(cache, "k")
+    assert await cache.aget("k") == flavor.value
+    assert await flavor.open(path).aget("k") == flavor.value
+    assert await cache.aget("missing") is None
+    assert cache.stats()["memory_hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+async def test_disk_lookup_runs_off_the_event_loop(flavor, path, monkeypatch):
+    cache = flavor.open(path)
+    threads = []
+    lookup = cache._disk_lookup
+    monkeypatch.setattr(cache, "_disk_lookup", lambda key: threads.append(threading.get_ident()) or lookup(key))
+    await cache.aget("missing")
+    assert threads and threads[0] != threading.get_ident()
+
+
+def test_disk_hits_do_not_write_until_the_next_store(flavor, path):
+    flavor.set(flavor.open(path), "k")
+    stored = rows(path, flavor.cls.table)["k"]
+    time.sleep(0.01)
+    reader = flavor.open(path, memory_entries=0)
+    assert reader.get("k") == flavor.value
+    assert rows(path, flavor.cls.table)["k"] == stored
+    flavor.set(reader, "other")
+    assert rows(path, flavor.cls.table)["k"] > stored
+
+
+def test_buffered_hits_are_flushed_in_batches(flavor, path, monkeypatch):
+    monkeypatch.setattr(sqlite_cache, "MAX_PENDING_TOUCHES", 3)
+    writer = flavor.open(path)
+    for key in ("a", "b", "c"):
+        flavor.set(writer, key)
+    stored = rows(path, flavor.cls.table)["a"]
+    time.sleep(0.01)
+    reader = flavor.open(path, memory_entries=0)
+    reader.get("a")
+    reader.get("b")
+    assert rows(path, flavor.cls.table)["a"] == stored
+    reader.get("c")
+    assert rows(path, flavor.cls.table)["a"] > stored
+
+
+def test_eviction_keeps_recently_read_entries(flavor, path):
+    cache = flavor.open(path, disk_entries=2)
+    flavor.set(cache, "old")
+    flavor.set(cache, "newer")
+    reader = flavor.open(path, memory_entries=0, disk_entries=2)
+    reader.get("old")
+    flavor.set(reader, "newest")
+    assert sorted(rows(path, flavor.cls.table)) == ["newest", "old"]
+    assert reader.stats()["disk_evictions"] == 1
+
+
+def test_expired_entries_are_not_served_and_are_removed(flavor, path):
+    flavor.set(flavor.open(path), "k")
+    expired = flavor.open(path, memory_entries=0, ttl_seconds=-1)
+    assert expired.get("k") is None
+    flavor.set(expired, "other")
+    assert rows(path, flavor.cls.table) == {}
+
+
+def test_unreadable_row_is_a_miss(flavor, path):
+    flavor.set(flavor.open(path), "k")
+    with sqlite3.connect(path) as conn:
+        conn.execute(f"UPDATE {flavor.cls.table} SET {flavor.cls.value_column} = ?", (b"\x00\x01\x02",))
+    assert flavor.open(path, memory_entries=0).get("k") is None
+
+
+def test_memory_tier_is_bounded(flavor, path):
+    cache = flavor.open(path, memory_entries=1)
+    flavor.set(cache, "a")
+    flavor.set(cache, "b")
+    assert cache.stats()["memory_entries"] == 1
+    assert cache.stats()["memory_evictions"] == 1
@@ -0,0 +1,32 @@
+from app.utils.keyword_classifier import KeywordClassifier
+from app.utils.text_normalizer import PAGE_BREAK, normalize_document_text
+
+
+def test_normalizer_drops_running_headers_and_page_numbers():
+    bodies = ["The tenant pays rent monthly.", "Deposits are refundable.", "Either party may terminate.", "Disputes go to arbitration."]
+    pages = [f"ACME Lease Agreement\n{body}\nPage {i} of 4" for i, body in enumerate(bodies, 1)]
+    result = normalize_document_text(PAGE_BREAK.join(pages))
+    assert result.text == "\n\n".join(bodies)
+    assert result.tokens_saved > 0
+
+
+def test_normalizer_joins_hyphenated_words_and_collapses_whitespace():
+    result = normalize_document_text("The tenant   shall indem-\nnify the landlord.\n\n\n\nNext clause.")
+    assert result.text == "The tenant shall indemnify the landlord.\n\nNext clause."
+
+
+def test_classifier_matches_keywords_at_word_starts():
+    classifier = KeywordClassifier({"Tenant": ("rent", "lease"), "Employment": ("salary",)})
+    assert classifier.scores("Rental terms under the lease") == {"Tenant": 2, "Employment": 0}
+    assert classifier.total_hits("the current situation") == 0
+
+
+def test_classifier_picks_highest_score_and_falls_back_to_default():
+    classifier = KeywordClassifier({"Tenant": ("rent",), "Employment": ("salary", "employer")})
+    assert classifier.classify("rent and salary from my employer") == "Employment"
+    assert classifier.classify("nothing relevant", default="General") == "General"
+
+
+def test_classifier_phrases_match_across_line_wraps():
+    classifier = KeywordClassifier({"Consumer": ("consumer forum",)})
+    assert classifier.classify("file at the consumer\nforum") == "Consumer"
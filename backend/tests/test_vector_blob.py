@@ -0,0 +1,61 @@
+import json
+
+import numpy as np
+import pytest
+from sqlalchemy import Column, Integer, create_engine, text
+from sqlalchemy.orm import Session, declarative_base
+
+from app.db.types import VectorBlob, pack_vector, unpack_vector
+
+Base = declarative_base()
+
+
+class Row(Base):
+    __tablename__ = "rows"
+    id = Column(Integer, primary_key=True)
+    vector32 = Column(VectorBlob("float32"))
+    vector16 = Column(VectorBlob("float16"))
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def test_round_trip_through_the_database(session):
+    vector = np.random.default_rng(0).standard_normal(768).astype(np.float32)
+    session.add(Row(id=1, vector32=vector.tolist(), vector16=vector))
+    session.commit()
+    session.expire_all()
+
+    row = session.get(Row, 1)
+    assert row.vector32.dtype == np.float32
+    np.testing.assert_array_equal(row.vector32, vector)
+    np.testing.assert_allclose(row.vector16, vector, atol=2e-3)
+    stored = session.execute(text("SELECT length(vector32), length(vector16) FROM rows")).one()
+    assert stored == (4 + 768 * 4, 4 + 768 * 2)
+
+
+def test_legacy_json_text_is_still_decoded(session):
+    session.execute(text("INSERT INTO rows (id, vector32) VALUES (1, :value)"), {"value": json.dumps([0.5, -1.0])})
+    session.commit()
+    np.testing.assert_array_equal(session.get(Row, 1).vector32, [0.5, -1.0])
+
+
+def test_null_stays_null(session):
+    session.add(Row(id=1))
+    session.commit()
+    session.expire_all()
+    assert session.get(Row, 1).vector32 is None
+
+
+def test_pack_and_unpack_validate_their_input():
+    assert pack_vector([1.0, 2.0])[:4] == b"EMB4"
+    np.testing.assert_array_equal(unpack_vector(memoryview(pack_vector([1.0, 2.0], "float16"))), [1.0, 2.0])
+    with pytest.raises(ValueError):
+        pack_vector([1.0], "int8")
+    with pytest.raises(ValueError):
+        unpack_vector(b"not a vector")
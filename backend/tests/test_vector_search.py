@@ -0,0 +1,179 @@
+import numpy as np
+import pytest
+
+from app.utils.ann_index import IVFIndex, build_ivf, update_ivf
+from app.utils.quantization import ProductQuantizer, QuantizedIndex, build_quantized, update_quantized
+from app.utils.similarity_search import DimensionMismatch, ModelMismatch, SimilarityIndex
+
+DIM = 64
+ROWS = 4000
+K = 10
+
+
+def clustered(rng, centres, count):
+    """Vectors near a mix of two topic centres, noisy enough that neighbours are not trivial."""
+    first, second = rng.integers(len(centres), size=(2, count))
+    weight = rng.uniform(0.0, 0.5, size=(count, 1)).astype(np.float32)
+    noise = rng.standard_normal((count, centres.shape[1]), dtype=np.float32)
+    return (1 - weight) * centres[first] + weight * centres[second] + noise
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    centres = 2 * rng.standard_normal((40, DIM), dtype=np.float32)
+    return clustered(rng, centres, ROWS), clustered(rng, centres, 50), centres
+
+
+@pytest.fixture
+def flat(tmp_path, data):
+    index = SimilarityIndex(tmp_path / "flat")
+    index.add(np.arange(1, ROWS + 1), data[0])
+    return index
+
+
+def recall(search, flat, queries):
+    hits = []
+    for query in queries:
+        exact = {doc_id for doc_id, _ in flat.search(query, K)}
+        hits.append(len(exact & {doc_id for doc_id, _ in search(query)}) / K)
+    return float(np.mean(hits))
+
+
+def test_exact_search_matches_brute_force(flat, data):
+    vectors, queries, _ = data
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    query = queries[0] / np.linalg.norm(queries[0])
+    expected = np.argsort(-(unit @ query))[:K] + 1
+    results = flat.search(queries[0], K)
+    assert [doc_id for doc_id, _ in results] == expected.tolist()
+    assert results[0][1] == pytest.approx(float(unit[expected[0] - 1] @ query), abs=1e-5)
+
+
+def test_appends_are_visible_to_other_instances(flat, data):
+    reader = SimilarityIndex(flat.directory)
+    assert len(reader) == ROWS
+    flat.add([ROWS + 1], data[1][:1])
+    assert len(reader) == ROWS + 1
+    assert reader.search(data[1][0], 1)[0][0] == ROWS + 1
+
+
+def test_skip_existing_and_exclude(flat, data):
+    assert flat.add([1, 2, ROWS + 1], data[1][:3], skip_existing=True) == 1
+    assert flat.last_id() == ROWS + 1
+    nearest = flat.search(data[0][0], 2)[0][0]
+    assert nearest == 1
+    assert all(doc_id != 1 for doc_id, _ in flat.search(data[0][0], K, exclude_ids=[1]))
+
+
+def test_dimension_mismatch_is_rejected(flat):
+    with pytest.raises(DimensionMismatch):
+        flat.search(np.ones(DIM + 1), K)
+    with pytest.raises(DimensionMismatch):
+        flat.add([ROWS + 1], np.ones((1, DIM + 1)))
+
+
+def test_vectors_from_another_embedding_model_are_rejected(tmp_path):
+    index = SimilarityIndex(tmp_path / "models")
+    index.add([1], np.ones((1, DIM)), model="gemini")
+    assert SimilarityIndex(index.directory).model == "gemini"
+    with pytest.raises(ModelMismatch):
+        index.add([2], np.ones((1, DIM)), model="local")
+    with pytest.raises(ModelMismatch):
+        index.check_model("local")
+    index.add([2], np.ones((1, DIM)), model="gemini")
+    assert len(index) == 2
+
+
+def test_sync_skips_documents_from_another_embedding_model(tmp_path):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.db.database import Base
+    from app.db.models import Document
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'docs.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        for doc_id, metadata in ((1, {"embedding_model": "gemini"}), (2, {"embedding_model": "local"}), (3, {})):
+            session.add(Document(
+                id=doc_id, filename="doc", content="text", doc_metadata=metadata, embedding=np.ones(DIM) * doc_id,
+            ))
+        session.commit()
+
+        index = SimilarityIndex(tmp_path / "synced")
+        assert index.sync_from_db(session) == 2
+        assert index.arrays()[1].tolist() == [1, 3]
+        assert index.model == "gemini"
+
+
+def test_ivf_recall_against_exact_search(flat, data, tmp_path):
+    root = tmp_path / "ivf"
+    build_ivf(flat, root, nlist=32)
+    index = IVFIndex.load(root, flat)
+    assert recall(lambda query: index.search(query, K, nprobe=8), flat, data[1]) >= 0.9
+    assert recall(lambda query: index.search(query, K, nprobe=32), flat, data[1]) == 1.0
+
+
+def test_ivf_finds_tail_rows_and_files_them_on_update(flat, data, tmp_path):
+    root = tmp_path / "ivf"
+    build_ivf(flat, root, nlist=32)
+    flat.add([ROWS + 1], data[1][:1])
+    assert IVFIndex.load(root, flat).search(data[1][0], 1, nprobe=1)[0][0] == ROWS + 1
+
+    update_ivf(flat, root)
+    updated = IVFIndex.load(root, flat)
+    assert updated.stats()["tail"] == 0
+    assert updated.search(data[1][0], 1, nprobe=32)[0][0] == ROWS + 1
+    assert update_ivf(flat, root) is None
+
+
+def test_int8_recall_against_exact_search(flat, data, tmp_path):
+    root = tmp_path / "int8"
+    build_quantized(flat, "int8", root)
+    index = QuantizedIndex.load(root, flat)
+    assert index.codes.shape == (ROWS, DIM)
+    assert recall(lambda query: index.search(query, K, rerank=0), flat, data[1]) >= 0.9
+    assert recall(lambda query: index.search(query, K, rerank=10), flat, data[1]) >= 0.99
+
+
+def test_pq_recall_improves_with_rerank(flat, data, tmp_path):
+    root = tmp_path / "pq"
+    build_quantized(flat, "pq", root, m=16, sample=ROWS)
+    index = QuantizedIndex.load(root, flat)
+    assert index.codes.shape == (ROWS, 16)
+    codes_only = recall(lambda query: index.search(query, K, rerank=0), flat, data[1])
+    reranked = recall(lambda query: index.search(query, K, rerank=10), flat, data[1])
+    assert reranked >= 0.9
+    assert reranked > codes_only
+
+
+def test_quantized_update_encodes_the_tail(flat, data, tmp_path):
+    root = tmp_path / "pq"
+    build_quantized(flat, "pq", root, m=16, sample=ROWS)
+    flat.add([ROWS + 1], data[1][:1])
+    assert QuantizedIndex.load(root, flat).search(data[1][0], 1)[0][0] == ROWS + 1
+    update_quantized(flat, root)
+    updated = QuantizedIndex.load(root, flat)
+    assert updated.codes.shape[0] == ROWS + 1
+    assert updated.search(data[1][0], 1)[0][0] == ROWS + 1
+
+
+def test_pq_requires_subvectors_that_divide_the_dimension(data):
+    with pytest.raises(ValueError):
+        ProductQuantizer.train(data[0][:300], m=7)
+
+
+def test_pq_lookup_offsets_do_not_overflow_past_256_subvectors():
+    rng = np.random.default_rng(1)
+    sample = rng.standard_normal((300, 512), dtype=np.float32)
+    quantizer = ProductQuantizer.train(sample, m=512, iterations=1)
+    codes = quantizer.encode(sample[:5])
+    decoded = np.stack([quantizer.centroids[j, codes[:, j]] for j in range(512)], axis=1).reshape(5, 512)
+    query = rng.standard_normal(512, dtype=np.float32)
+    np.testing.assert_allclose(quantizer.scorer(query)(codes), decoded @ query, rtol=1e-4, atol=1e-3)
+
+
+def test_pq_rejects_codebooks_that_do_not_fit_one_byte():
+    with pytest.raises(ValueError):
+        ProductQuantizer(np.zeros((4, 300, 8), dtype=np.float32))
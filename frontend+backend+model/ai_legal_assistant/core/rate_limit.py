@@ -0,0 +1,205 @@
+"""Process-wide outbound budget for Gemini calls made by this package.
+
+Every LLM call takes one request from a requests-per-minute bucket, its
+estimated tokens from a tokens-per-minute bucket, and one concurrency slot.
+The concurrency limit adapts AIMD-style: it grows on success and halves
+whenever Gemini answers 429/503. Configure via GEMINI_RPM, GEMINI_TPM and
+GEMINI_*_CONCURRENCY.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, Optional
+
+from .config import settings
+
+THROTTLE_MARKERS = ("429", "503", "resource exhausted", "resourceexhausted", "rate limit", "quota", "unavailable")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+def is_throttle_error(exc: BaseException) -> bool:
+    """True for upstream 429/503 style errors that should shrink concurrency."""
+    code = getattr(exc, "code", None)
+    if code in (429, 503):
+        return True
+    text = f"{type(exc).__name__} {exc}".lower()
+    return any(marker in text for marker in THROTTLE_MARKERS)
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations; callers sleep off any debt."""
+
+    def __init__(self, capacity: float, per_second: float):
+        self.capacity = capacity
+        self.per_second = per_second
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` tokens and return how long to wait before using them."""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.per_second)
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.per_second
+
+
+class AdaptiveConcurrencyLimiter:
+    """Concurrency gate whose limit follows additive-increase/multiplicative-decrease."""
+
+    def __init__(self, initial: int, minimum: int, maximum: int):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._waiters: Deque[Callable[[], None]] = deque()
+
+    def _try_acquire_locked(self) -> bool:
+        if self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return True
+        return False
+
+    def _wake_locked(self) -> None:
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            self._waiters.popleft()()
+            free -= 1
+
+    async def acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._try_acquire_locked():
+                    return
+                future = loop.create_future()
+                wake = lambda: loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))  # noqa: E731
+                self._waiters.append(wake)
+            try:
+                await future
+            except asyncio.CancelledError:
+                with self._lock:
+                    if wake in self._waiters:
+                        self._waiters.remove(wake)
+                    else:
+                        self._wake_locked()
+                raise
+
+    def acquire_sync(self) -> None:
+        while True:
+            with self._lock:
+                if self._try_acquire_locked():
+                    return
+                event = threading.Event()
+                self._waiters.append(event.set)
+            event.wait()
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self._wake_locked()
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._wake_locked()
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            self.limit = max(float(self.minimum), self.limit / 2)
+
+
+class GeminiRateLimiter:
+    """Shared RPM/TPM budget plus adaptive concurrency for outbound Gemini calls."""
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 16,
+    ):
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+        self.concurrency = AdaptiveConcurrencyLimiter(initial_concurrency, min_concurrency, max_concurrency)
+        self.counters = {"calls": 0, "throttled": 0, "waited_seconds": 0.0}
+
+    def _reserve(self, tokens: int) -> float:
+        self.counters["calls"] += 1
+        wait = max(self.requests.reserve(1), self.tokens.reserve(tokens))
+        self.counters["waited_seconds"] += wait
+        return wait
+
+    def _record(self, exc: Optional[BaseException] = None) -> None:
+        if exc is None:
+            self.concurrency.on_success()
+        elif is_throttle_error(exc):
+            self.counters["throttled"] += 1
+            self.concurrency.on_throttle()
+
+    @asynccontextmanager
+    async def limit(self, tokens: int = 1) -> AsyncIterator[None]:
+        """Async context manager wrapping one Gemini call."""
+        wait = self._reserve(tokens)
+        if wait:
+            await asyncio.sleep(wait)
+        await self.concurrency.acquire()
+        try:
+            yield
+        except Exception as exc:
+            self._record(exc)
+            raise
+        else:
+            self._record()
+        finally:
+            self.concurrency.release()
+
+    @contextmanager
+    def limit_sync(self, tokens: int = 1) -> Iterator[None]:
+        """Blocking variant of `limit` for synchronous call sites."""
+        wait = self._reserve(tokens)
+        if wait:
+            time.sleep(wait)
+        self.concurrency.acquire_sync()
+        try:
+            yield
+        except Exception as exc:
+            self._record(exc)
+            raise
+        else:
+            self._record()
+        finally:
+            self.concurrency.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "waited_seconds": round(self.counters["waited_seconds"], 3),
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "in_flight": self.concurrency.in_flight,
+        }
+
+
+gemini_limiter = GeminiRateLimiter(
+    requests_per_minute=settings.gemini_rpm,
+    tokens_per_minute=settings.gemini_tpm,
+    initial_concurrency=settings.gemini_initial_concurrency,
+    min_concurrency=settings.gemini_min_concurrency,
+    max_concurrency=settings.gemini_max_concurrency,
+)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Literal, Optional, TypedDict
+from typing import Any, Dict, List, Literal, Optional, TypedDict
 
 
 class TimelineItem(TypedDict, total=False):
@@ -27,3 +27,34 @@ class ClauseAnalysis(TypedDict):
 
 
 ClauseAnalysisList = List[ClauseAnalysis]
+
+
+# Response schemas passed to Gemini so constrained decoding emits the shapes above.
+_STRING: Dict[str, Any] = {"type": "string"}
+
+RESEARCH_RESULT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "summary": _STRING,
+        "key_cases": {"type": "array", "items": _STRING},
+        "timeline": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"date": _STRING, "event": _STRING, "case_id": _STRING},
+                "required": ["date", "event"],
+            },
+        },
+    },
+    "required": ["summary", "key_cases", "timeline"],
+}
+
+CLAUSE_ANALYSIS_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "risk": {"type": "string", "enum": ["Low", "Medium", "High"]},
+        "rewrite": _STRING,
+        "explanation": _STRING,
+    },
+    "required": ["risk", "rewrite", "explanation"],
+}
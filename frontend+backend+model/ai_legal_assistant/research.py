@@ -1,13 +1,35 @@
 from __future__ import annotations
 
 from typing import List
-import json
 
 from .core.config import settings
 from .core.ner import extract_entities
 from .core.vectorstore import get_vectorstore
-from .core.types import ResearchResult
+from .core.types import RESEARCH_RESULT_SCHEMA, ResearchResult
 from .core.gemini import ensure_gemini_configured
+from .core.json_repair import parse_json_lenient
+from .core.rate_limit import estimate_tokens, gemini_limiter
+
+
+def _as_list(value: object, item_type: type) -> list:
+    """Items of `item_type` from a JSON array; a lone item becomes a one-item list, anything else is dropped."""
+    if isinstance(value, item_type):
+        value = [value]
+    if not isinstance(value, list):
+        return []
+    return [item for item in value if isinstance(item, item_type)]
+
+
+def _parse_research_json(text: str) -> dict:
+    """Decode a research summary, keeping only the ResearchResult keys."""
+    data = parse_json_lenient(text)
+    if not isinstance(data, dict):
+        raise ValueError("expected a JSON object")
+    return {
+        "summary": str(data.get("summary", "")),
+        "key_cases": _as_list(data.get("key_cases"), str),
+        "timeline": _as_list(data.get("timeline"), dict),
+    }
 
 
 def _summarize_results_gemini(query: str, contexts: List[str]) -> ResearchResult:
@@ -19,7 +41,13 @@ def _summarize_results_gemini(query: str, contexts: List[str]) -> ResearchResult
     # Lazy import to avoid import-time errors if deps are missing
     ensure_gemini_configured()
     from langchain_google_genai import ChatGoogleGenerativeAI
-    llm = ChatGoogleGenerativeAI(model="gemini-1.5-pro", google_api_key=settings.google_api_key, temperature=0.2)
+    llm = ChatGoogleGenerativeAI(
+        model="gemini-1.5-pro",
+        google_api_key=settings.google_api_key,
+        temperature=0.2,
+        response_mime_type="application/json",
+        response_schema=RESEARCH_RESULT_SCHEMA,
+    )
     prompt = (
         "You are a legal research assistant. Based on the user's query and the retrieved case excerpts, "
         "produce: (1) a concise summary (<=200 words), (2) a list of key case names, and (3) a simple timeline JSON array.\n\n"
@@ -27,12 +55,13 @@ def _summarize_results_gemini(query: str, contexts: List[str]) -> ResearchResult
         f"Excerpts:\n- " + "\n- ".join(contexts) + "\n\n"
         "Return JSON with keys: summary (string), key_cases (array of strings), timeline (array of {date, event, case_id})."
     )
-    res = llm.invoke(prompt)
+    with gemini_limiter.limit_sync(estimate_tokens(prompt)):
+        res = llm.invoke(prompt)
     # Attempt to parse JSON from response
     text = res.content if hasattr(res, "content") else str(res)
     try:
-        data = json.loads(text)
-    except Exception:
+        data = _parse_research_json(text)
+    except ValueError:
         # Fallback: create minimal structure
         data = {
             "summary": text[:1000],
@@ -45,7 +74,13 @@ def _summarize_results_gemini(query: str, contexts: List[str]) -> ResearchResult
 async def _summarize_results_gemini_async(query: str, contexts: List[str]) -> ResearchResult:
     ensure_gemini_configured()
     from langchain_google_genai import ChatGoogleGenerativeAI
-    llm = ChatGoogleGenerativeAI(model="gemini-1.5-pro", google_api_key=settings.google_api_key, temperature=0.2)
+    llm = ChatGoogleGenerativeAI(
+        model="gemini-1.5-pro",
+        google_api_key=settings.google_api_key,
+        temperature=0.2,
+        response_mime_type="application/json",
+        response_schema=RESEARCH_RESULT_SCHEMA,
+    )
     prompt = (
         "You are a legal research assistant. Based on the user's query and the retrieved case excerpts, "
         "produce: (1) a concise summary (<=200 words), (2) a list of key case names, and (3) a simple timeline JSON array.\n\n"
@@ -53,11 +88,12 @@ async def _summarize_results_gemini_async(query: str, contexts: List[str]) -> Re
         f"Excerpts:\n- " + "\n- ".join(contexts) + "\n\n"
         "Return JSON with keys: summary (string), key_cases (array of strings), timeline (array of {date, event, case_id})."
     )
-    res = await llm.ainvoke(prompt)
+    async with gemini_limiter.limit(estimate_tokens(prompt)):
+        res = await llm.ainvoke(prompt)
     text = res.content if hasattr(res, "content") else str(res)
     try:
-        data = json.loads(text)
-    except Exception:
+        data = _parse_research_json(text)
+    except ValueError:
         data = {"summary": text[:1000], "key_cases": [], "timeline": []}
     return ResearchResult(**data)  # type: ignore[arg-type]
 
@@ -69,25 +105,17 @@ def legal_research(query: str, top_k: int = 3) -> ResearchResult:
     1) spaCy extract entities from query (not strictly required but can be used for filters later)
     2) Query PGVector via LangChain retriever
     3) Summarize into structured JSON via Gemini
+
+    Only the summary calls the LLM, with the query and excerpts in one prompt
+    sized for the limiter; the query embedding is limited in core/embeddings.py.
     """
     _ = extract_entities(query)
 
     vectorstore = get_vectorstore()
     retriever = vectorstore.as_retriever(search_kwargs={"k": top_k})
-
-    # We can use a simple RetrievalQA to get contexts, but we won't rely on the LLM answer; we will collect docs.
-    from langchain.chains import RetrievalQA
-    from langchain_google_genai import ChatGoogleGenerativeAI
     ensure_gemini_configured()
-    chain = RetrievalQA.from_chain_type(
-        llm=ChatGoogleGenerativeAI(model="gemini-1.5-pro", google_api_key=settings.google_api_key, temperature=0.1),
-        retriever=retriever,
-        chain_type="stuff",
-        return_source_documents=True,
-    )
 
-    result = chain.invoke({"query": query})
-    docs = result.get("source_documents", [])
+    docs = retriever.invoke(query)
     contexts: List[str] = [d.page_content for d in docs]
 
     return _summarize_results_gemini(query, contexts)
@@ -99,19 +127,9 @@ async def legal_research_async(query: str, top_k: int = 3) -> ResearchResult:
 
     vectorstore = get_vectorstore()
     retriever = vectorstore.as_retriever(search_kwargs={"k": top_k})
-
-    from langchain.chains import RetrievalQA
-    from langchain_google_genai import ChatGoogleGenerativeAI
     ensure_gemini_configured()
-    chain = RetrievalQA.from_chain_type(
-        llm=ChatGoogleGenerativeAI(model="gemini-1.5-pro", google_api_key=settings.google_api_key, temperature=0.1),
-        retriever=retriever,
-        chain_type="stuff",
-        return_source_documents=True,
-    )
 
-    result = await chain.ainvoke({"query": query})
-    docs = result.get("source_documents", [])
+    docs = await retriever.ainvoke(query)
     contexts: List[str] = [d.page_content for d in docs]
 
     return await _summarize_results_gemini_async(query, contexts)
@@ -27,7 +27,7 @@ class Document(Base):
     filename = Column(String, nullable=False)
     content = Column(Text)
     meta = Column(JSONB, default={})
-    # Keep the raw embedding payload alongside the pgvector entry for troubleshooting.
+    # Legacy duplicate of embeddings.vector; no longer written, kept so old rows still load.
     embedding = Column(JSON)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
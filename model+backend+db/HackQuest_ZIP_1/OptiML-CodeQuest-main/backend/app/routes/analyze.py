@@ -48,7 +48,6 @@ async def analyze(
                 user_id=user_id,
                 filename=file.filename if file else "input_text_or_voice",
                 content=combined_text,
-                embedding=embedding_vector
             )
             db.add(new_doc)
             await db.flush()
@@ -133,7 +132,6 @@ async def analyze(
                 user_id=user_id,
                 filename=file.filename if file else "input_text_or_voice",
                 content=combined_text,
-                embedding=embedding_vector
             )
             db.add(new_doc)
             await db.flush()
@@ -49,7 +49,6 @@ async def research(
                 user_id=user_id,
                 filename=file.filename if file else "input_text_or_voice",
                 content=combined_text,
-                embedding=embedding_vector
             )
             db.add(new_doc)
             await db.flush()
@@ -127,7 +126,6 @@ async def research(
                 user_id=user_id,
                 filename=file.filename if file else "input_text_or_voice",
                 content=combined_text,
-                embedding=embedding_vector
             )
             db.add(new_doc)
             await db.flush()
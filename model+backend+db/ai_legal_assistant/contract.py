@@ -3,19 +3,25 @@ from __future__ import annotations
 import asyncio
 from typing import List
 
-from typing import List
-
 from .core.config import settings
 from .core.ner import split_into_clauses, extract_entities
-from .core.types import ClauseAnalysis, ClauseAnalysisList
+from .core.types import CLAUSE_ANALYSIS_SCHEMA, ClauseAnalysis, ClauseAnalysisList
 from .core.gemini import ensure_gemini_configured
+from .core.json_repair import parse_json_lenient
+from .core.rate_limit import estimate_tokens, gemini_limiter
 
 
 async def _analyze_clause(clause: str) -> ClauseAnalysis:
     """Analyze a single clause: risk level, rewrite, explanation using Gemini."""
     from langchain_google_genai import ChatGoogleGenerativeAI
     ensure_gemini_configured()
-    llm = ChatGoogleGenerativeAI(model="gemini-1.5-pro", google_api_key=settings.google_api_key, temperature=0.2)
+    llm = ChatGoogleGenerativeAI(
+        model="gemini-1.5-pro",
+        google_api_key=settings.google_api_key,
+        temperature=0.2,
+        response_mime_type="application/json",
+        response_schema=CLAUSE_ANALYSIS_SCHEMA,
+    )
     system = (
         "You are a legal compliance and contract risk analyst."
         " Classify risk as Low/Medium/High, explain the reasoning, and propose a compliant rewrite"
@@ -25,13 +31,15 @@ async def _analyze_clause(clause: str) -> ClauseAnalysis:
         f"{system}\n\nClause:\n{clause}\n\n"
         "Return STRICT JSON with keys: risk (Low|Medium|High), rewrite (string), explanation (string)."
     )
-    res = await llm.ainvoke(prompt)
-    import json
+    async with gemini_limiter.limit(estimate_tokens(prompt)):
+        res = await llm.ainvoke(prompt)
 
     text = res.content if hasattr(res, "content") else str(res)
     try:
-        data = json.loads(text)
-    except Exception:
+        data = parse_json_lenient(text)
+        if not isinstance(data, dict):
+            raise ValueError("expected a JSON object")
+    except ValueError:
         # Fallback parsing heuristics
         data = {"risk": "Medium", "rewrite": clause, "explanation": text[:1000]}
 
@@ -49,7 +57,11 @@ async def _analyze_clause(clause: str) -> ClauseAnalysis:
 
 
 async def analyze_contract_async(text: str, max_concurrency: int = 5) -> ClauseAnalysisList:
-    """Async contract analysis across clauses with bounded concurrency."""
+    """Async contract analysis across clauses with bounded concurrency.
+
+    `max_concurrency` bounds this call; the process-wide Gemini budget in
+    `core.rate_limit` applies on top of it.
+    """
     clauses = split_into_clauses(text)
     _ = extract_entities(text)  # reserved for future rule-based checks
 
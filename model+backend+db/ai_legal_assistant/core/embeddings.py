@@ -1,10 +1,50 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 
 from .config import settings
+from .rate_limit import estimate_tokens, gemini_limiter
+
+# Texts per batchEmbedContents request (the API maximum), so each request takes its own permit
+EMBED_BATCH_SIZE = 100
+
+
+def _batches(texts: List[str], kwargs: Dict[str, Any]) -> Iterator[Tuple[List[str], Dict[str, Any]]]:
+    titles = kwargs.get("titles")
+    for start in range(0, len(texts), EMBED_BATCH_SIZE):
+        batch_kwargs = dict(kwargs)
+        if titles is not None:
+            batch_kwargs["titles"] = titles[start:start + EMBED_BATCH_SIZE]
+        yield texts[start:start + EMBED_BATCH_SIZE], batch_kwargs
+
+
+class RateLimitedEmbeddings(GoogleGenerativeAIEmbeddings):
+    """GoogleGenerativeAIEmbeddings whose upstream requests go through `gemini_limiter`."""
+
+    def embed_documents(self, texts: List[str], **kwargs: Any) -> List[List[float]]:
+        vectors: List[List[float]] = []
+        for batch, batch_kwargs in _batches(texts, kwargs):
+            with gemini_limiter.limit_sync(sum(estimate_tokens(text) for text in batch)):
+                vectors.extend(super().embed_documents(batch, **batch_kwargs))
+        return vectors
+
+    async def aembed_documents(self, texts: List[str], **kwargs: Any) -> List[List[float]]:
+        vectors: List[List[float]] = []
+        for batch, batch_kwargs in _batches(texts, kwargs):
+            async with gemini_limiter.limit(sum(estimate_tokens(text) for text in batch)):
+                vectors.extend(await super().aembed_documents(batch, **batch_kwargs))
+        return vectors
+
+    def embed_query(self, text: str, **kwargs: Any) -> List[float]:
+        with gemini_limiter.limit_sync(estimate_tokens(text)):
+            return super().embed_query(text, **kwargs)
+
+    async def aembed_query(self, text: str, **kwargs: Any) -> List[float]:
+        async with gemini_limiter.limit(estimate_tokens(text)):
+            return await super().aembed_query(text, **kwargs)
+
 
 _embeddings: Optional[GoogleGenerativeAIEmbeddings] = None
 
@@ -13,10 +53,11 @@ def get_embeddings(api_key: Optional[str] = None) -> GoogleGenerativeAIEmbedding
     """Singleton for GoogleGenerativeAIEmbeddings.
 
     The embedding model used by Gemini is set to `text-embedding-004` by default.
+    Indexing and retrieval both embed through it, so every request is rate limited.
     """
     global _embeddings
     if _embeddings is None:
-        _embeddings = GoogleGenerativeAIEmbeddings(
+        _embeddings = RateLimitedEmbeddings(
             model="text-embedding-004",
             google_api_key=api_key or settings.google_api_key,
         )
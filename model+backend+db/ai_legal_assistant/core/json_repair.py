@@ -0,0 +1,129 @@
+"""
+Tolerant JSON parsing for LLM output.
+
+Handles Markdown code fences, prose before or after the JSON value, trailing
+commas and output truncated mid-object (e.g. by `max_output_tokens`), so a
+response that was already paid for is not thrown away over a syntax slip.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL | re.IGNORECASE)
+_CLOSERS = {"{": "}", "[": "]"}
+# How many comma positions to back off to when closing a truncated value
+_MAX_CUT_ATTEMPTS = 20
+# How many "{" / "[" positions to try as the start of the value (prose may contain brackets)
+_MAX_START_ATTEMPTS = 20
+
+decode_counters: Dict[str, int] = {"clean": 0, "repaired": 0, "failed": 0}
+
+
+def _strip_trailing_comma(out: List[str]) -> None:
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+
+def _decode(candidate: str) -> Optional[Any]:
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        return None
+
+
+def _repair(text: str) -> Optional[Any]:
+    """Decode the value `text` starts with, dropping trailing commas and prose and closing truncation.
+
+    Returns None when no repair decodes (a value starting with "{" or "["
+    is never None itself).
+    """
+    stack: List[str] = []
+    out: List[str] = []
+    cuts: List[Tuple[int, Tuple[str, ...]]] = []
+    in_string = False
+    escape = False
+
+    for ch in text:
+        if in_string:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in _CLOSERS:
+            stack.append(_CLOSERS[ch])
+        elif ch in "}]":
+            _strip_trailing_comma(out)
+            if stack:
+                stack.pop()
+            out.append(ch)
+            if not stack:
+                break  # anything after the top-level value is prose
+            continue
+        elif ch == ",":
+            cuts.append((len(out), tuple(stack)))
+        out.append(ch)
+
+    body = "".join(out)
+    if not stack and not in_string:
+        return _decode(body)
+
+    attempts = []
+    tail = list(body + ('"' if in_string else ""))
+    _strip_trailing_comma(tail)
+    attempts.append("".join(tail) + "".join(reversed(stack)))
+    for position, open_stack in reversed(cuts[-_MAX_CUT_ATTEMPTS:]):
+        attempts.append(body[:position] + "".join(reversed(open_stack)))
+
+    for attempt in attempts:
+        value = _decode(attempt)
+        if value is not None:
+            return value
+    return None
+
+
+def parse_json_lenient(content: str) -> Any:
+    """Parse JSON from an LLM response, repairing common defects.
+
+    Raises ValueError when nothing usable can be recovered.
+    """
+    candidate = content.strip()
+    fence = _FENCE.search(candidate)
+    if fence:
+        candidate = fence.group(1).strip()
+
+    try:
+        value = json.loads(candidate)
+        decode_counters["clean"] += 1
+        return value
+    except json.JSONDecodeError:
+        pass
+
+    # Brackets in leading prose ("see [1]") are not the value; move on to the next opener
+    starts = [i for i, ch in enumerate(candidate) if ch in _CLOSERS][:_MAX_START_ATTEMPTS]
+    for start in starts:
+        value = _repair(candidate[start:])
+        if value is not None:
+            decode_counters["repaired"] += 1
+            return value
+
+    decode_counters["failed"] += 1
+    raise ValueError(f"Unrecoverable JSON in model output: {content[:80]!r}")
+
+
+def decode_stats() -> Dict[str, Any]:
+    total = sum(decode_counters.values())
+    return {
+        **decode_counters,
+        "failure_rate": round(decode_counters["failed"] / total, 4) if total else 0.0,
+    }